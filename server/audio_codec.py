@@ -0,0 +1,109 @@
+"""
+Output audio formats for synthesized speech.
+Piper produces 16-bit PCM WAV at the voice's native rate (usually 22050 Hz).
+Clients that declare support for a more compact format get the speech
+trimmed of leading/trailing silence, resampled and, for the μ-law formats,
+companded to 8 bits per sample (G.711), still wrapped in a WAV container
+so every player can open it.
+"""
+
+import io
+import wave
+import struct
+import numpy as np
+
+from resampler import resample
+
+# name -> (sample rate, or None for the voice's own; sample encoding)
+OUTPUT_FORMATS: dict[str, tuple[int | None, str]] = {
+    "wav": (None, "pcm16"),      # Piper's output, unchanged
+    "wav16k": (16000, "pcm16"),
+    "ulaw16k": (16000, "ulaw"),  # about 1/3 of "wav" per second of speech
+    "ulaw8k": (8000, "ulaw"),
+}
+DEFAULT_FORMAT = "wav"
+
+# Trimming: samples quieter than this (relative to full scale) at either
+# end are silence; a little padding keeps word onsets and releases intact.
+TRIM_THRESHOLD = 10 ** (-40 / 20)
+TRIM_PAD_SECONDS = 0.03
+
+_WAVE_FORMAT_MULAW = 7
+
+
+def negotiate(supported: list[str]) -> str:
+    """First format in the client's preference list that we can produce."""
+    return next((f for f in supported if f in OUTPUT_FORMATS), DEFAULT_FORMAT)
+
+
+def trim_silence(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Drop leading and trailing silence; all-silent audio is returned as is."""
+    loud = np.flatnonzero(np.abs(audio) > TRIM_THRESHOLD)
+    if len(loud) == 0:
+        return audio
+    pad = int(TRIM_PAD_SECONDS * sample_rate)
+    return audio[max(0, loud[0] - pad):loud[-1] + 1 + pad]
+
+
+def ulaw_encode(samples: np.ndarray) -> bytes:
+    """G.711 μ-law companding of int16 samples, one byte per sample."""
+    s = samples.astype(np.int32)
+    sign = (s < 0).astype(np.int32) << 7
+    magnitude = np.minimum(np.abs(s), 32635) + 0x84
+    exponent = np.floor(np.log2(magnitude)).astype(np.int32) - 7
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8).tobytes()
+
+
+def _ulaw_wav(data: bytes, sample_rate: int) -> bytes:
+    fmt = struct.pack("<HHIIHHH", _WAVE_FORMAT_MULAW, 1, sample_rate, sample_rate, 1, 8, 0)
+    fact = struct.pack("<I", len(data))
+    body = (
+        b"WAVE"
+        + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        + b"fact" + struct.pack("<I", len(fact)) + fact
+        + b"data" + struct.pack("<I", len(data)) + data
+        + (b"\0" if len(data) % 2 else b"")
+    )
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def _pcm16_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(samples.astype("<i2").tobytes())
+    return buf.getvalue()
+
+
+def encode_samples(audio: np.ndarray, sample_rate: int, audio_format: str) -> bytes:
+    """
+    Encode float32 mono audio as ``audio_format``, trimming silence first.
+    The "wav" format keeps ``sample_rate`` and 16-bit samples.
+    """
+    rate, encoding = OUTPUT_FORMATS[audio_format]
+    rate = rate or sample_rate
+    audio = trim_silence(audio, sample_rate)
+    if rate != sample_rate and len(audio):
+        audio = resample(audio, sample_rate, rate)
+    samples = np.clip(np.round(audio * 32768.0), -32768, 32767).astype(np.int16)
+
+    if encoding == "ulaw":
+        return _ulaw_wav(ulaw_encode(samples), rate)
+    return _pcm16_wav(samples, rate)
+
+
+def encode(wav_bytes: bytes, audio_format: str) -> bytes:
+    """
+    Convert a mono PCM16 WAV into ``audio_format``: trim silence, resample
+    and encode. The "wav" format returns the input unchanged.
+    """
+    if audio_format == DEFAULT_FORMAT:
+        return wav_bytes
+
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+        source_rate = wf.getframerate()
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+    return encode_samples(pcm.astype(np.float32) / 32768.0, source_rate, audio_format)
@@ -0,0 +1,100 @@
+"""
+Micro-batching for model inference.
+Collects requests that arrive within a short window and runs them through
+the model as a single batch, handing each caller back its own result.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger("voxbridge.batching")
+
+
+class MicroBatcher:
+    """
+    Gather concurrent submissions into batches.
+
+    A batch is flushed when ``max_batch`` items are waiting or ``max_wait``
+    seconds after its first item arrived, whichever comes first. Items are
+    only batched with others submitted under the same ``key`` (for example
+    a model tier or a language pair).
+
+    ``batch_fn(key, items)`` runs in ``executor`` and must return one result
+    per item, in order. If it raises, every caller in the batch gets the
+    exception. ``backlog`` counts the items submitted but not yet answered,
+    whether still waiting for their batch or running in one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[Hashable, list], list],
+        max_batch: int = 8,
+        max_wait: float = 0.03,
+        executor: Executor | None = None,
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self.executor = executor
+
+        self._pending: dict[Hashable, list[tuple[Any, asyncio.Future]]] = {}
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+        self.batches = 0
+        self.items = 0
+        self.backlog = 0
+
+    async def submit(self, item: Any, key: Hashable = None) -> Any:
+        """Queue an item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(key, [])
+        pending.append((item, future))
+
+        if len(pending) >= self.max_batch:
+            self._flush(key)
+        elif len(pending) == 1:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+
+        self.backlog += 1
+        try:
+            return await future
+        finally:
+            self.backlog -= 1
+
+    def _flush(self, key: Hashable):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(key, None)
+        if batch:
+            asyncio.ensure_future(self._run(key, batch))
+
+    async def _run(self, key: Hashable, batch: list[tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in batch]
+        self.batches += 1
+        self.items += len(items)
+
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.batch_fn, key, items
+            )
+        except Exception as e:
+            logger.error(f"{self.name} batch of {len(items)} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
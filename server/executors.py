@@ -0,0 +1,110 @@
+"""
+Per-stage executors for the audio pipeline.
+STT, translation and TTS each get their own thread pool and a bounded queue,
+so a burst in one stage can't starve the others and overload surfaces as
+backpressure instead of unbounded memory growth.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+logger = logging.getLogger("voxbridge.executors")
+
+
+class StageOverloaded(Exception):
+    """Raised when a stage's queue is full and new work is rejected."""
+
+    def __init__(self, stage: str):
+        super().__init__(f"Stage '{stage}' is overloaded")
+        self.stage = stage
+
+
+class StageExecutor(Executor):
+    """
+    Thread pool with a bounded backlog and queue metrics.
+
+    At most ``workers`` jobs run at once and at most ``max_queue`` more may
+    wait; ``submit`` raises StageOverloaded beyond that. Being a regular
+    Executor, it can be passed straight to ``loop.run_in_executor``.
+    """
+
+    def __init__(self, name: str, workers: int, max_queue: int):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix=f"stage-{name}"
+        )
+        self._lock = threading.Lock()
+
+        self.pending = 0      # queued + running
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self._avg_wait = 0.0  # exponentially weighted, seconds
+        self._max_wait = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs accepted but not yet started."""
+        return self.pending - self.running
+
+    @property
+    def saturated(self) -> bool:
+        return self.pending >= self.capacity
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        with self._lock:
+            if self.pending >= self.capacity:
+                self.rejected += 1
+                raise StageOverloaded(self.name)
+            self.pending += 1
+            self.submitted += 1
+
+        enqueued_at = time.monotonic()
+
+        def run():
+            waited = time.monotonic() - enqueued_at
+            with self._lock:
+                self.running += 1
+                self._avg_wait = 0.9 * self._avg_wait + 0.1 * waited
+                self._max_wait = max(self._max_wait, waited)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.pending -= 1
+                    self.completed += 1
+
+        try:
+            return self._pool.submit(run)
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+            raise
+
+    def stats(self) -> dict:
+        """Snapshot of queue depth, throughput and wait times."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "maxQueue": self.max_queue,
+                "running": self.running,
+                "queueDepth": self.pending - self.running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avgWaitMs": round(self._avg_wait * 1000, 1),
+                "maxWaitMs": round(self._max_wait * 1000, 1),
+            }
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
@@ -0,0 +1,52 @@
+"""
+Deferred imports for heavy inference libraries.
+faster-whisper, Argos Translate and Piper pull in large native runtimes;
+importing them on first use keeps server start-up (and the test suite)
+fast and lets the warmup phase control when that cost is paid.
+"""
+
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    ``submodules`` are imported along with the package, so dotted access
+    such as ``argostranslate.translate.translate`` works the same as after
+    ``import argostranslate.translate``.
+    """
+
+    def __init__(self, name: str, submodules: tuple[str, ...] = ()):
+        self.__dict__["_name"] = name
+        self.__dict__["_submodules"] = submodules
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self._name)
+                    for sub in self._submodules:
+                        importlib.import_module(f"{self._name}.{sub}")
+                    self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr: str):
+        # Introspection (inspect, asyncio, mock.patch, copy) probes dunder and
+        # private names; answering those must not trigger the import.
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
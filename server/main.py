@@ -5,17 +5,45 @@ Main FastAPI application with WebSocket-based audio streaming and AI translation
 
 import asyncio
 import uuid
+import hashlib
 import time
 import logging
+import threading
 import os
 from pathlib import Path
 from dataclasses import dataclass, field
+from collections import OrderedDict
 
 import json
+import numpy as np
 import uvicorn
-from stt_service import transcribe, get_model
-from translate_service import translate as translate_text, get_supported_languages
-from tts_service import synthesize
+from stt_service import (
+    load_audio, transcribe_batch, transcribe_segments, set_backend, warm_up as warm_up_stt, MODEL_TIERS, SAMPLE_RATE,
+)
+from worker_pool import AudioWorkerPool
+from stt_policy import TierPolicy
+from batching import MicroBatcher
+from executors import StageExecutor, StageOverloaded
+from streaming_stt import StreamingTranscriber
+from resampler import StreamResampler
+from vad import VoiceActivityGate, totals as vad_totals
+from readiness import ModelReadiness
+from translate_service import (
+    translate_batch, plan_routes, prepare_pair, get_supported_languages,
+    set_registry as set_translation_registry, warm_up as warm_up_translation,
+    configure_cache as configure_translation_cache, configure_engine as configure_translation_engine, cache_stats as translation_cache_stats,
+    set_residency as set_translation_residency, residency_keys as translation_residency_keys,
+)
+from tts_service import (
+    synthesize, synthesize_stream, warm_up as warm_up_voice, prepare_voice, set_registry as set_voice_registry,
+    configure_cache as configure_tts_cache, cache_stats as tts_cache_stats, set_backend as set_tts_backend,
+    set_residency as set_voice_residency, residency_key as voice_residency_key,
+)
+from model_registry import ModelRegistry
+from residency import ResidencyManager
+from phrase_log import PhraseLog, TRANSLATE as PHRASE_TRANSLATE, SPEAK as PHRASE_SPEAK
+from text_utils import split_sentences, Untranslated
+from audio_codec import negotiate as negotiate_output_format, encode_samples
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
@@ -40,6 +68,169 @@ APK_PATH = Path(
     )
 )
 
+# Streaming ingest: how often to re-decode the rolling buffer, how much
+# trailing silence ends an utterance, and the longest utterance we buffer.
+STREAM_PARTIAL_INTERVAL = float(os.getenv("STREAM_PARTIAL_INTERVAL", "1.0"))
+STREAM_ENDPOINT_SILENCE = float(os.getenv("STREAM_ENDPOINT_SILENCE", "0.6"))
+STREAM_MAX_UTTERANCE = float(os.getenv("STREAM_MAX_UTTERANCE", "15.0"))
+
+# Cross-speaker STT batching: chunks arriving within the wait window are
+# decoded together in one Whisper pass.
+STT_BATCH_MAX_SIZE = int(os.getenv("STT_BATCH_MAX_SIZE", "8"))
+STT_BATCH_MAX_WAIT_MS = float(os.getenv("STT_BATCH_MAX_WAIT_MS", "30"))
+
+# Whisper tiers kept loaded, fastest first. Each chunk goes to the most
+# accurate tier expected to finish within the latency SLO given the current
+# STT backlog. Seed estimates are per-chunk seconds on a 4-thread CPU and
+# are replaced by measured timings as batches complete.
+STT_MODEL_TIERS = [
+    t.strip() for t in os.getenv("STT_MODEL_TIERS", "tiny,base,small").split(",")
+    if t.strip() in MODEL_TIERS
+] or ["small"]
+STT_LATENCY_SLO_MS = float(os.getenv("STT_LATENCY_SLO_MS", "1500"))
+STT_TIER_SEED_SECONDS = {"tiny": 0.15, "base": 0.35, "small": 0.9}
+
+# STT backend: "thread" runs Whisper in this process; "process" runs
+# STT_PROCESSES worker processes, each with its own models and CPU threads.
+# STT_WORKERS should be at least STT_PROCESSES to keep every worker busy.
+STT_BACKEND = os.getenv("STT_BACKEND", "thread")
+STT_PROCESSES = int(os.getenv("STT_PROCESSES", "2"))
+STT_PROCESS_CPU_THREADS = int(os.getenv("STT_PROCESS_CPU_THREADS", "2"))
+# A worker-process job that has not answered in this many seconds fails, so
+# a wedged worker can't hold an executor thread forever (STT and TTS pools).
+WORKER_JOB_TIMEOUT = float(os.getenv("WORKER_JOB_TIMEOUT", "120"))
+
+# Long chunks are decoded segment by segment, and each segment is translated,
+# synthesized and sent as soon as Whisper emits it instead of waiting for the
+# whole transcript. Shorter chunks go through the cross-speaker batcher; the
+# threshold sits well above the client's 4 s chunk so only long
+# (walkie-talkie) recordings are pipelined.
+SEGMENT_PIPELINING = os.getenv("SEGMENT_PIPELINING", "1") == "1"
+SEGMENT_PIPELINE_MIN_SECONDS = float(os.getenv("SEGMENT_PIPELINE_MIN_SECONDS", "8.0"))
+
+# Same-language passthrough: listeners who share the speaker's language get
+# the speaker's own (VAD-trimmed) audio instead of a synthesized reading of
+# the transcript. Default for new rooms; each room can change it.
+SAME_LANGUAGE_PASSTHROUGH = os.getenv("SAME_LANGUAGE_PASSTHROUGH", "1") == "1"
+
+# Listener delivery: "audio" listeners get speech synthesized eagerly;
+# "text" and "on_demand" listeners get translated_text messages and audio
+# only when they send request_audio for a messageId. When more than
+# TTS_DEGRADE_QUEUE_DEPTH synthesis jobs are queued, every listener is
+# switched to text-first until the backlog halves. Rooms remember their
+# last ROOM_MESSAGE_HISTORY messages for such requests, keeping at most
+# ROOM_AUDIO_HISTORY_BYTES of passthrough audio (16-bit) per room; older
+# messages fall back to synthesis.
+TTS_DEGRADE_QUEUE_DEPTH = int(os.getenv("TTS_DEGRADE_QUEUE_DEPTH", "24"))
+ROOM_MESSAGE_HISTORY = int(os.getenv("ROOM_MESSAGE_HISTORY", "200"))
+ROOM_AUDIO_HISTORY_BYTES = int(os.getenv("ROOM_AUDIO_HISTORY_BYTES", str(8 * 1024 * 1024)))
+
+# Client audio cache: every audio message carries an audioHash. Clients
+# that join with audioCache keep the clips they receive, and for hashes the
+# client holds (sent to it before, or listed in cachedAudio / audio_cached)
+# the server sends the JSON message with cached: true and skips the binary
+# frame. Up to CLIENT_AUDIO_CACHE_ENTRIES hashes are tracked per client.
+CLIENT_AUDIO_CACHE_ENTRIES = int(os.getenv("CLIENT_AUDIO_CACHE_ENTRIES", "64"))
+
+# TTS backend: "thread" runs Piper in this process; "process" runs it in a
+# pool of worker processes where each voice is served by the workers that
+# already have it loaded. A voice is spread to another worker once its
+# workers each have TTS_SPREAD_DEPTH jobs queued, and the pool grows up to
+# TTS_MAX_PROCESSES when every worker is that busy. Each worker keeps its
+# own small memory cache; the shared speech cache stays in this process.
+# TTS_WORKERS bounds the jobs in flight, so for the pool to grow it should
+# be at least TTS_MAX_PROCESSES * TTS_SPREAD_DEPTH.
+TTS_BACKEND = os.getenv("TTS_BACKEND", "thread")
+TTS_PROCESSES = int(os.getenv("TTS_PROCESSES", "2"))
+TTS_MAX_PROCESSES = int(os.getenv("TTS_MAX_PROCESSES", "4"))
+TTS_SPREAD_DEPTH = int(os.getenv("TTS_SPREAD_DEPTH", "2"))
+TTS_PROCESS_CACHE_BYTES = int(os.getenv("TTS_PROCESS_CACHE_BYTES", str(8 * 1024 * 1024)))
+TTS_PROCESS_VOICE_BUDGET_MB = int(os.getenv("TTS_PROCESS_VOICE_BUDGET_MB", "0"))
+
+# Memory budget for loaded voices and translators (0: unlimited). Models
+# needed by a language in an active room stay loaded; past the budget the
+# least recently used of the rest are unloaded until they are needed again.
+# Sizes are the models' on-disk sizes. With TTS_BACKEND=process voices live
+# in the workers, each bounded by TTS_PROCESS_VOICE_BUDGET_MB instead.
+MODEL_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "0"))
+
+# Streaming TTS: multi-sentence translations are synthesized sentence by
+# sentence and each chunk is sent as soon as it is ready (as
+# translated_audio_chunk frames closed by translated_audio_end), so playback
+# starts after the first sentence. Single sentences are sent whole.
+TTS_STREAMING = os.getenv("TTS_STREAMING", "1") == "1"
+
+# Concurrent translations for the same language pair (across rooms and
+# language groups) are coalesced into one batched translate call.
+TRANSLATE_BATCH_MAX_SIZE = int(os.getenv("TRANSLATE_BATCH_MAX_SIZE", "16"))
+TRANSLATE_BATCH_MAX_WAIT_MS = float(os.getenv("TRANSLATE_BATCH_MAX_WAIT_MS", "10"))
+
+# Translation engine: "ctranslate2" keeps a tokenizer and CTranslate2
+# translator per installed pair; "argos" uses Argos's per-call API only.
+TRANSLATE_ENGINE = os.getenv("TRANSLATE_ENGINE", "ctranslate2")
+TRANSLATE_BEAM_SIZE = int(os.getenv("TRANSLATE_BEAM_SIZE", "2"))
+TRANSLATE_COMPUTE_TYPE = os.getenv("TRANSLATE_COMPUTE_TYPE", "int8")
+TRANSLATE_INTRA_THREADS = int(os.getenv("TRANSLATE_INTRA_THREADS", "2"))
+
+# Sentence-level translation cache, bounded by bytes with a TTL
+TRANSLATION_CACHE_MAX_BYTES = int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+TRANSLATION_CACHE_TTL = float(os.getenv("TRANSLATION_CACHE_TTL", "86400"))
+
+# Synthesized speech cache: a byte-bounded memory tier in front of a
+# content-addressed directory of WAVs that survives restarts and can be
+# shared by several server processes. An empty TTS_CACHE_DIR disables disk.
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", str(Path(__file__).parent / "tts_cache"))
+TTS_CACHE_DISK_MAX_BYTES = int(os.getenv("TTS_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Local model store: Argos packages and Piper voices listed in the manifest
+# (with checksums) are resolved from this directory. Missing assets are
+# installed by a background thread; requests never wait on downloads.
+MODEL_ASSETS_DIR = Path(os.getenv("MODEL_ASSETS_DIR", str(Path(__file__).parent / "models")))
+MODEL_MANIFEST = os.getenv("MODEL_MANIFEST", str(MODEL_ASSETS_DIR / "manifest.json"))
+
+# Phrase log: how often each short translation and synthesized phrase is
+# requested, flushed to PHRASE_LOG_PATH every PHRASE_LOG_FLUSH_SECONDS (an
+# empty path disables it). After start-up the top PHRASE_WARM_TOP_N per
+# language pair and per voice are pre-computed into the caches, for at most
+# PHRASE_WARM_SECONDS, only while the stage has no queued work, and busy at
+# most PHRASE_WARM_CPU_SHARE of the time.
+PHRASE_LOG_PATH = os.getenv("PHRASE_LOG_PATH", str(Path(__file__).parent / "phrase_log.json"))
+PHRASE_LOG_FLUSH_SECONDS = float(os.getenv("PHRASE_LOG_FLUSH_SECONDS", "300"))
+PHRASE_WARM_TOP_N = int(os.getenv("PHRASE_WARM_TOP_N", "50"))
+PHRASE_WARM_SECONDS = float(os.getenv("PHRASE_WARM_SECONDS", "120"))
+PHRASE_WARM_CPU_SHARE = min(1.0, max(0.05, float(os.getenv("PHRASE_WARM_CPU_SHARE", "0.5"))))
+
+# Models warmed with a dummy inference at start-up, before /health/ready
+# reports ready. Pairs are "from-to"; voices default to the pairs' targets.
+WARMUP_TRANSLATION_PAIRS = [
+    tuple(p.strip().split("-", 1))
+    for p in os.getenv("WARMUP_TRANSLATION_PAIRS", "en-es,es-en").split(",")
+    if "-" in p
+]
+WARMUP_TTS_VOICES = [
+    v.strip() for v in os.getenv(
+        "WARMUP_TTS_VOICES", ",".join(sorted({to for _, to in WARMUP_TRANSLATION_PAIRS}))
+    ).split(",")
+    if v.strip()
+]
+
+# Voice-activity gate in front of Whisper: drop chunks without speech and
+# trim silence around it. The threshold is relative to each speaker's
+# adaptive noise floor.
+VAD_ENABLED = os.getenv("VAD_ENABLED", "1") == "1"
+VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", "9.0"))
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "200"))
+
+# Per-stage worker threads and how many jobs may queue behind them before
+# new work is rejected.
+STT_WORKERS = int(os.getenv("STT_WORKERS", "2"))
+STT_MAX_QUEUE = int(os.getenv("STT_MAX_QUEUE", "16"))
+TRANSLATE_WORKERS = int(os.getenv("TRANSLATE_WORKERS", "2"))
+TRANSLATE_MAX_QUEUE = int(os.getenv("TRANSLATE_MAX_QUEUE", "64"))
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", "2"))
+TTS_MAX_QUEUE = int(os.getenv("TTS_MAX_QUEUE", "64"))
+
 
 # ---------------------------------------------------------------------------
 # Application
@@ -83,6 +274,21 @@ class User:
     language: str  # ISO code: 'en', 'es', 'fr', etc.
     websocket: WebSocket
     is_muted: bool = False
+    audio_format: str = "wav"  # negotiated binary chunk format
+    output_format: str = "wav"  # negotiated speech format (audio_codec)
+    delivery: str = "audio"  # "audio", "text" or "on_demand"
+    stream: StreamingTranscriber | None = None
+    resampler: StreamResampler = field(default_factory=lambda: StreamResampler(SAMPLE_RATE))
+    decode_lock: threading.Lock = field(default_factory=threading.Lock)  # one WAV at a time
+    vad: VoiceActivityGate = field(
+        default_factory=lambda: VoiceActivityGate(
+            sample_rate=SAMPLE_RATE, threshold_db=VAD_THRESHOLD_DB, min_speech_ms=VAD_MIN_SPEECH_MS
+        )
+    )
+    stream_task: asyncio.Task | None = None
+    recording_next: bool = False  # next binary frame is a complete recording
+    audio_cache: bool = False  # client keeps received clips by audioHash
+    known_audio: OrderedDict = field(default_factory=OrderedDict)  # hashes it holds
     _dict: dict = field(init=False, default=None)
 
     def get_dict(self) -> dict:
@@ -98,6 +304,21 @@ class User:
     def clear_cache(self):
         self._dict = None
 
+    def has_audio(self, audio_hash: str) -> bool:
+        if audio_hash in self.known_audio:
+            self.known_audio.move_to_end(audio_hash)
+            return True
+        return False
+
+    def add_audio(self, audio_hash: str):
+        """Record a clip the client now holds (only if it caches clips)."""
+        if not self.audio_cache:
+            return
+        self.known_audio[audio_hash] = None
+        self.known_audio.move_to_end(audio_hash)
+        while len(self.known_audio) > CLIENT_AUDIO_CACHE_ENTRIES:
+            self.known_audio.popitem(last=False)
+
 
 @dataclass
 class Room:
@@ -105,11 +326,38 @@ class Room:
     name: str
     created_at: float = field(default_factory=time.time)
     users: dict[str, User] = field(default_factory=dict)
+    passthrough: bool = field(default_factory=lambda: SAME_LANGUAGE_PASSTHROUGH)
+    # messageId -> (translated_audio_meta, int16 passthrough audio or None)
+    messages: OrderedDict = field(default_factory=OrderedDict)
+    audio_bytes: int = 0
 
     @property
     def user_count(self) -> int:
         return len(self.users)
 
+    def remember(self, meta: dict, audio: np.ndarray | None = None, recipients=()) -> str:
+        """
+        Keep a delivered message for later request_audio; returns its id.
+        Only ``recipients`` (user ids) may request it.
+        """
+        message_id = uuid.uuid4().hex[:12]
+        if audio is not None:
+            audio = np.clip(np.round(audio * 32768.0), -32768, 32767).astype(np.int16)
+            self.audio_bytes += audio.nbytes
+        self.messages[message_id] = (meta, audio, frozenset(recipients))
+        while len(self.messages) > ROOM_MESSAGE_HISTORY:
+            _, (_, dropped, _) = self.messages.popitem(last=False)
+            if dropped is not None:
+                self.audio_bytes -= dropped.nbytes
+        # Over the audio budget: oldest messages keep their text only
+        for old_id, (old_meta, old_audio, old_recipients) in self.messages.items():
+            if self.audio_bytes <= ROOM_AUDIO_HISTORY_BYTES:
+                break
+            if old_audio is not None:
+                self.messages[old_id] = (old_meta, None, old_recipients)
+                self.audio_bytes -= old_audio.nbytes
+        return message_id
+
 
 # Global registries
 rooms: dict[str, Room] = {}
@@ -118,6 +366,72 @@ threads_db: dict[str, dict] = {}         # threadKey -> {id, user1_id, user2_id}
 user_threads: dict[str, list[str]] = {}  # userId -> [threadKey, ...]
 
 
+# Pipeline stages: each has its own pool so Whisper, Argos and Piper don't
+# compete for the default executor.
+stt_stage = StageExecutor("stt", STT_WORKERS, STT_MAX_QUEUE)
+translate_stage = StageExecutor("translate", TRANSLATE_WORKERS, TRANSLATE_MAX_QUEUE)
+tts_stage = StageExecutor("tts", TTS_WORKERS, TTS_MAX_QUEUE)
+
+stt_policy = TierPolicy(
+    STT_MODEL_TIERS,
+    slo=STT_LATENCY_SLO_MS / 1000.0,
+    workers=STT_WORKERS,
+    initial_estimates=STT_TIER_SEED_SECONDS,
+)
+
+
+def _transcribe_tier_batch(tier: str, items: list) -> list[dict]:
+    """Batch function for the STT batcher; feeds timings back to the policy."""
+    started = time.monotonic()
+    results = transcribe_batch(items, tier)
+    stt_policy.record(tier, time.monotonic() - started, len(items))
+    return results
+
+
+translate_batcher = MicroBatcher(
+    "translate",
+    lambda pair, texts: translate_batch(texts, *pair),
+    max_batch=TRANSLATE_BATCH_MAX_SIZE,
+    max_wait=TRANSLATE_BATCH_MAX_WAIT_MS / 1000.0,
+    executor=translate_stage,
+)
+
+# Set at startup when STT_BACKEND=process / TTS_BACKEND=process
+stt_pool: AudioWorkerPool | None = None
+tts_pool: AudioWorkerPool | None = None
+
+# Long recordings being decoded segment by segment (see stt_backlog)
+stt_segment_decodes = 0
+
+# Every listener gets text first while TTS is backlogged (see tts_backlogged)
+tts_text_first = False
+
+# Binary frames not sent because the client already had the clip
+client_audio_cache = {"framesSkipped": 0, "bytesSaved": 0}
+
+readiness = ModelReadiness()
+model_registry = ModelRegistry(MODEL_ASSETS_DIR, Path(MODEL_MANIFEST))
+model_residency = ResidencyManager(MODEL_MEMORY_BUDGET_MB * 1024 * 1024)
+phrase_log = PhraseLog(Path(PHRASE_LOG_PATH)) if PHRASE_LOG_PATH else None
+
+configure_translation_cache(TRANSLATION_CACHE_MAX_BYTES, TRANSLATION_CACHE_TTL)
+configure_translation_engine(
+    enabled=TRANSLATE_ENGINE == "ctranslate2",
+    beam_size=TRANSLATE_BEAM_SIZE,
+    compute_type=TRANSLATE_COMPUTE_TYPE,
+    intra_threads=TRANSLATE_INTRA_THREADS,
+)
+configure_tts_cache(TTS_CACHE_MAX_BYTES, Path(TTS_CACHE_DIR) if TTS_CACHE_DIR else None, TTS_CACHE_DISK_MAX_BYTES)
+
+stt_batcher = MicroBatcher(
+    "stt",
+    _transcribe_tier_batch,
+    max_batch=STT_BATCH_MAX_SIZE,
+    max_wait=STT_BATCH_MAX_WAIT_MS / 1000.0,
+    executor=stt_stage,
+)
+
+
 def _thread_key(user1_id: str, user2_id: str) -> str:
     return '_'.join(sorted([user1_id, user2_id]))
 
@@ -126,6 +440,46 @@ def _thread_key(user1_id: str, user2_id: str) -> str:
 # ---------------------------------------------------------------------------
 # REST API Endpoints
 # ---------------------------------------------------------------------------
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness probe: 200 once every required model is warm, else 503."""
+    return JSONResponse(
+        {"ready": readiness.ready, "models": readiness.stats()},
+        status_code=200 if readiness.ready else 503,
+    )
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Pipeline load: per-stage queue depth and wait times, STT batching."""
+    return JSONResponse({
+        "stages": {
+            stage.name: stage.stats()
+            for stage in (stt_stage, translate_stage, tts_stage)
+        },
+        "ttsTextFirst": tts_text_first,
+        "clientAudioCache": client_audio_cache,
+        "vad": vad_totals,
+        "sttBatching": {
+            "batches": stt_batcher.batches,
+            "items": stt_batcher.items,
+            "avgBatchSize": round(stt_batcher.average_batch_size, 2),
+        },
+        "translateBatching": {
+            "batches": translate_batcher.batches,
+            "items": translate_batcher.items,
+            "avgBatchSize": round(translate_batcher.average_batch_size, 2),
+        },
+        "sttTiers": stt_policy.stats(),
+        "sttPool": stt_pool.stats() if stt_pool else None,
+        "ttsPool": tts_pool.stats() if tts_pool else None,
+        "translationCache": translation_cache_stats(),
+        "ttsCache": tts_cache_stats(),
+        "modelAssets": model_registry.stats(),
+        "modelResidency": model_residency.stats(),
+    })
+
+
 @app.get("/api/languages")
 async def get_languages():
     """Return supported languages."""
@@ -137,9 +491,11 @@ async def create_room(data: RoomCreate):
     """Create a new room."""
     room_id = str(uuid.uuid4())[:8]
     room_name = data.name if data.name else f"Room {room_id}"
-    rooms[room_id] = Room(id=room_id, name=room_name)
+    room = rooms[room_id] = Room(id=room_id, name=room_name)
+    if data.passthrough is not None:
+        room.passthrough = data.passthrough
     logger.info(f"Room created: {room_id} ({room_name})")
-    return JSONResponse({"id": room_id, "name": room_name})
+    return JSONResponse({"id": room_id, "name": room_name, "passthrough": room.passthrough})
 
 
 @app.post("/api/users/register")
@@ -248,8 +604,28 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str):
         rooms[room_id] = Room(id=room_id, name=f"Room {room_id}")
 
     room = rooms[room_id]
-    user = User(id=user_id, name=user_name, language=user_lang, websocket=websocket)
+    user = User(
+        id=user_id,
+        name=user_name,
+        language=user_lang,
+        websocket=websocket,
+        audio_format=user_data.audioFormat,
+        output_format=negotiate_output_format(user_data.outputFormats),
+        delivery=user_data.delivery,
+        audio_cache=user_data.audioCache,
+    )
+    for audio_hash in user_data.cachedAudio[-CLIENT_AUDIO_CACHE_ENTRIES:]:
+        user.add_audio(audio_hash)
+    if user_data.streaming:
+        user.stream = StreamingTranscriber(
+            user_lang,
+            partial_interval=STREAM_PARTIAL_INTERVAL,
+            endpoint_silence=STREAM_ENDPOINT_SILENCE,
+            max_utterance=STREAM_MAX_UTTERANCE,
+            vad=user.vad if VAD_ENABLED else None,
+        )
     room.users[user_id] = user
+    refresh_model_residency()
 
     logger.info(f"User '{user_name}' ({user_lang}) joined room '{room_id}' [{room.user_count} users]")
 
@@ -268,6 +644,7 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str):
         "userId": user_id,
         "roomId": room_id,
         "roomName": room.name,
+        "outputFormat": user.output_format,
         "users": get_user_list(room),
     })
 
@@ -284,7 +661,21 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str):
             elif "bytes" in message:
                 # Binary audio data
                 audio_bytes = message["bytes"]
-                if not user.is_muted and len(audio_bytes) > 100:
+                if user.is_muted:
+                    continue
+                recording, user.recording_next = user.recording_next, False
+                if user.stream is not None and not recording and not audio_bytes.startswith(b"RIFF"):
+                    # Streaming mode: small PCM frames into the rolling buffer.
+                    # Complete recordings (walkie-talkie) are announced with
+                    # a "recording" message, or are WAV files, and take the
+                    # chunk path below.
+                    if user.stream.feed(audio_bytes):
+                        schedule_stream_decode(room, user)
+                elif len(audio_bytes) > 100:
+                    if stt_stage.saturated:
+                        # Backpressure: drop the chunk rather than queue it
+                        await notify_busy(user, stt_stage.name)
+                        continue
                     # Process audio in a background task to not block receiving
                     asyncio.create_task(
                         process_audio(room, user, audio_bytes)
@@ -308,6 +699,7 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str):
         if room.user_count == 0:
             rooms.pop(room_id, None)
             logger.info(f"Room '{room_id}' removed (empty)")
+        refresh_model_residency()
 
 
 async def handle_control_message(room: Room, user: User, data: dict):
@@ -337,9 +729,12 @@ async def handle_control_message(room: Room, user: User, data: dict):
     elif msg_type == "change_language":
         new_lang = data.get("language", user.language)
         user.language = new_lang
+        if user.stream is not None:
+            user.stream.source_lang = new_lang
         if user.id in users_db:
             users_db[user.id]["language"] = new_lang
         user.clear_cache()
+        refresh_model_residency()
         await broadcast_system(room, {
             "type": "user_language_changed",
             "userId": user.id,
@@ -349,6 +744,112 @@ async def handle_control_message(room: Room, user: User, data: dict):
         })
         logger.info(f"User '{user.name}' changed language to '{new_lang}'")
 
+    elif msg_type == "set_passthrough":
+        room.passthrough = bool(data.get("enabled", SAME_LANGUAGE_PASSTHROUGH))
+        await broadcast_system(room, {
+            "type": "room_settings",
+            "passthrough": room.passthrough,
+        })
+        logger.info(f"Room '{room.id}' passthrough {'on' if room.passthrough else 'off'}")
+
+    elif msg_type == "set_delivery":
+        mode = data.get("mode")
+        if mode in ("audio", "text", "on_demand"):
+            user.delivery = mode
+
+    elif msg_type == "recording":
+        # The next binary frame is a complete recording, not a stream frame
+        user.recording_next = True
+
+    elif msg_type == "audio_cached":
+        for audio_hash in data.get("hashes", [])[-CLIENT_AUDIO_CACHE_ENTRIES:]:
+            user.add_audio(str(audio_hash))
+
+    elif msg_type == "audio_evicted":
+        for audio_hash in data.get("hashes", []):
+            user.known_audio.pop(str(audio_hash), None)
+
+    elif msg_type == "request_audio":
+        seq = data.get("seq")
+        asyncio.create_task(send_requested_audio(
+            room, user, data.get("messageId"), seq if isinstance(seq, int) else None
+        ))
+
+    elif msg_type == "end_stream":
+        # Client stopped its microphone: finalize the current utterance
+        if user.stream is not None:
+            user.stream.request_flush()
+            schedule_stream_decode(room, user)
+
+
+def schedule_stream_decode(room: Room, user: User):
+    """Start a decode loop for a streaming user unless one is already running."""
+    if user.stream_task is None or user.stream_task.done():
+        user.stream_task = asyncio.create_task(process_stream(room, user))
+
+
+def _segment_decode_done():
+    global stt_segment_decodes
+    stt_segment_decodes -= 1
+
+
+def stt_backlog() -> int:
+    """Chunks ahead of a new one: batched or waiting for a batch, plus long
+    recordings being decoded segment by segment."""
+    return stt_batcher.backlog + stt_segment_decodes
+
+
+async def transcribe_chunk(audio, language: str | None) -> dict:
+    """Pick a Whisper tier for the current load and decode one chunk."""
+    tier = stt_policy.choose(stt_backlog())
+    return await stt_batcher.submit((audio, language), key=tier)
+
+
+async def process_stream(room: Room, sender: User):
+    """
+    Streaming STT loop: re-decode the sender's rolling buffer while new audio
+    keeps arriving, pushing partial hypotheses to the room, and hand each
+    finalized utterance to the translation pipeline.
+    """
+    stream = sender.stream
+    try:
+        while stream.decode_due:
+            start_time = time.time()
+            snap = stream.snapshot()
+            if snap is None:
+                continue
+            audio, final = snap
+            result = await transcribe_chunk(audio, stream.source_lang)
+            msg = stream.hypothesis(result, final)
+            if msg is None:
+                continue
+
+            msg["userId"] = sender.id
+            msg["fromUser"] = sender.name
+            await broadcast_system(room, msg)
+
+            if msg["type"] == "final_transcription":
+                logger.info(f"Streaming STT [{msg['language']}] final for {sender.name}")
+                asyncio.create_task(deliver_translations(
+                    room, sender, msg["text"], msg["language"], start_time, audio=audio,
+                ))
+    except StageOverloaded as e:
+        logger.warning(f"Streaming STT for {sender.name} deferred: {e}")
+    except Exception as e:
+        logger.error(f"Streaming STT error: {e}", exc_info=True)
+
+
+def decode_recording(user: User, audio_bytes: bytes) -> np.ndarray | None:
+    """
+    Decode a complete WAV file with the user's resampler. Files are
+    decoded one at a time per user, each from a fresh filter state: they
+    are separate recordings, and chunks overlapping on stt_stage must not
+    interleave their updates to the shared filter history.
+    """
+    with user.decode_lock:
+        user.resampler.reset()
+        return load_audio(audio_bytes, "wav", user.resampler)
+
 
 async def process_audio(room: Room, sender: User, audio_bytes: bytes):
     """
@@ -362,10 +863,29 @@ async def process_audio(room: Room, sender: User, audio_bytes: bytes):
     start_time = time.time()
 
     try:
-        # Step 1: Speech-to-Text
-        result = await asyncio.get_event_loop().run_in_executor(
-            None, lambda: transcribe(audio_bytes, sender.language)
-        )
+        # Step 1: Speech-to-Text (decoded here, batched with other speakers).
+        # Complete WAV files are always accepted, whatever was negotiated.
+        if audio_bytes.startswith(b"RIFF"):
+            audio = await asyncio.get_event_loop().run_in_executor(
+                stt_stage, decode_recording, sender, audio_bytes
+            )
+        else:
+            # Raw PCM16 is a single vectorized pass; not worth a thread hop
+            audio = load_audio(audio_bytes, sender.audio_format)
+        if audio is None:
+            return  # Too short or silent
+
+        # Voice-activity gate: skip noise-only chunks, trim to the speech
+        if VAD_ENABLED:
+            audio = sender.vad.process(audio)
+            if audio is None:
+                return
+
+        if SEGMENT_PIPELINING and len(audio) >= SEGMENT_PIPELINE_MIN_SECONDS * SAMPLE_RATE:
+            await process_segments(room, sender, audio, start_time)
+            return
+
+        result = await transcribe_chunk(audio, sender.language)
 
         text = result["text"]
         detected_lang = result["language"]
@@ -381,12 +901,169 @@ async def process_audio(room: Room, sender: User, audio_bytes: bytes):
                 "type": "transcription",
                 "text": text,
                 "language": detected_lang,
+                "model": result.get("model"),
             })
         except Exception:
             pass
 
         # Step 2: Translate and synthesize for each listener
+        await deliver_translations(room, sender, text, detected_lang, start_time, audio=audio)
+
+    except StageOverloaded as e:
+        logger.warning(f"Dropped audio from {sender.name}: {e}")
+        await notify_busy(sender, e.stage)
+    except Exception as e:
+        logger.error(f"Audio processing error: {e}", exc_info=True)
+
+
+async def process_segments(room: Room, sender: User, audio, start_time: float):
+    """
+    Segment-pipelined STT for long chunks: Whisper segments are handed to
+    translation and TTS as they are decoded, so listeners hear the first
+    sentence while the rest is still being transcribed. Delivery order per
+    language follows segment order.
+    """
+    loop = asyncio.get_event_loop()
+    segments: asyncio.Queue = asyncio.Queue()
+    tier = stt_policy.choose(stt_backlog())
+
+    def decode():
+        try:
+            for segment in transcribe_segments(audio, sender.language, tier):
+                loop.call_soon_threadsafe(segments.put_nowait, segment)
+        finally:
+            loop.call_soon_threadsafe(segments.put_nowait, None)
+
+    global stt_segment_decodes
+    stt_segment_decodes += 1
+    decoding = loop.run_in_executor(stt_stage, decode)
+    decoding.add_done_callback(lambda _: _segment_decode_done())
+    order = OrderedDelivery()
+    deliveries = []
+    texts = []
+    detected_lang = sender.language
+    while (segment := await segments.get()) is not None:
+        texts.append(segment["text"])
+        detected_lang = segment["language"]
+        deliveries.append(asyncio.create_task(deliver_translations(
+            room, sender, segment["text"], detected_lang, start_time,
+            order=order, segment=len(deliveries),
+            audio=audio[int(segment["start"] * SAMPLE_RATE):int(segment["end"] * SAMPLE_RATE)],
+        )))
+    try:
+        await decoding
+    finally:
+        await asyncio.gather(*deliveries)
+
+    if not texts:
+        return  # No speech detected
+
+    logger.info(f"STT [{detected_lang}] for {sender.name} ({len(texts)} segments)")
+    try:
+        await sender.websocket.send_json({
+            "type": "transcription",
+            "text": " ".join(texts),
+            "language": detected_lang,
+            "model": tier,
+        })
+    except Exception:
+        pass
+
+
+def fan_out_translations(
+    text: str, source_lang: str, targets: list[str], spawned: list[asyncio.Future] | None = None
+) -> dict[str, asyncio.Future]:
+    """
+    Start translating ``text`` into every target language at once.
+
+    Routes are planned up front and each leg is run once per distinct
+    language path, so targets that pivot through English share a single
+    source -> en translation and fan out from it. Returns a future per
+    target (other than the source language); each resolves independently.
+    Every future started here is also appended to ``spawned``, so the
+    caller can settle the ones it never awaited (see ``settle``).
+    """
+    loop = asyncio.get_event_loop()
+    spawned = spawned if spawned is not None else []
+
+    def start(aw) -> asyncio.Future:
+        future = asyncio.ensure_future(aw)
+        spawned.append(future)
+        return future
+
+    targets = [t for t in targets if t != source_lang]
+    routes = start(loop.run_in_executor(translate_stage, plan_routes, source_lang, targets))
+    legs: dict[tuple[str, ...], asyncio.Future] = {}
 
+    def leg(path: tuple[str, ...]) -> asyncio.Future:
+        if path not in legs:
+            async def run():
+                source = text if len(path) == 2 else await leg(path[:-1])
+                if isinstance(source, Untranslated):
+                    # The first leg is still installing: the text is not in
+                    # the pivot language, so don't run it through the next
+                    return source
+                return await translate_batcher.submit(source, key=path[-2:])
+            legs[path] = start(run())
+        return legs[path]
+
+    async def translate_to(target: str) -> str:
+        return await leg(tuple((await routes)[target]))
+
+    return {target: start(translate_to(target)) for target in targets}
+
+
+async def settle(futures: list[asyncio.Future]):
+    """
+    Cancel futures nobody awaited and retrieve every outcome, so failed
+    ones don't log "exception was never retrieved".
+    """
+    for future in futures:
+        future.cancel()
+    await asyncio.gather(*futures, return_exceptions=True)
+
+
+class OrderedDelivery:
+    """
+    Keeps the segments of one utterance in order for each language group.
+
+    Translation and synthesis of later segments may finish first; their
+    audio is only sent once the previous segment's has gone out for the
+    same language. Slots are reserved in segment order, before the first
+    await in ``deliver_translations``.
+    """
+
+    def __init__(self):
+        self._tails: dict[str, asyncio.Future] = {}
+
+    def reserve(self, lang: str) -> tuple[asyncio.Future | None, asyncio.Future]:
+        """Return (previous segment's send, this segment's send) for a language."""
+        previous = self._tails.get(lang)
+        done = asyncio.get_event_loop().create_future()
+        self._tails[lang] = done
+        return previous, done
+
+
+async def deliver_translations(
+    room: Room,
+    sender: User,
+    text: str,
+    detected_lang: str,
+    start_time: float,
+    order: OrderedDelivery | None = None,
+    segment: int | None = None,
+    audio: np.ndarray | None = None,
+):
+    """
+    Translate, synthesize and send a transcript to every listener.
+
+    When ``order`` is given the transcript is one segment of a longer
+    utterance, sent after the segments before it. ``audio`` is what the
+    speaker said (16 kHz); in passthrough rooms it is forwarded as is to
+    listeners of the same language.
+    """
+    spawned: list[asyncio.Future] = []
+    try:
         # Group listeners by target language to avoid duplicate work
         lang_groups: dict[str, list[User]] = {}
         for uid, listener in room.users.items():
@@ -397,44 +1074,101 @@ async def process_audio(room: Room, sender: User, audio_bytes: bytes):
                 lang_groups[lang] = []
             lang_groups[lang].append(listener)
 
+        turns = {lang: order.reserve(lang) for lang in lang_groups} if order else {}
+
+        translations = fan_out_translations(text, detected_lang, list(lang_groups), spawned)
+
         async def process_group(target_lang, listeners):
+            previous, done = turns.get(target_lang, (None, None))
             try:
                 # Translate
                 if target_lang != detected_lang:
-                    translated = await asyncio.get_event_loop().run_in_executor(
-                        None, lambda tl=target_lang: translate_text(text, detected_lang, tl)
-                    )
+                    translated = await translations[target_lang]
+                    if phrase_log is not None:
+                        phrase_log.record_translation(text, detected_lang, target_lang)
                 else:
                     translated = text
 
                 logger.info(f"Translate [{detected_lang}->{target_lang}]")
 
-                # TTS
-                tts_audio = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda tl=target_lang, tx=translated: synthesize(tx, tl)
+                meta = {
+                    "type": "translated_audio_meta",
+                    "fromUser": sender.name,
+                    "fromLanguage": detected_lang,
+                    "toLanguage": target_lang,
+                    "originalText": text,
+                    "translatedText": translated,
+                }
+                if segment is not None:
+                    meta["segment"] = segment
+                # Still in the speaker's language: show it, but don't read
+                # it out in the listener's voice
+                pending = isinstance(translated, Untranslated)
+                if pending:
+                    meta["pending"] = True
+
+                passthrough = room.passthrough and audio is not None and target_lang == detected_lang
+                if passthrough:
+                    meta["passthrough"] = True
+
+                # Text-only and on-demand listeners (everyone, while TTS is
+                # backlogged or the translation is pending) get the text now
+                # and audio only if they ask
+                text_first = tts_backlogged()
+                eager = [l for l in listeners if l.delivery == "audio" and not text_first and not pending]
+                readers = [l for l in listeners if l not in eager]
+                meta["messageId"] = room.remember(
+                    meta, audio if passthrough and readers else None, [l.id for l in listeners]
                 )
 
-                # Send to all listeners with this language concurrently
-                async def send_to_listener(listener):
-                    try:
-                        # Send metadata first
-                        await listener.websocket.send_json({
-                            "type": "translated_audio_meta",
-                            "fromUser": sender.name,
-                            "fromLanguage": detected_lang,
-                            "toLanguage": target_lang,
-                            "originalText": text,
-                            "translatedText": translated,
-                        })
-                        # Then send audio bytes
-                        await listener.websocket.send_bytes(tts_audio)
-                    except Exception as e:
-                        logger.error(f"Failed to send audio to {listener.name}: {e}")
-
-                await asyncio.gather(*(send_to_listener(l) for l in listeners))
-
+                async def send_text():
+                    if previous is not None:
+                        await previous
+                    await send_to_listeners(readers, {
+                        **meta, "type": "translated_text", "textFirst": text_first,
+                    })
+
+                async def send_audio():
+                    # Audio is produced once per output format in the group
+                    by_format: dict[str, list[User]] = {}
+                    for listener in eager:
+                        by_format.setdefault(listener.output_format, []).append(listener)
+
+                    if passthrough:
+                        # Same language: forward the speaker's own voice
+                        # rather than a synthesized reading of the transcript.
+                        # Trimming, resampling and encoding run off the loop.
+                        loop = asyncio.get_event_loop()
+                        encoded = await asyncio.gather(*(
+                            loop.run_in_executor(tts_stage, encode_samples, audio, SAMPLE_RATE, audio_format)
+                            for audio_format in by_format
+                        ))
+                        if previous is not None:
+                            await previous
+                        await asyncio.gather(*(
+                            send_to_listeners(group, meta, wav)
+                            for group, wav in zip(by_format.values(), encoded)
+                        ))
+                    else:
+                        await asyncio.gather(*(
+                            speak(group, meta, audio_format, previous)
+                            for audio_format, group in by_format.items()
+                        ))
+
+                await asyncio.gather(send_text(), send_audio())
+
+            except StageOverloaded as e:
+                logger.warning(f"Pipeline shed lang {target_lang}: {e}")
             except Exception as e:
                 logger.error(f"Pipeline failed for lang {target_lang}: {e}")
+            finally:
+                # Release the next segment even if this one failed, but
+                # never ahead of the segments before it.
+                if done is not None:
+                    if previous is None or previous.done():
+                        done.set_result(None)
+                    else:
+                        previous.add_done_callback(lambda _: done.set_result(None))
 
         # Process all language groups in parallel
         await asyncio.gather(*(
@@ -446,12 +1180,187 @@ async def process_audio(room: Room, sender: User, audio_bytes: bytes):
         logger.info(f"Pipeline completed in {elapsed:.2f}s for {sender.name}")
 
     except Exception as e:
-        logger.error(f"Audio processing error: {e}", exc_info=True)
+        logger.error(f"Translation delivery error: {e}", exc_info=True)
+    finally:
+        await settle(spawned)
+
+
+def tts_backlogged() -> bool:
+    """
+    Whether listeners should get text first because TTS is backlogged.
+    Switches on past TTS_DEGRADE_QUEUE_DEPTH queued jobs and back off once
+    the queue has drained to half that.
+    """
+    global tts_text_first
+    depth = tts_stage.queue_depth
+    if not tts_text_first and depth >= TTS_DEGRADE_QUEUE_DEPTH:
+        tts_text_first = True
+        logger.warning(f"TTS backlog at {depth} jobs; delivering text first.")
+    elif tts_text_first and depth <= TTS_DEGRADE_QUEUE_DEPTH // 2:
+        tts_text_first = False
+        logger.info("TTS backlog cleared; delivering audio again.")
+    return tts_text_first
+
+
+async def send_requested_audio(
+    room: Room, user: User, message_id: str | None, seq: int | None = None
+):
+    """
+    Synthesize (or re-encode) one remembered message for a listener who
+    asked. With ``seq`` only that sentence of a streamed message is sent,
+    as a translated_audio_chunk. Requests for messages the user wasn't
+    sent, or that are in another language than theirs, are ignored.
+    """
+    message = room.messages.get(message_id)
+    if message is not None and (user.id not in message[2] or user.language != message[0]["toLanguage"]):
+        logger.warning(f"User '{user.name}' requested audio for message {message_id} they did not receive")
+        return
+    sentences = split_sentences(message[0]["translatedText"]) if message and seq is not None else []
+    if (
+        message is None
+        or message[0].get("pending")  # Not translated: nothing to speak
+        or (seq is not None and not 0 <= seq < len(sentences))
+    ):
+        try:
+            await user.websocket.send_json({"type": "audio_unavailable", "messageId": message_id, "seq": seq})
+        except Exception:
+            pass
+        return
+
+    meta, audio, _ = message
+    loop = asyncio.get_event_loop()
+    try:
+        if seq is not None:
+            sentence = sentences[seq]
+            wav = await loop.run_in_executor(
+                tts_stage,
+                lambda: synthesize(sentence, meta["toLanguage"], audio_format=user.output_format),
+            )
+            meta = {
+                "type": "translated_audio_chunk", "toLanguage": meta["toLanguage"],
+                "messageId": message_id, "seq": seq, "text": sentence,
+            }
+        elif audio is not None:
+            wav = await loop.run_in_executor(
+                tts_stage,
+                lambda: encode_samples(audio.astype(np.float32) / 32768.0, SAMPLE_RATE, user.output_format),
+            )
+        else:
+            wav = await loop.run_in_executor(
+                tts_stage,
+                lambda: synthesize(meta["translatedText"], meta["toLanguage"], audio_format=user.output_format),
+            )
+    except StageOverloaded as e:
+        await notify_busy(user, e.stage)
+        return
+    await send_to_listeners([user], {**meta, "requested": True}, wav)
+
+
+async def speak(
+    listeners: list[User], meta: dict, audio_format: str, previous: asyncio.Future | None
+):
+    """
+    Synthesize ``meta["translatedText"]`` in one output format and send it,
+    after ``previous`` (the segment before this one) has gone out.
+    """
+    text, lang = meta["translatedText"], meta["toLanguage"]
+    if phrase_log is not None:
+        phrase_log.record_speech(text, lang, audio_format)
+    if TTS_STREAMING and len(split_sentences(text)) > 1:
+        # Sentence by sentence; playback starts after the first
+        await stream_speech(listeners, meta, audio_format, previous)
+        return
+
+    tts_audio = await asyncio.get_event_loop().run_in_executor(
+        tts_stage, lambda: synthesize(text, lang, audio_format=audio_format)
+    )
+
+    # Wait for the previous segment's audio to go out first
+    if previous is not None:
+        await previous
+
+    # Send to all listeners with this language concurrently
+    await send_to_listeners(listeners, meta, tts_audio)
+
+
+async def stream_speech(
+    listeners: list[User], meta: dict, audio_format: str, previous: asyncio.Future | None
+):
+    """
+    Synthesize ``meta["translatedText"]`` sentence by sentence and send each
+    chunk as soon as it is ready: the meta message, then one
+    ``translated_audio_chunk`` (followed by its WAV bytes) per sentence,
+    then ``translated_audio_end``. Synthesis starts right away; sending
+    waits for ``previous``.
+    """
+    loop = asyncio.get_event_loop()
+    lang = meta["toLanguage"]
+    chunks: asyncio.Queue = asyncio.Queue()
+
+    def synthesize_all():
+        try:
+            for chunk in synthesize_stream(meta["translatedText"], lang, audio_format=audio_format):
+                loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+        finally:
+            loop.call_soon_threadsafe(chunks.put_nowait, None)
+
+    synthesis = loop.run_in_executor(tts_stage, synthesize_all)
+    try:
+        if previous is not None:
+            await previous
+        await send_to_listeners(listeners, {**meta, "streaming": True})
+
+        frame = {"toLanguage": lang}
+        if "segment" in meta:
+            frame["segment"] = meta["segment"]
+        seq = 0
+        while (chunk := await chunks.get()) is not None:
+            sentence, audio = chunk
+            await send_to_listeners(
+                listeners,
+                {
+                    "type": "translated_audio_chunk", **frame,
+                    "messageId": meta.get("messageId"), "seq": seq, "text": sentence,
+                },
+                audio,
+            )
+            seq += 1
+        await send_to_listeners(listeners, {"type": "translated_audio_end", **frame, "chunks": seq})
+    finally:
+        await synthesis
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
+async def send_to_listeners(listeners: list[User], message: dict, audio: bytes | None = None):
+    """
+    Send a JSON message, and optionally the audio that follows it, to each
+    listener. Audio messages carry the clip's ``audioHash``; listeners whose
+    client already holds that clip get ``cached: true`` and no binary frame,
+    unless they explicitly requested the audio.
+    """
+    if audio is not None:
+        message = {**message, "audioHash": hashlib.sha256(audio).hexdigest()[:32]}
+    audio_hash = message.get("audioHash")
+
+    async def send(listener: User):
+        try:
+            if audio is not None and not message.get("requested") and listener.has_audio(audio_hash):
+                await listener.websocket.send_json({**message, "cached": True})
+                client_audio_cache["framesSkipped"] += 1
+                client_audio_cache["bytesSaved"] += len(audio)
+                return
+            await listener.websocket.send_json(message)
+            if audio is not None:
+                await listener.websocket.send_bytes(audio)
+                listener.add_audio(audio_hash)
+        except Exception as e:
+            logger.error(f"Failed to send audio to {listener.name}: {e}")
+
+    await asyncio.gather(*(send(l) for l in listeners))
+
+
 def get_user_list(room: Room) -> list[dict]:
     """Get list of users in a room for broadcasting."""
     return [
@@ -460,6 +1369,28 @@ def get_user_list(room: Room) -> list[dict]:
     ]
 
 
+def refresh_model_residency():
+    """Tell the residency manager which models the current rooms need."""
+    needed = set()
+    for room in rooms.values():
+        langs = {u.language for u in room.users.values()}
+        # Every language is spoken to its own listeners, and translated
+        # from every other language in the room
+        needed.update(voice_residency_key(lang) for lang in langs)
+        for a in langs:
+            for b in langs - {a}:
+                needed.update(translation_residency_keys(a, b))
+    model_residency.set_active(needed)
+
+
+async def notify_busy(user: User, stage: str):
+    """Tell a client its audio was dropped because the server is overloaded."""
+    try:
+        await user.websocket.send_json({"type": "server_busy", "stage": stage})
+    except Exception:
+        pass
+
+
 async def broadcast_system(room: Room, message: dict):
     """Broadcast a system message to all users in a room."""
     disconnected = []
@@ -476,19 +1407,177 @@ async def broadcast_system(room: Room, message: dict):
 # ---------------------------------------------------------------------------
 # Startup
 # ---------------------------------------------------------------------------
+async def warm_models():
+    """
+    Warm every configured model with a dummy inference, each on its own
+    stage: STT tiers one after another (they share the STT workers), while
+    translation pairs and voices load alongside.
+    """
+    loop = asyncio.get_event_loop()
+
+    async def warm_stt():
+        for tier in STT_MODEL_TIERS:
+            if stt_pool is not None:
+                # Worker initializers warm every tier; one job per worker
+                # completes once they all have.
+                silence = [(np.zeros(SAMPLE_RATE, dtype=np.float32), "en")]
+                warmup = asyncio.gather(*(
+                    asyncio.wrap_future(stt_pool.submit(silence, tier))
+                    for _ in range(STT_PROCESSES)
+                ))
+            else:
+                warmup = loop.run_in_executor(stt_stage, warm_up_stt, tier)
+            await readiness.track(f"stt:{tier}", warmup)
+
+    async def warm_translation(from_lang: str, to_lang: str):
+        async def warmup():
+            # Installs run on the registry's thread, not a translate worker
+            while jobs := prepare_pair(from_lang, to_lang):
+                await asyncio.gather(*(asyncio.wrap_future(job) for job in jobs))
+            await loop.run_in_executor(translate_stage, warm_up_translation, from_lang, to_lang)
+
+        await readiness.track(f"translate:{from_lang}-{to_lang}", warmup(), optional=True)
+
+    async def warm_voice(lang: str):
+        async def warmup():
+            job = prepare_voice(lang)
+            if job is not None:
+                await asyncio.wrap_future(job)
+            await loop.run_in_executor(tts_stage, warm_up_voice, lang)
+
+        await readiness.track(f"tts:{lang}", warmup(), optional=True)
+
+    await asyncio.gather(
+        warm_stt(),
+        *(warm_translation(a, b) for a, b in WARMUP_TRANSLATION_PAIRS),
+        *(warm_voice(lang) for lang in WARMUP_TTS_VOICES),
+    )
+    logger.info("Model warmup finished; ready." if readiness.ready else "Model warmup finished; NOT ready.")
+
+
+def _warm_speech(text: str, lang: str, audio_format: str):
+    """Synthesize a phrase into the speech cache the way ``speak`` would."""
+    if TTS_STREAMING and len(split_sentences(text)) > 1:
+        for _ in synthesize_stream(text, lang, audio_format=audio_format):
+            pass
+    else:
+        synthesize(text, lang, audio_format=audio_format)
+
+
+async def warm_phrases():
+    """
+    Pre-compute the phrase log's most frequent translations and speech.
+
+    Jobs run one at a time and only while their stage has nothing queued,
+    so live traffic always goes first; after each job we idle long enough
+    to keep warming within PHRASE_WARM_CPU_SHARE of one worker, and stop
+    at PHRASE_WARM_SECONDS.
+    """
+    loop = asyncio.get_event_loop()
+    deadline = time.monotonic() + PHRASE_WARM_SECONDS
+    jobs = [
+        (translate_stage, translate_batch, ([text], from_lang, to_lang))
+        for _, from_lang, to_lang, text in phrase_log.top(PHRASE_TRANSLATE, PHRASE_WARM_TOP_N)
+    ] + [
+        (tts_stage, _warm_speech, (text, lang, audio_format))
+        for _, lang, audio_format, text in phrase_log.top(PHRASE_SPEAK, PHRASE_WARM_TOP_N)
+    ]
+
+    warmed = 0
+    for stage, fn, args in jobs:
+        while stage.queue_depth > 0 and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        if time.monotonic() >= deadline:
+            break
+        started = time.monotonic()
+        try:
+            await loop.run_in_executor(stage, fn, *args)
+            warmed += 1
+        except Exception as e:
+            logger.warning(f"Phrase warmup on {stage.name} failed: {e}")
+        elapsed = time.monotonic() - started
+        await asyncio.sleep(elapsed * (1 - PHRASE_WARM_CPU_SHARE) / PHRASE_WARM_CPU_SHARE)
+
+    logger.info(f"Phrase warmup: {warmed} of {len(jobs)} frequent phrases cached.")
+
+
+async def flush_phrase_log():
+    """Persist the phrase log every PHRASE_LOG_FLUSH_SECONDS."""
+    loop = asyncio.get_event_loop()
+    while True:
+        await asyncio.sleep(PHRASE_LOG_FLUSH_SECONDS)
+        await loop.run_in_executor(None, phrase_log.flush)
+
+
 @app.on_event("startup")
 async def startup_event():
+    global stt_pool, tts_pool
     logger.info("=" * 60)
     logger.info("  Zubia — Real-Time Audio Translation Chat")
     logger.info("=" * 60)
     logger.info("Loading AI models... (this may take a minute on first run)")
 
-    # Pre-load the STT model in background
-    async def preload():
-        await asyncio.get_event_loop().run_in_executor(None, get_model)
-        logger.info("STT model loaded.")
-
-    asyncio.create_task(preload())
+    set_translation_registry(model_registry)
+    set_voice_registry(model_registry)
+    set_translation_residency(model_residency)
+    set_voice_residency(model_residency)
+
+    if STT_BACKEND == "process":
+        stt_pool = AudioWorkerPool(
+            "stt",
+            STT_PROCESSES,
+            handler="stt_service:transcribe_batch",
+            initializer="stt_service:init_worker",
+            init_args=(STT_MODEL_TIERS, STT_PROCESS_CPU_THREADS),
+            job_timeout=WORKER_JOB_TIMEOUT,
+        )
+        set_backend(stt_pool)
+        stt_policy.set_workers(STT_PROCESSES)
+        logger.info(f"STT running in {STT_PROCESSES} worker processes.")
+
+    if TTS_BACKEND == "process":
+        tts_pool = AudioWorkerPool(
+            "tts",
+            TTS_PROCESSES,
+            handler="tts_service:worker_synthesize",
+            initializer="tts_service:init_worker",
+            init_args=(TTS_PROCESS_CACHE_BYTES, TTS_PROCESS_VOICE_BUDGET_MB * 1024 * 1024),
+            max_workers=TTS_MAX_PROCESSES,
+            spread_depth=TTS_SPREAD_DEPTH,
+            job_timeout=WORKER_JOB_TIMEOUT,
+        )
+        set_tts_backend(tts_pool)
+        logger.info(f"TTS running in {TTS_PROCESSES}-{TTS_MAX_PROCESSES} worker processes.")
+
+    for tier in STT_MODEL_TIERS:
+        readiness.register(f"stt:{tier}")
+    for from_lang, to_lang in WARMUP_TRANSLATION_PAIRS:
+        readiness.register(f"translate:{from_lang}-{to_lang}")
+    for lang in WARMUP_TTS_VOICES:
+        readiness.register(f"tts:{lang}")
+
+    async def warm():
+        await warm_models()
+        if phrase_log is not None:
+            await warm_phrases()
+
+    # Warm in the background; /health/ready reports progress
+    asyncio.create_task(warm())
+    if phrase_log is not None:
+        asyncio.create_task(flush_phrase_log())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    model_registry.shutdown()
+    if phrase_log is not None:
+        phrase_log.flush()
+    if stt_pool is not None:
+        set_backend(None)
+        stt_pool.shutdown()
+    if tts_pool is not None:
+        set_tts_backend(None)
+        tts_pool.shutdown()
 
 
 if __name__ == "__main__":
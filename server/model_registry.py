@@ -0,0 +1,213 @@
+"""
+Local registry of model assets (Argos packages, Piper voices).
+Assets are resolved from a local directory described by a manifest, with
+checksums. Anything missing is fetched and installed by a single background
+installer thread, so request threads only ever ask "is it ready?" and never
+wait on a download or an index refresh.
+
+Manifest format (JSON)::
+
+    {
+      "translations": [
+        {"from": "en", "to": "es",
+         "files": [{"file": "translate-en_es.argosmodel", "sha256": "...", "url": "..."}]}
+      ],
+      "voices": [
+        {"lang": "en",
+         "files": [{"file": "en_US-lessac-medium.onnx", "sha256": "...", "url": "..."},
+                   {"file": "en_US-lessac-medium.onnx.json", "sha256": "...", "url": "..."}]}
+      ]
+    }
+
+``url`` is optional; without it the file must already be in the directory.
+"""
+
+import json
+import time
+import hashlib
+import logging
+import threading
+import urllib.request
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable
+
+logger = logging.getLogger("voxbridge.models")
+
+PENDING = "pending"
+INSTALLING = "installing"
+READY = "ready"
+FAILED = "failed"
+
+
+class AssetError(Exception):
+    """Raised when an asset is missing, unreachable or fails its checksum."""
+
+
+def sha256sum(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Manifest-backed asset store with a background installer.
+
+    Assets are identified by hashable keys such as ``("translate", "en",
+    "es")`` or ``("voice", "fr")``. ``is_ready`` is a cheap lookup for
+    request paths; ``schedule`` queues an install job (at most one per key
+    at a time) and returns its future. Jobs run one at a time on the
+    installer thread. A key whose install failed is not retried for
+    ``retry_backoff`` seconds, doubling with each further failure up to
+    ``max_retry_backoff``; until then ``schedule`` returns the failed job.
+    """
+
+    def __init__(
+        self,
+        assets_dir: Path,
+        manifest_path: Path | None = None,
+        download_timeout: float = 300,
+        retry_backoff: float = 30,
+        max_retry_backoff: float = 900,
+    ):
+        self.assets_dir = Path(assets_dir)
+        self.download_timeout = download_timeout
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self.manifest = self._load_manifest(manifest_path or self.assets_dir / "manifest.json")
+
+        self._lock = threading.Lock()
+        self._status: dict[Hashable, str] = {}
+        self._errors: dict[Hashable, str] = {}
+        self._jobs: dict[Hashable, Future] = {}
+        self._failures: dict[Hashable, tuple[int, float]] = {}  # key -> (count, retry at)
+        self._installer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-install")
+
+    @staticmethod
+    def _load_manifest(path: Path) -> dict:
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+            logger.info(
+                f"Model manifest {path}: {len(manifest.get('translations', []))} translation "
+                f"packages, {len(manifest.get('voices', []))} voices."
+            )
+            return manifest
+        except FileNotFoundError:
+            logger.info(f"No model manifest at {path}; missing assets come from upstream indexes.")
+            return {}
+
+    # -- manifest lookups ---------------------------------------------------
+
+    def translation_entry(self, from_lang: str, to_lang: str) -> dict | None:
+        return next(
+            (e for e in self.manifest.get("translations", [])
+             if e["from"] == from_lang and e["to"] == to_lang),
+            None,
+        )
+
+    def voice_entry(self, lang: str) -> dict | None:
+        return next((e for e in self.manifest.get("voices", []) if e["lang"] == lang), None)
+
+    def manifest_pairs(self) -> set[tuple[str, str]]:
+        return {(e["from"], e["to"]) for e in self.manifest.get("translations", [])}
+
+    # -- files --------------------------------------------------------------
+
+    def fetch(self, entry: dict) -> list[Path]:
+        """
+        Local paths of an entry's files, downloading any that are missing and
+        verifying checksums. Blocking; only call from installer jobs.
+        """
+        paths = []
+        for spec in entry["files"]:
+            path = self.assets_dir / spec["file"]
+            expected = spec.get("sha256")
+            if path.exists() and (not expected or sha256sum(path) == expected):
+                paths.append(path)
+                continue
+            if not spec.get("url"):
+                raise AssetError(f"{spec['file']} is missing or corrupt and has no url")
+            self._download(spec["url"], path, expected)
+            paths.append(path)
+        return paths
+
+    def _download(self, url: str, path: Path, expected: str | None):
+        logger.info(f"Downloading {path.name}...")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".part")
+        digest = hashlib.sha256()
+        try:
+            with urllib.request.urlopen(url, timeout=self.download_timeout) as resp, open(tmp, "wb") as f:
+                for block in iter(lambda: resp.read(1 << 20), b""):
+                    digest.update(block)
+                    f.write(block)
+            if expected and digest.hexdigest() != expected:
+                raise AssetError(f"Checksum mismatch for {path.name}")
+            tmp.replace(path)
+        except Exception as e:
+            tmp.unlink(missing_ok=True)
+            if isinstance(e, AssetError):
+                raise
+            raise AssetError(f"Download of {path.name} failed: {e}") from e
+        logger.info(f"{path.name} downloaded.")
+
+    # -- readiness and installs ----------------------------------------------
+
+    def is_ready(self, key: Hashable) -> bool:
+        return self._status.get(key) == READY
+
+    def mark_ready(self, key: Hashable):
+        with self._lock:
+            self._status[key] = READY
+            self._errors.pop(key, None)
+            self._failures.pop(key, None)
+
+    def schedule(self, key: Hashable, install: Callable[[], object]) -> Future:
+        """Queue ``install`` for ``key`` unless it is ready or already queued."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not job.done():
+                return job
+            if self._status.get(key) == READY:
+                job = Future()
+                job.set_result(None)
+                return job
+            if key in self._failures and time.monotonic() < self._failures[key][1]:
+                return job  # Failed recently; wait out the backoff
+            self._status[key] = PENDING
+            job = self._installer.submit(self._run, key, install)
+            self._jobs[key] = job
+            return job
+
+    def _run(self, key: Hashable, install: Callable[[], object]):
+        with self._lock:
+            self._status[key] = INSTALLING
+        try:
+            install()
+        except Exception as e:
+            with self._lock:
+                self._status[key] = FAILED
+                self._errors[key] = str(e)
+                count = self._failures.get(key, (0, 0.0))[0] + 1
+                delay = min(self.retry_backoff * 2 ** (count - 1), self.max_retry_backoff)
+                self._failures[key] = (count, time.monotonic() + delay)
+            logger.error(f"Installing {key} failed: {e}; retrying in {delay:.0f}s at the earliest")
+            raise
+        self.mark_ready(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "/".join(key) if isinstance(key, tuple) else str(key): (
+                    {"status": status, "error": self._errors[key]}
+                    if key in self._errors else {"status": status}
+                )
+                for key, status in self._status.items()
+            }
+
+    def shutdown(self):
+        self._installer.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,102 @@
+"""
+Frequency log of translated and spoken phrases.
+Counts how often each (text, from, to) translation and (text, voice,
+format) synthesis is requested, and persists the most frequent ones to a
+small JSON file so a fresh process can pre-compute them before users ask.
+"""
+
+import json
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger("voxbridge.phrases")
+
+TRANSLATE = "translate"
+SPEAK = "speak"
+
+
+class PhraseLog:
+    """
+    Bounded phrase counter backed by ``path``.
+
+    Keys are ``("translate", from_lang, to_lang, text)`` and
+    ``("speak", lang, audio_format, text)``. Only the ``max_entries`` most
+    frequent keys are kept (pruned as the log grows), and texts longer than
+    ``max_chars`` are not recorded: one-off long utterances never repeat.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 2000, max_chars: int = 200):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable phrase log {self.path}: {e}")
+            return
+        self._counts.update({tuple(key): count for key, count in entries})
+        logger.info(f"Phrase log {self.path}: {len(self._counts)} phrases.")
+
+    def _record(self, key: tuple, text: str):
+        if not text or len(text) > self.max_chars:
+            return
+        with self._lock:
+            self._counts[key] += 1
+            self._dirty = True
+            if len(self._counts) > 2 * self.max_entries:
+                self._counts = Counter(dict(self._counts.most_common(self.max_entries)))
+
+    def record_translation(self, text: str, from_lang: str, to_lang: str):
+        self._record((TRANSLATE, from_lang, to_lang, text), text)
+
+    def record_speech(self, text: str, lang: str, audio_format: str):
+        self._record((SPEAK, lang, audio_format, text), text)
+
+    def top(self, kind: str, per_group: int) -> list[tuple]:
+        """
+        The most frequent keys of one kind, at most ``per_group`` for each
+        language pair (translations) or voice and format (speech), most
+        frequent first across all groups.
+        """
+        taken: Counter = Counter()
+        keys = []
+        with self._lock:
+            ranked = self._counts.most_common()
+        for key, _ in ranked:
+            if key[0] != kind:
+                continue
+            group = key[1:3]
+            if taken[group] < per_group:
+                taken[group] += 1
+                keys.append(key)
+        return keys
+
+    def flush(self):
+        """Write the most frequent phrases to disk if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = [[list(key), count] for key, count in self._counts.most_common(self.max_entries)]
+            self._dirty = False
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            tmp.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Could not write phrase log {self.path}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._counts)
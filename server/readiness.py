@@ -0,0 +1,63 @@
+"""
+Model warmup tracking for the readiness probe.
+Each model warmed at start-up is registered here with its status, so
+/health/ready can keep the load balancer away until first-utterance latency
+is normal, and report which model is holding things up.
+"""
+
+import time
+import logging
+from typing import Awaitable
+
+logger = logging.getLogger("voxbridge.readiness")
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelReadiness:
+    """
+    Per-model warmup status.
+
+    The server is ready once every registered model has finished warming.
+    A model tracked with ``optional=True`` (translation pairs, voices) that
+    fails doesn't hold back readiness: it is retried lazily on first use.
+    Any other failure keeps the server unready.
+    """
+
+    def __init__(self):
+        self._models: dict[str, dict] = {}
+
+    def register(self, name: str):
+        self._models[name] = {"status": PENDING, "required": True}
+
+    async def track(self, name: str, warmup: Awaitable, optional: bool = False) -> bool:
+        """Await a model's warmup, recording its status and duration."""
+        entry = self._models.setdefault(name, {"status": PENDING, "required": True})
+        entry["status"] = LOADING
+        entry["required"] = not optional
+        started = time.monotonic()
+        try:
+            await warmup
+        except Exception as e:
+            entry["status"] = FAILED
+            entry["error"] = str(e)
+            logger.error(f"Warmup of {name} failed: {e}")
+            return False
+        finally:
+            entry["loadMs"] = round((time.monotonic() - started) * 1000)
+        entry["status"] = READY
+        logger.info(f"{name} warm ({entry['loadMs']} ms)")
+        return True
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._models) and all(
+            m["status"] == READY or (m["status"] == FAILED and not m["required"])
+            for m in self._models.values()
+        )
+
+    def stats(self) -> dict:
+        return {name: dict(entry) for name, entry in self._models.items()}
@@ -0,0 +1,114 @@
+"""
+Polyphase resampling to Whisper's 16 kHz.
+Filter taps are designed once per (up, down) ratio, and StreamResampler
+carries filter state across consecutive chunks from the same speaker so
+chunk boundaries don't produce edge transients.
+"""
+
+import math
+import functools
+import threading
+import numpy as np
+import scipy.signal
+
+
+def resample_ratio(sample_rate: int, target_rate: int) -> tuple[int, int]:
+    """Reduced (up, down) factors for converting sample_rate to target_rate."""
+    gcd = math.gcd(sample_rate, target_rate)
+    return target_rate // gcd, sample_rate // gcd
+
+
+@functools.lru_cache(maxsize=16)
+def design_filter(up: int, down: int) -> np.ndarray:
+    """
+    Anti-aliasing FIR taps for an up/down ratio.
+
+    Same design as scipy.signal.resample_poly's default (Kaiser window,
+    beta 5, 10 zero crossings per side), so both paths sound identical.
+    The returned array is shared and read-only.
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = scipy.signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+    taps.setflags(write=False)
+    return taps
+
+
+def resample(audio: np.ndarray, sample_rate: int, target_rate: int) -> np.ndarray:
+    """One-shot resample of a complete clip, reusing the cached filter design."""
+    up, down = resample_ratio(sample_rate, target_rate)
+    return scipy.signal.resample_poly(
+        audio, up, down, window=design_filter(up, down)
+    ).astype(np.float32)
+
+
+class StreamResampler:
+    """
+    Resample a continuous stream chunk by chunk.
+
+    Keeps the tail of earlier input so every output sample sees the same
+    filter history it would in a one-shot resample of the whole stream.
+    The filter's lookahead (a few output samples) is held back until the
+    next chunk arrives. The stream reconfigures itself if the input rate
+    changes; call ``reset`` when the input is not contiguous.
+    """
+
+    def __init__(self, target_rate: int):
+        self.target_rate = target_rate
+        self.sample_rate: int | None = None
+        self._lock = threading.Lock()
+
+    def _configure(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.up, self.down = resample_ratio(sample_rate, self.target_rate)
+        if self.up == self.down:
+            return
+        taps = design_filter(self.up, self.down)
+        self._taps = taps * self.up
+        # Group delay of the linear-phase filter, in output samples
+        self._delay = (len(taps) // 2) // self.down
+        self._history = np.zeros(0, dtype=np.float32)
+        self._history_start = 0  # input index of history[0]; multiple of down
+        self._n_in = 0
+        self._n_out = 0
+
+    def reset(self):
+        """Forget filter state (e.g. after a gap in the audio)."""
+        with self._lock:
+            self.sample_rate = None
+
+    def process(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Resample the next chunk of the stream."""
+        with self._lock:
+            if sample_rate != self.sample_rate:
+                self._configure(sample_rate)
+            if self.up == self.down:
+                return audio.astype(np.float32, copy=False)
+
+            up, down, taps = self.up, self.down, self._taps
+            buf = np.concatenate((self._history, audio))
+            start = self._history_start
+            self._n_in += len(audio)
+
+            # Causal outputs m are complete once m * down < n_in * up
+            m_end = (self._n_in * up + down - 1) // down
+            m_start = self._n_out
+            offset = start * up // down
+
+            if m_end > m_start:
+                y = scipy.signal.upfirdn(taps, buf, up, down)
+                out = y[m_start - offset:m_end - offset]
+                self._n_out = m_end
+            else:
+                out = np.zeros(0)
+
+            # Keep just enough input for the next output's filter support,
+            # aligned so upfirdn's output grid stays on the global grid.
+            needed = max(0, -(-(m_end * down - len(taps) + 1) // up))
+            needed -= needed % down
+            self._history = buf[needed - start:]
+            self._history_start = needed
+
+            # Drop the filter delay at the start of the stream
+            skip = max(0, self._delay - m_start)
+            return out[skip:].astype(np.float32)
@@ -0,0 +1,122 @@
+"""
+Memory budget for loaded models.
+Piper voices and CTranslate2 translators register here when they are
+loaded. Models needed by an active room are kept; once the total resident
+size exceeds the budget, the least recently used of the others are
+unloaded (and reloaded on demand if they are needed again).
+"""
+
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Hashable
+
+logger = logging.getLogger("voxbridge.residency")
+
+
+def disk_size(path: Path) -> int:
+    """Bytes of a model file or directory; a stand-in for its resident size."""
+    path = Path(path)
+    try:
+        if path.is_dir():
+            return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _label(key: Hashable) -> str:
+    return "/".join(key) if isinstance(key, tuple) else str(key)
+
+
+class ResidencyManager:
+    """
+    Tracks resident models against ``budget_bytes`` (0 means unlimited).
+
+    ``register(key, size, unload)`` records a freshly loaded model with the
+    callback that drops it; ``touch(key)`` marks it used. ``set_active``
+    replaces the set of keys that active rooms need, which are never
+    unloaded. Budget checks happen on every registration.
+    """
+
+    def __init__(self, budget_bytes: int = 0):
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._models: dict[Hashable, dict] = {}
+        self._active: set[Hashable] = set()
+        self.resident_bytes = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def register(self, key: Hashable, size: int, unload: Callable[[], object]):
+        with self._lock:
+            old = self._models.pop(key, None)
+            if old is not None:
+                self.resident_bytes -= old["bytes"]
+            self._models[key] = {"bytes": size, "unload": unload, "last_used": time.monotonic()}
+            self.resident_bytes += size
+            self.loads += 1
+            victims = self._over_budget(keep=key)
+        self._unload(victims)
+
+    def touch(self, key: Hashable):
+        model = self._models.get(key)
+        if model is not None:
+            model["last_used"] = time.monotonic()
+
+    def set_active(self, keys: set[Hashable]):
+        """Keys needed by active rooms; idle models become eligible for eviction."""
+        with self._lock:
+            self._active = set(keys)
+            victims = self._over_budget()
+        self._unload(victims)
+
+    def _over_budget(self, keep: Hashable | None = None) -> list[tuple[Hashable, dict]]:
+        """Pick idle models to drop, least recently used first. Holds the lock."""
+        if not self.budget_bytes or self.resident_bytes <= self.budget_bytes:
+            return []
+        victims = []
+        idle = sorted(
+            (k for k in self._models if k not in self._active and k != keep),
+            key=lambda k: self._models[k]["last_used"],
+        )
+        for key in idle:
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            model = self._models.pop(key)
+            self.resident_bytes -= model["bytes"]
+            self.evictions += 1
+            victims.append((key, model))
+        if self.resident_bytes > self.budget_bytes:
+            logger.warning(
+                f"Models in use need {self.resident_bytes} bytes, over the "
+                f"{self.budget_bytes}-byte budget."
+            )
+        return victims
+
+    def _unload(self, victims: list[tuple[Hashable, dict]]):
+        for key, model in victims:
+            logger.info(f"Unloading idle model {_label(key)} ({model['bytes']} bytes).")
+            try:
+                model["unload"]()
+            except Exception as e:
+                logger.error(f"Unloading {_label(key)} failed: {e}")
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "budgetBytes": self.budget_bytes,
+                "residentBytes": self.resident_bytes,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "models": {
+                    _label(key): {
+                        "bytes": model["bytes"],
+                        "active": key in self._active,
+                        "idleSeconds": round(now - model["last_used"], 1),
+                    }
+                    for key, model in self._models.items()
+                },
+            }
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field, field_validator
 import html
 
@@ -11,6 +13,9 @@ def _sanitize_language(v: str) -> str:
 
 class RoomCreate(BaseModel):
     name: str | None = Field(default=None, max_length=50)
+    # Forward the speaker's audio to same-language listeners instead of
+    # synthesizing it; None uses the server default
+    passthrough: bool | None = None
 
     @field_validator('name')
     @classmethod
@@ -43,6 +48,19 @@ class UserRegister(BaseModel):
 
 class UserJoin(BaseModel):
     userId: str = Field(..., max_length=20)
+    # Stream small raw PCM16 frames instead of self-contained WAV chunks
+    streaming: bool = False
+    # Binary chunk format: WAV, or raw 16 kHz mono PCM16 (skips parsing and resampling)
+    audioFormat: Literal["wav", "pcm16"] = "wav"
+    # Speech formats the client can play, most preferred first (see
+    # audio_codec.OUTPUT_FORMATS); unknown names are ignored
+    outputFormats: list[str] = Field(default_factory=lambda: ["wav"], max_length=8)
+    # "audio": synthesized speech for every message; "text" / "on_demand":
+    # translated text only, with audio sent on request_audio
+    delivery: Literal["audio", "text", "on_demand"] = "audio"
+    # The client keeps received clips by audioHash, and already holds these
+    audioCache: bool = False
+    cachedAudio: list[str] = Field(default_factory=list, max_length=512)
 
 
 class ThreadCreate(BaseModel):
@@ -0,0 +1,74 @@
+"""
+Single-flight execution for blocking calls.
+When several threads make the same call at once (the same model load, the
+same synthesis request), only the first runs it; the others wait for and
+share its result. Used by the STT, translation and TTS services.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger("voxbridge.singleflight")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "owner")
+
+    def __init__(self):
+        self.owner = threading.get_ident()
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    De-duplicate concurrent calls by key.
+
+    ``do(key, fn, *args)`` runs ``fn(*args)`` unless a call with the same
+    key is already in flight, in which case it blocks until that call
+    finishes and returns its result (or raises its exception). Nothing is
+    remembered once a call completes; pair it with a cache for that.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            if call.owner == threading.get_ident():
+                # Waiting on ourselves would never return
+                raise RuntimeError(f"Re-entrant {self.name} call for {key!r}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"executed": self.executed, "shared": self.shared, "inFlight": len(self._calls)}
@@ -0,0 +1,194 @@
+"""
+Streaming speech-to-text sessions.
+Keeps a per-speaker rolling buffer of raw PCM16 frames and re-decodes it as
+audio arrives, emitting partial hypotheses until the utterance is finalized.
+"""
+
+import logging
+import threading
+import numpy as np
+
+from stt_service import SAMPLE_RATE, SILENCE_RMS, pcm16_to_float32, transcribe_audio
+
+logger = logging.getLogger("voxbridge.stream")
+
+
+def _common_prefix(a: list[str], b: list[str]) -> list[str]:
+    """Return the longest shared word prefix of two hypotheses."""
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return a[:n]
+
+
+class StreamingTranscriber:
+    """
+    Rolling-buffer transcriber for a single speaker.
+
+    Frames are raw 16 kHz mono PCM16. ``feed`` is called from the event loop
+    for every binary frame. A decode pass is ``snapshot`` -> STT ->
+    ``hypothesis``, split so the STT step can be batched with other speakers;
+    ``decode`` runs all three in one blocking call.
+
+    A hypothesis is considered stable once two consecutive decode passes
+    agree on it (local agreement); the utterance is finalized on trailing
+    silence, when the buffer hits its maximum length, or on request.
+
+    With a ``vad`` (the speaker's VoiceActivityGate) speech and silence are
+    told apart against its adaptive noise floor, and an utterance needs its
+    minimum amount of speech before anything is decoded; without one a
+    fixed ``silence_rms`` threshold is used.
+    """
+
+    def __init__(
+        self,
+        source_lang: str | None,
+        partial_interval: float = 1.0,
+        endpoint_silence: float = 0.6,
+        max_utterance: float = 15.0,
+        silence_rms: float = SILENCE_RMS,
+        vad=None,
+    ):
+        self.source_lang = source_lang
+        self.partial_samples = int(partial_interval * SAMPLE_RATE)
+        self.endpoint_samples = int(endpoint_silence * SAMPLE_RATE)
+        self.max_samples = int(max_utterance * SAMPLE_RATE)
+        self.silence_rms = silence_rms
+        self.vad = vad
+
+        self._lock = threading.Lock()
+        self._chunks: list[np.ndarray] = []
+        self._buffered = 0
+        self._since_decode = 0
+        self._trailing_silence = 0
+        self._heard_speech = False
+        self._speech_frames = 0
+        self._flush_requested = False
+        self._previous_words: list[str] = []
+
+    @property
+    def decode_due(self) -> bool:
+        """Whether enough new audio (or an endpoint) warrants a decode pass."""
+        if self._flush_requested:
+            return True
+        if not self._heard_speech:
+            return False
+        return (
+            self._since_decode >= self.partial_samples
+            or self._trailing_silence >= self.endpoint_samples
+            or self._buffered >= self.max_samples
+        )
+
+    def feed(self, pcm: bytes) -> bool:
+        """Append a PCM16 frame. Returns True when a decode pass is due."""
+        audio, rms = pcm16_to_float32(pcm)
+        if len(audio) == 0:
+            return self.decode_due
+
+        with self._lock:
+            self._chunks.append(audio)
+            self._buffered += len(audio)
+            self._since_decode += len(audio)
+
+            if self.vad is not None:
+                speech = self.vad.stream_speech(audio)
+                self._speech_frames += speech
+                is_speech = speech > 0
+                heard = self._speech_frames >= self.vad.min_speech_frames
+            else:
+                is_speech = heard = rms >= self.silence_rms
+
+            if is_speech:
+                self._trailing_silence = 0
+                self._heard_speech = self._heard_speech or heard
+            else:
+                self._trailing_silence += len(audio)
+
+            # Before any speech, only keep a short pre-roll so idle
+            # microphones don't grow the buffer.
+            if not self._heard_speech and self._buffered > self.endpoint_samples:
+                pre_roll = np.concatenate(self._chunks)[-self.endpoint_samples:]
+                self._chunks = [pre_roll]
+                self._buffered = len(pre_roll)
+                self._since_decode = 0
+                if self._trailing_silence >= self.endpoint_samples:
+                    self._speech_frames = 0  # Isolated blips don't add up
+
+        return self.decode_due
+
+    def request_flush(self):
+        """Finalize whatever is buffered on the next decode pass."""
+        self._flush_requested = True
+
+    def _reset(self):
+        self._chunks = []
+        self._buffered = 0
+        self._since_decode = 0
+        self._trailing_silence = 0
+        self._heard_speech = False
+        self._speech_frames = 0
+        self._flush_requested = False
+
+    def snapshot(self) -> tuple[np.ndarray, bool] | None:
+        """
+        Take the audio for the next decode pass.
+
+        Returns ``(audio, final)``, or None when there is no speech to decode.
+        A final snapshot resets the buffer so new frames start the next
+        utterance while this one is being decoded.
+        """
+        with self._lock:
+            heard_speech = self._heard_speech
+            final = (
+                self._flush_requested
+                or self._trailing_silence >= self.endpoint_samples
+                or self._buffered >= self.max_samples
+            )
+            audio = np.concatenate(self._chunks) if self._chunks else None
+
+            if final:
+                self._reset()
+            else:
+                self._since_decode = 0
+                if audio is not None:
+                    self._chunks = [audio]
+
+        if audio is None or not heard_speech:
+            return None
+        return audio, final
+
+    def hypothesis(self, result: dict, final: bool) -> dict | None:
+        """Turn an STT result for a snapshot into the message to push."""
+        text = result["text"]
+        words = text.split()
+
+        if final:
+            self._previous_words = []
+            if not text:
+                return None
+            return {
+                "type": "final_transcription",
+                "text": text,
+                "language": result["language"],
+                "confidence": result["confidence"],
+                "model": result.get("model"),
+            }
+
+        stable = _common_prefix(self._previous_words, words)
+        self._previous_words = words
+        return {
+            "type": "partial_transcription",
+            "text": text,
+            "stableText": " ".join(stable),
+            "language": result["language"],
+        }
+
+    def decode(self) -> dict | None:
+        """Run one decode pass over the buffer (blocking; call in an executor)."""
+        snap = self.snapshot()
+        if snap is None:
+            return None
+        audio, final = snap
+        return self.hypothesis(transcribe_audio(audio, self.source_lang), final)
@@ -0,0 +1,94 @@
+"""
+Load-adaptive selection of the Whisper model tier.
+Estimates how long a new chunk would take on each tier given the current
+STT backlog, and picks the most accurate tier that still fits the latency
+SLO. Under peak load accuracy degrades a little instead of latency growing
+without bound.
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger("voxbridge.stt_policy")
+
+
+class TierPolicy:
+    """
+    Choose a model tier per chunk from the STT backlog and observed latency.
+
+    ``tiers`` is ordered fastest first (e.g. tiny, base, small). Each tier's
+    per-chunk service time is tracked as an exponentially weighted average,
+    seeded from ``initial_estimates`` until real timings come in. A chunk
+    submitted behind ``pending`` others (chunks, not batches: those waiting
+    to be batched as well as those being decoded) is expected to finish
+    after roughly ``(pending + 1) / workers`` service times, where
+    ``workers`` is the number of decoders of the active backend. The most
+    accurate tier whose estimate is within ``slo`` seconds wins, falling
+    back to the fastest tier when none fits.
+    """
+
+    def __init__(
+        self,
+        tiers: list[str],
+        slo: float,
+        workers: int = 1,
+        initial_estimates: dict[str, float] | None = None,
+        smoothing: float = 0.2,
+    ):
+        if not tiers:
+            raise ValueError("At least one model tier is required")
+        self.tiers = list(tiers)
+        self.slo = slo
+        self.workers = max(1, workers)
+        self.smoothing = smoothing
+
+        estimates = initial_estimates or {}
+        self._service_time = {tier: estimates.get(tier, 0.0) for tier in self.tiers}
+        self._lock = threading.Lock()
+        self.selected = {tier: 0 for tier in self.tiers}
+
+    def estimate(self, tier: str, pending: int) -> float:
+        """Expected seconds until a chunk submitted now finishes on ``tier``."""
+        waves = (pending + 1) / self.workers
+        return waves * self._service_time[tier]
+
+    def set_workers(self, workers: int):
+        """Number of chunks decoded in parallel (changes with the STT backend)."""
+        self.workers = max(1, workers)
+
+    def choose(self, pending: int) -> str:
+        """Pick the tier for the next chunk."""
+        chosen = self.tiers[0]
+        for tier in reversed(self.tiers):
+            if self.estimate(tier, pending) <= self.slo:
+                chosen = tier
+                break
+        with self._lock:
+            self.selected[chosen] += 1
+        return chosen
+
+    def record(self, tier: str, seconds: float, items: int = 1):
+        """Feed back the measured duration of a batch of ``items`` chunks."""
+        if tier not in self._service_time or items <= 0:
+            return
+        per_item = seconds / items
+        with self._lock:
+            current = self._service_time[tier]
+            if current == 0.0:
+                self._service_time[tier] = per_item
+            else:
+                self._service_time[tier] = current + self.smoothing * (per_item - current)
+
+    def stats(self) -> dict:
+        """Current service-time estimates and how often each tier was picked."""
+        with self._lock:
+            return {
+                "sloMs": round(self.slo * 1000),
+                "tiers": {
+                    tier: {
+                        "serviceMs": round(self._service_time[tier] * 1000, 1),
+                        "selected": self.selected[tier],
+                    }
+                    for tier in self.tiers
+                },
+            }
@@ -7,29 +7,99 @@ import io
 import wave
 import math
 import logging
+from typing import Iterator
 import numpy as np
-import scipy.signal
-from faster_whisper import WhisperModel
+
+from lazy_import import LazyModule
+from resampler import StreamResampler, resample
+from singleflight import SingleFlight
 
 logger = logging.getLogger("voxbridge.stt")
 
-# Singleton model instance
-_model: WhisperModel | None = None
+# Imported on first model load, not at server start-up
+faster_whisper = LazyModule("faster_whisper")
+
+
+def WhisperModel(*args, **kwargs):
+    """Construct a faster_whisper.WhisperModel, importing the library on first use."""
+    return faster_whisper.WhisperModel(*args, **kwargs)
+
+# Whisper operates on 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Chunks shorter than this or quieter than this RMS are not worth decoding
+MIN_DURATION = 0.3
+SILENCE_RMS = 0.005
+
+# Model tiers, fastest first, with the decode settings used for each.
+# Under load the server trades a little accuracy for bounded latency.
+MODEL_TIERS = {
+    "tiny": {"beam_size": 1, "best_of": 1},
+    "base": {"beam_size": 2, "best_of": 1},
+    "small": {"beam_size": 3, "best_of": 2},
+}
+DEFAULT_TIER = "small"
+CPU_THREADS = 4
+
+# Loaded model per tier
+_models: dict[str, object] = {}
+_loads = SingleFlight("whisper-load")
+
+# Out-of-process backend (an AudioWorkerPool running transcribe_batch);
+# None means models run in this process.
+_backend = None
+
 
+def set_backend(pool) -> None:
+    """Route transcription through a worker pool (None to decode in-process)."""
+    global _backend
+    _backend = pool
 
-def get_model() -> WhisperModel:
-    """Lazy-load the Whisper model (small, int8 quantized for CPU speed)."""
-    global _model
-    if _model is None:
-        logger.info("Loading faster-whisper 'small' model (int8, CPU)...")
-        _model = WhisperModel(
-            "small",
+
+def init_worker(tiers: list[str], cpu_threads: int = CPU_THREADS) -> None:
+    """Worker-process initializer: set the thread budget and warm every tier."""
+    global CPU_THREADS
+    CPU_THREADS = cpu_threads
+    for tier in tiers:
+        warm_up(tier)
+
+
+def get_model(tier: str = DEFAULT_TIER):
+    """Lazy-load the Whisper model for a tier (int8 quantized for CPU speed)."""
+    model = _models.get(tier)
+    if model is None:
+        # Concurrent first requests share one load
+        model = _loads.do(tier, _load_model, tier)
+    return model
+
+
+def _load_model(tier: str):
+    model = _models.get(tier)
+    if model is None:
+        logger.info(f"Loading faster-whisper '{tier}' model (int8, CPU)...")
+        model = WhisperModel(
+            tier,
             device="cpu",
             compute_type="int8",
-            cpu_threads=4,
+            cpu_threads=CPU_THREADS,
         )
-        logger.info("Whisper model loaded successfully.")
-    return _model
+        _models[tier] = model
+        logger.info(f"Whisper '{tier}' model loaded successfully.")
+    return model
+
+
+def warm_up(tier: str = DEFAULT_TIER) -> None:
+    """
+    Load a tier and run one throwaway decode, so the first real chunk doesn't
+    pay for lazy initialization inside CTranslate2. Raises on failure.
+    """
+    model = get_model(tier)
+    segments, _ = model.transcribe(
+        np.zeros(SAMPLE_RATE, dtype=np.float32),
+        language="en",
+        beam_size=MODEL_TIERS[tier]["beam_size"],
+    )
+    list(segments)  # segments are decoded lazily
 
 
 def wav_bytes_to_float32(wav_bytes: bytes) -> tuple[np.ndarray, int]:
@@ -57,6 +127,27 @@ def wav_bytes_to_float32(wav_bytes: bytes) -> tuple[np.ndarray, int]:
     return audio, sample_rate
 
 
+def _empty_result(source_lang: str | None, tier: str = DEFAULT_TIER) -> dict:
+    return {"text": "", "language": source_lang or "en", "confidence": 0.0, "model": tier}
+
+
+def pcm16_to_float32(pcm: bytes) -> tuple[np.ndarray, float]:
+    """
+    Convert raw little-endian PCM16 bytes to float32 audio and its RMS.
+
+    The bytes are viewed in place with ``np.frombuffer``; conversion writes
+    the only new array and the RMS is a BLAS dot product over it, so no
+    temporaries are allocated.
+    """
+    n = len(pcm) // 2
+    if n == 0:
+        return np.zeros(0, dtype=np.float32), 0.0
+    samples = np.frombuffer(pcm, dtype="<i2", count=n)
+    audio = np.multiply(samples, 1.0 / 32768.0, dtype=np.float32)
+    rms = math.sqrt(float(np.dot(audio, audio)) / n)
+    return audio, rms
+
+
 def transcribe(wav_bytes: bytes, source_lang: str | None = None) -> dict:
     """
     Transcribe WAV audio bytes to text.
@@ -72,41 +163,90 @@ def transcribe(wav_bytes: bytes, source_lang: str | None = None) -> dict:
             - language: detected/specified language code
             - confidence: language detection probability
     """
-    model = get_model()
-    audio, sample_rate = wav_bytes_to_float32(wav_bytes)
+    audio = load_audio(wav_bytes)
+    if audio is None:
+        return _empty_result(source_lang)
+
+    return transcribe_audio(audio, source_lang)
+
+
+def load_audio(
+    audio_bytes: bytes,
+    audio_format: str = "wav",
+    resampler: StreamResampler | None = None,
+) -> np.ndarray | None:
+    """
+    Decode a chunk into 16 kHz mono float32 audio ready for Whisper.
+
+    ``audio_format`` is "wav" (any rate/width, resampled as needed) or
+    "pcm16" (raw 16 kHz mono PCM16, converted without parsing or resampling).
+    Pass the speaker's ``resampler`` to carry filter state across their
+    consecutive chunks. Returns None for audio that is too short or silent
+    to be worth decoding.
+    """
+    if audio_format == "pcm16":
+        if len(audio_bytes) // 2 < SAMPLE_RATE * MIN_DURATION:
+            return None
+        audio, rms = pcm16_to_float32(audio_bytes)
+        return audio if rms >= SILENCE_RMS else None
+
+    audio, sample_rate = wav_bytes_to_float32(audio_bytes)
 
     # Skip very short or silent audio
-    if len(audio) < sample_rate * 0.3:  # Less than 0.3 seconds
-        return {"text": "", "language": source_lang or "en", "confidence": 0.0}
+    if len(audio) < sample_rate * MIN_DURATION:
+        if resampler is not None:
+            resampler.reset()
+        return None
 
     # Check for silence (RMS below threshold)
     rms = np.sqrt(np.mean(audio ** 2))
-    if rms < 0.005:
-        return {"text": "", "language": source_lang or "en", "confidence": 0.0}
+    if rms < SILENCE_RMS:
+        if resampler is not None:
+            resampler.reset()  # the stream is no longer contiguous
+        return None
 
     # Resample to 16kHz if needed (Whisper expects 16kHz)
-    if sample_rate != 16000:
-        target_sr = 16000
-        # Calculate up/down factors
-        gcd = math.gcd(sample_rate, target_sr)
-        up = target_sr // gcd
-        down = sample_rate // gcd
+    if sample_rate != SAMPLE_RATE:
+        if resampler is not None:
+            audio = resampler.process(audio, sample_rate)
+        else:
+            # Polyphase filtering with the cached filter design
+            audio = resample(audio, sample_rate, SAMPLE_RATE)
+
+    return audio
+
 
-        # Use polyphase filtering for better quality and performance on large inputs
-        audio = scipy.signal.resample_poly(audio, up, down).astype(np.float32)
+def _decode_options(source_lang: str | None, tier: str) -> dict:
+    settings = MODEL_TIERS[tier]
+    return dict(
+        language=source_lang,
+        beam_size=settings["beam_size"],
+        best_of=settings["best_of"],
+        vad_filter=True,
+        vad_parameters=dict(
+            min_silence_duration_ms=300,
+            speech_pad_ms=200,
+        ),
+    )
+
+
+def transcribe_audio(
+    audio: np.ndarray, source_lang: str | None = None, tier: str = DEFAULT_TIER
+) -> dict:
+    """
+    Transcribe 16 kHz mono float32 audio that has already been decoded.
+
+    Shared by the WAV path above and the streaming ingest path, which keeps
+    its own rolling buffer and does its own silence gating. The result's
+    ``model`` key names the tier that produced it.
+    """
+    if _backend is not None:
+        return _backend.run([(audio, source_lang)], tier)[0]
+
+    model = get_model(tier)
 
     try:
-        segments, info = model.transcribe(
-            audio,
-            language=source_lang,
-            beam_size=3,
-            best_of=2,
-            vad_filter=True,
-            vad_parameters=dict(
-                min_silence_duration_ms=300,
-                speech_pad_ms=200,
-            ),
-        )
+        segments, info = model.transcribe(audio, **_decode_options(source_lang, tier))
 
         text = " ".join(seg.text.strip() for seg in segments).strip()
 
@@ -114,7 +254,154 @@ def transcribe(wav_bytes: bytes, source_lang: str | None = None) -> dict:
             "text": text,
             "language": info.language,
             "confidence": info.language_probability,
+            "model": tier,
         }
     except Exception as e:
         logger.error(f"Transcription failed: {e}")
-        return {"text": "", "language": source_lang or "en", "confidence": 0.0}
+        return _empty_result(source_lang, tier)
+
+
+def transcribe_segments(
+    audio: np.ndarray, source_lang: str | None = None, tier: str = DEFAULT_TIER
+) -> Iterator[dict]:
+    """
+    Yield each Whisper segment as soon as it is decoded.
+
+    faster-whisper decodes segments lazily, so on long recordings the first
+    segment is available well before the last; callers can start
+    translating it straight away. Each item looks like a ``transcribe_audio``
+    result plus the segment's ``start``/``end`` in seconds. Empty segments
+    are skipped. Decode errors propagate to the caller.
+
+    With a worker pool backend the transcript arrives in one piece and is
+    yielded as a single segment.
+    """
+    if _backend is not None:
+        result = transcribe_audio(audio, source_lang, tier)
+        if result["text"]:
+            yield {**result, "start": 0.0, "end": len(audio) / SAMPLE_RATE}
+        return
+
+    model = get_model(tier)
+    segments, info = model.transcribe(audio, **_decode_options(source_lang, tier))
+    for segment in segments:
+        text = segment.text.strip()
+        if text:
+            yield {
+                "text": text,
+                "language": info.language,
+                "confidence": info.language_probability,
+                "model": tier,
+                "start": segment.start,
+                "end": segment.end,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Batched inference
+# ---------------------------------------------------------------------------
+# Whisper's encoder works on fixed 30 s windows, so chunks up to that length
+# from different speakers can share one encoder/decoder pass.
+BATCH_MAX_SAMPLES = 30 * SAMPLE_RATE
+NO_SPEECH_THRESHOLD = 0.6
+
+_tokenizers: dict[tuple[str, str | None], object] = {}
+
+
+def _get_tokenizer(model, tier: str, language: str | None):
+    tokenizer = _tokenizers.get((tier, language))
+    if tokenizer is None:
+        from faster_whisper.tokenizer import Tokenizer
+        tokenizer = Tokenizer(
+            model.hf_tokenizer,
+            model.model.is_multilingual,
+            task="transcribe",
+            language=language,
+        )
+        _tokenizers[(tier, language)] = tokenizer
+    return tokenizer
+
+
+def _batch_features(model, audio: np.ndarray) -> np.ndarray:
+    """Log-mel features zero-padded to one full 30 s encoder window."""
+    features = model.feature_extractor(audio)
+    n_frames = model.feature_extractor.nb_max_frames
+    if features.shape[-1] < n_frames:
+        features = np.pad(features, ((0, 0), (0, n_frames - features.shape[-1])))
+    return features[:, :n_frames]
+
+
+def transcribe_batch(
+    batch: list[tuple[np.ndarray, str | None]], tier: str = DEFAULT_TIER
+) -> list[dict]:
+    """
+    Transcribe several independent chunks with one batched Whisper pass.
+
+    Each item is ``(audio, source_lang)`` with 16 kHz float32 audio, and the
+    result list matches ``transcribe_audio`` item for item. Single items and
+    chunks longer than one encoder window go through ``transcribe_audio``.
+    With a worker pool backend the whole batch runs in one worker process.
+    """
+    if _backend is not None:
+        return _backend.run(batch, tier)
+
+    results: list[dict | None] = [None] * len(batch)
+    batchable = []
+    for i, (audio, source_lang) in enumerate(batch):
+        if len(audio) > BATCH_MAX_SAMPLES:
+            results[i] = transcribe_audio(audio, source_lang, tier)
+        else:
+            batchable.append(i)
+
+    if len(batchable) == 1:
+        i = batchable[0]
+        results[i] = transcribe_audio(*batch[i], tier)
+        batchable = []
+
+    if batchable:
+        model = get_model(tier)
+        try:
+            features = np.stack([_batch_features(model, batch[i][0]) for i in batchable])
+            encoder_output = model.encode(features)
+
+            languages = [batch[i][1] for i in batchable]
+            confidences = [1.0] * len(batchable)
+            if any(lang is None for lang in languages):
+                detected = model.model.detect_language(encoder_output)
+                for j, lang in enumerate(languages):
+                    if lang is None:
+                        token, prob = detected[j][0]
+                        languages[j] = token[2:-2]
+                        confidences[j] = prob
+
+            tokenizers = [_get_tokenizer(model, tier, lang) for lang in languages]
+            prompts = [
+                list(tok.sot_sequence) + [tok.no_timestamps] for tok in tokenizers
+            ]
+            outputs = model.model.generate(
+                encoder_output,
+                prompts,
+                beam_size=MODEL_TIERS[tier]["beam_size"],
+                max_length=model.max_length,
+                return_no_speech_prob=True,
+            )
+
+            for j, i in enumerate(batchable):
+                output, tok = outputs[j], tokenizers[j]
+                if output.no_speech_prob > NO_SPEECH_THRESHOLD:
+                    text = ""
+                else:
+                    tokens = [t for t in output.sequences_ids[0] if t < tok.eot]
+                    text = tok.decode(tokens).strip()
+                results[i] = {
+                    "text": text,
+                    "language": languages[j],
+                    "confidence": confidences[j],
+                    "model": tier,
+                }
+        except Exception as e:
+            logger.error(f"Batched transcription failed, decoding individually: {e}")
+            for i in batchable:
+                results[i] = transcribe_audio(*batch[i], tier)
+
+    return results
@@ -12,6 +12,7 @@ mock_modules = [
     "stt_service",
     "translate_service",
     "tts_service",
+    "streaming_stt",
 
 ]
 
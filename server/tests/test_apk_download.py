@@ -13,6 +13,7 @@ mock_modules = [
     "stt_service",
     "translate_service",
     "tts_service",
+    "streaming_stt",
 
 ]
 
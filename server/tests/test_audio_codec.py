@@ -0,0 +1,67 @@
+import io
+import sys
+import wave
+import struct
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from audio_codec import encode, negotiate, trim_silence, ulaw_encode
+
+
+def _wav(samples: np.ndarray, rate: int) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(samples.astype("<i2").tobytes())
+    return buf.getvalue()
+
+
+def _speech(rate: int = 22050) -> np.ndarray:
+    """0.5 s of silence, 1 s of tone, 0.5 s of silence."""
+    t = np.arange(rate) / rate
+    tone = (8000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+    gap = np.zeros(rate // 2, dtype=np.int16)
+    return np.concatenate([gap, tone, gap])
+
+
+def test_negotiate_picks_first_supported_format():
+    assert negotiate(["opus", "ulaw8k", "wav16k"]) == "ulaw8k"
+    assert negotiate(["opus"]) == "wav"
+    assert negotiate([]) == "wav"
+
+
+def test_ulaw_reference_values():
+    """G.711 code points for silence and both ends of the range."""
+    assert ulaw_encode(np.array([0, 32767, -32768], dtype=np.int16)) == bytes([0xFF, 0x80, 0x00])
+
+
+def test_trim_silence_keeps_the_speech_plus_padding():
+    audio = _speech().astype(np.float32) / 32768.0
+    trimmed = trim_silence(audio, 22050)
+    assert 22050 < len(trimmed) < 22050 * 1.1
+    assert len(trim_silence(np.zeros(100, dtype=np.float32), 22050)) == 100
+
+
+def test_ulaw8k_is_a_compact_playable_wav():
+    original = _wav(_speech(), 22050)
+    assert encode(original, "wav") is original
+
+    encoded = encode(original, "ulaw8k")
+    assert encoded[:4] == b"RIFF" and encoded[8:12] == b"WAVE"
+    fmt_tag, channels, rate = struct.unpack("<HHI", encoded[20:28])
+    assert (fmt_tag, channels, rate) == (7, 1, 8000)  # WAVE_FORMAT_MULAW
+    # Trimmed to ~1 s at one byte per sample, versus 2 s at two bytes
+    assert len(encoded) < len(original) / 8
+
+
+def test_wav16k_resamples_to_pcm16():
+    encoded = encode(_wav(_speech(), 22050), "wav16k")
+    with wave.open(io.BytesIO(encoded), "rb") as wf:
+        assert wf.getframerate() == 16000
+        assert wf.getsampwidth() == 2
+        assert 16000 <= wf.getnframes() < 16000 * 1.1
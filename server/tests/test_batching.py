@@ -0,0 +1,62 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from batching import MicroBatcher
+
+
+def test_concurrent_submissions_share_a_batch():
+    calls = []
+
+    def batch_fn(key, items):
+        calls.append((key, list(items)))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher("test", batch_fn, max_batch=10, max_wait=0.01)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(4))), batcher
+
+    results, batcher = asyncio.run(run())
+
+    assert results == [0, 2, 4, 6]
+    assert calls == [(None, [0, 1, 2, 3])]
+    assert batcher.average_batch_size == 4
+
+
+def test_full_batch_flushes_and_keys_are_kept_apart():
+    calls = []
+
+    def batch_fn(key, items):
+        calls.append((key, list(items)))
+        return [f"{key}:{item}" for item in items]
+
+    async def run():
+        batcher = MicroBatcher("test", batch_fn, max_batch=2, max_wait=10)
+        return await asyncio.gather(
+            batcher.submit(1, key="a"),
+            batcher.submit(2, key="b"),
+            batcher.submit(3, key="a"),
+            batcher.submit(4, key="b"),
+        )
+
+    results = asyncio.run(run())
+
+    assert results == ["a:1", "b:2", "a:3", "b:4"]
+    assert sorted(calls) == [("a", [1, 3]), ("b", [2, 4])]
+
+
+def test_batch_failure_reaches_every_caller():
+    def batch_fn(key, items):
+        raise RuntimeError("model crashed")
+
+    async def run():
+        batcher = MicroBatcher("test", batch_fn, max_batch=2, max_wait=0.01)
+        return await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
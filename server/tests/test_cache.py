@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from cache import ByteLRUCache
+
+
+def test_evicts_least_recently_used_past_byte_budget():
+    cache = ByteLRUCache(max_bytes=10)
+    cache.put("a", b"xxxx")
+    cache.put("b", b"xxxx")
+    assert cache.get("a") == b"xxxx"  # "b" is now least recently used
+
+    cache.put("c", b"xxxx")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"xxxx"
+    assert cache.bytes == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_misses():
+    cache = ByteLRUCache(max_bytes=100, ttl=60)
+    with patch("cache.time.monotonic", return_value=1000.0):
+        cache.put("a", b"x")
+    with patch("cache.time.monotonic", return_value=1030.0):
+        assert cache.get("a") == b"x"
+    with patch("cache.time.monotonic", return_value=1061.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,51 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+
+from executors import StageExecutor, StageOverloaded
+
+
+def test_rejects_work_beyond_capacity():
+    stage = StageExecutor("test", workers=1, max_queue=1)
+    release = threading.Event()
+
+    try:
+        running = stage.submit(release.wait)
+        queued = stage.submit(lambda: "done")
+
+        assert stage.saturated
+        with pytest.raises(StageOverloaded) as exc_info:
+            stage.submit(lambda: None)
+        assert exc_info.value.stage == "test"
+
+        release.set()
+        assert running.result(timeout=1) is True
+        assert queued.result(timeout=1) == "done"
+    finally:
+        release.set()
+        stage.shutdown()
+
+    stats = stage.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["queueDepth"] == 0
+    assert not stage.saturated
+
+
+def test_usable_with_run_in_executor():
+    stage = StageExecutor("test", workers=2, max_queue=0)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(stage, lambda x: x + 1, 41)
+
+    try:
+        assert asyncio.run(run()) == 42
+    finally:
+        stage.shutdown()
+    assert stage.stats()["submitted"] == 1
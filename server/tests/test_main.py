@@ -3,6 +3,8 @@ from unittest.mock import MagicMock, patch
 import os
 from pathlib import Path
 import asyncio
+import time
+import numpy as np
 
 # Mock modules to avoid ImportError due to missing heavy dependencies
 mock_modules = [
@@ -14,6 +16,7 @@ mock_modules = [
     "stt_service",
     "translate_service",
     "tts_service",
+    "streaming_stt",
 
 ]
 
@@ -29,6 +32,20 @@ import pytest
 
 client = TestClient(main.app)
 
+
+class FakeSocket:
+    """Listener's WebSocket that records every frame sent to it."""
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_json(self, data):
+        self.frames.append(data)
+
+    async def send_bytes(self, data):
+        self.frames.append(data)
+
+
 def test_websocket_join_timeout():
     """Test WebSocket disconnects with code 4000 when join message times out."""
     # We patch asyncio.wait_for in the main module
@@ -53,3 +70,358 @@ def test_websocket_join_invalid_data():
 
     assert exc_info.value.code == 4002
     assert exc_info.value.reason == "Invalid join data"
+
+def test_metrics_reports_every_stage():
+    """The metrics endpoint exposes queue depth and wait time per stage."""
+    # translate_service and tts_service are mocked in this module; give
+    # them real stats
+    with patch.object(main, "translation_cache_stats", return_value={}), \
+            patch.object(main, "tts_cache_stats", return_value={}):
+        response = client.get("/api/metrics")
+    assert response.status_code == 200
+
+    stages = response.json()["stages"]
+    assert set(stages) == {"stt", "translate", "tts"}
+    for stats in stages.values():
+        assert "queueDepth" in stats
+        assert "avgWaitMs" in stats
+
+def test_health_ready_is_503_until_models_are_warm():
+    """The readiness probe keeps traffic away while models are warming."""
+    with patch.object(main, "readiness", main.ModelReadiness()) as readiness:
+        readiness.register("stt:small")
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["models"]["stt:small"]["status"] == "pending"
+
+        asyncio.run(readiness.track("stt:small", asyncio.sleep(0)))
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+def test_segment_delivery_keeps_order_per_language():
+    """A slow first segment still reaches listeners before the second."""
+    listener = FakeSocket()
+
+    def slow_first(text, lang, **kwargs):
+        if text == "one":
+            time.sleep(0.2)
+        return b"audio"
+
+    room = main.Room(id="r", name="r")
+    sender = main.User(id="s", name="S", language="en", websocket=MagicMock())
+    room.users = {
+        "s": sender,
+        "l": main.User(id="l", name="L", language="en", websocket=listener),
+    }
+
+    async def run():
+        order = main.OrderedDelivery()
+        await asyncio.gather(
+            main.deliver_translations(room, sender, "one", "en", 0.0, order=order, segment=0),
+            main.deliver_translations(room, sender, "two", "en", 0.0, order=order, segment=1),
+        )
+
+    with patch.object(main, "synthesize", side_effect=slow_first):
+        asyncio.run(run())
+
+    assert [f["segment"] for f in listener.frames if isinstance(f, dict)] == [0, 1]
+
+def test_pivot_translation_runs_once_for_all_targets():
+    """A Korean speaker with es/fr/de listeners needs a single ko->en pass."""
+    calls = []
+
+    async def submit(text, key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        return f"{text}>{key[1]}"
+
+    routes = {t: ["ko", "en", t] for t in ("es", "fr", "de")}
+
+    async def run():
+        with patch.object(main, "plan_routes", return_value=routes), \
+                patch.object(main.translate_batcher, "submit", side_effect=submit):
+            futures = main.fan_out_translations("annyeong", "ko", ["es", "fr", "de", "ko"])
+            return {t: await f for t, f in futures.items()}
+
+    results = asyncio.run(run())
+
+    assert results == {t: f"annyeong>en>{t}" for t in ("es", "fr", "de")}
+    assert calls.count(("ko", "en")) == 1
+    assert sorted(calls) == sorted([("ko", "en"), ("en", "es"), ("en", "fr"), ("en", "de")])
+
+def test_multi_sentence_speech_is_streamed_in_chunks():
+    """Each sentence goes out as its own chunk, between the meta and end frames."""
+    listener = FakeSocket()
+    frames = listener.frames
+
+    def stream(text, lang, **kwargs):
+        yield "Hola.", b"one"
+        yield "Adios.", b"two"
+
+    room = main.Room(id="r", name="r")
+    sender = main.User(id="s", name="S", language="es", websocket=MagicMock())
+    room.users = {
+        "s": sender,
+        "l": main.User(id="l", name="L", language="es", websocket=listener),
+    }
+
+    with patch.object(main, "synthesize_stream", side_effect=stream):
+        asyncio.run(main.deliver_translations(room, sender, "Hola. Adios.", "es", 0.0))
+
+    assert frames[0]["type"] == "translated_audio_meta" and frames[0]["streaming"]
+    assert [(f["seq"], f["text"]) for f in frames[1:5:2]] == [(0, "Hola."), (1, "Adios.")]
+    assert frames[2] == b"one" and frames[4] == b"two"
+    assert frames[5] == {"type": "translated_audio_end", "toLanguage": "es", "chunks": 2}
+
+def test_speech_is_synthesized_once_per_output_format():
+    """Listeners sharing a language get the format each negotiated."""
+    sockets = {}
+
+    room = main.Room(id="r", name="r")
+    sender = main.User(id="s", name="S", language="en", websocket=MagicMock())
+    room.users = {"s": sender}
+    for name, fmt in (("a", "ulaw8k"), ("b", "ulaw8k"), ("c", "wav")):
+        sockets[name] = FakeSocket()
+        room.users[name] = main.User(
+            id=name, name=name, language="en", websocket=sockets[name], output_format=fmt
+        )
+
+    with patch.object(main, "synthesize", side_effect=lambda text, lang, audio_format: audio_format.encode()) as synth:
+        asyncio.run(main.deliver_translations(room, sender, "Hi", "en", 0.0))
+
+    assert {name: ws.frames[-1] for name, ws in sockets.items()} == {"a": b"ulaw8k", "b": b"ulaw8k", "c": b"wav"}
+    assert synth.call_count == 2
+
+def test_warm_phrases_caches_frequent_phrases(tmp_path):
+    """Logged translations and speech are recomputed into the caches."""
+    log = main.PhraseLog(tmp_path / "phrases.json")
+    log.record_translation("Thank you", "en", "es")
+    log.record_speech("Gracias", "es", "ulaw8k")
+
+    with patch.object(main, "phrase_log", log), \
+            patch.object(main, "PHRASE_WARM_CPU_SHARE", 1.0), \
+            patch.object(main, "translate_batch") as translate, \
+            patch.object(main, "synthesize") as synth:
+        asyncio.run(main.warm_phrases())
+
+    translate.assert_called_once_with(["Thank you"], "en", "es")
+    synth.assert_called_once_with("Gracias", "es", audio_format="ulaw8k")
+
+def test_same_language_listeners_get_the_original_audio():
+    """Passthrough rooms forward the speaker's audio instead of synthesizing it."""
+    same, other = FakeSocket(), FakeSocket()
+    room = main.Room(id="r", name="r", passthrough=True)
+    sender = main.User(id="s", name="S", language="en", websocket=MagicMock())
+    room.users = {
+        "s": sender,
+        "same": main.User(id="same", name="same", language="en", websocket=same),
+        "other": main.User(id="other", name="other", language="es", websocket=other),
+    }
+    audio = np.full(16000, 0.5, dtype=np.float32)
+
+    async def translated(text, key):
+        return "Hola"
+
+    # stt_service is mocked in this module
+    with patch.object(main, "SAMPLE_RATE", 16000), \
+            patch.object(main, "plan_routes", return_value={"es": ["en", "es"]}), \
+            patch.object(main.translate_batcher, "submit", side_effect=translated), \
+            patch.object(main, "synthesize", return_value=b"tts") as synth:
+        asyncio.run(main.deliver_translations(room, sender, "Hello", "en", 0.0, audio=audio))
+
+    meta, wav = same.frames
+    assert meta["passthrough"] is True
+    assert wav[:4] == b"RIFF" and wav != b"tts"
+    assert other.frames[1] == b"tts"
+    synth.assert_called_once_with("Hola", "es", audio_format="wav")
+
+def test_on_demand_listeners_get_text_then_audio_on_request():
+    """No synthesis runs for on-demand listeners until they ask for a message."""
+    listener = FakeSocket()
+    frames = listener.frames
+
+    room = main.Room(id="r", name="r")
+    sender = main.User(id="s", name="S", language="en", websocket=MagicMock())
+    reader = main.User(id="l", name="L", language="en", websocket=listener, delivery="on_demand")
+    room.users = {"s": sender, "l": reader}
+
+    with patch.object(main, "synthesize", return_value=b"tts") as synth:
+        asyncio.run(main.deliver_translations(room, sender, "Hello", "en", 0.0))
+        assert synth.call_count == 0
+        assert frames[0]["type"] == "translated_text"
+        assert frames[0]["translatedText"] == "Hello"
+
+        asyncio.run(main.send_requested_audio(room, reader, frames[0]["messageId"]))
+
+    assert frames[1]["requested"] is True and frames[2] == b"tts"
+    synth.assert_called_once_with("Hello", "en", audio_format="wav")
+
+
+def test_untranslated_text_is_shown_pending_and_never_spoken():
+    """While a pair installs, listeners get the original text, marked pending, without audio."""
+    listener = FakeSocket()
+    frames = listener.frames
+
+    async def installing(text, key):
+        return main.Untranslated(text)
+
+    room = main.Room(id="r", name="r")
+    sender = main.User(id="s", name="S", language="en", websocket=MagicMock())
+    reader = main.User(id="l", name="L", language="de", websocket=listener)
+    room.users = {"s": sender, "l": reader}
+
+    with patch.object(main, "plan_routes", return_value={"de": ["en", "de"]}), \
+            patch.object(main.translate_batcher, "submit", side_effect=installing), \
+            patch.object(main, "synthesize", return_value=b"tts") as synth:
+        asyncio.run(main.deliver_translations(room, sender, "Hello", "en", 0.0))
+        asyncio.run(main.send_requested_audio(room, reader, frames[0]["messageId"]))
+
+    text, refused = frames
+    assert text["type"] == "translated_text" and text["pending"] is True
+    assert text["translatedText"] == "Hello"
+    assert refused["type"] == "audio_unavailable"
+    synth.assert_not_called()
+
+def test_tts_backlog_switches_everyone_to_text_first():
+    with patch.object(main, "tts_text_first", False), \
+            patch.object(main, "TTS_DEGRADE_QUEUE_DEPTH", 4):
+        with patch.object(type(main.tts_stage), "queue_depth", 4):
+            assert main.tts_backlogged() is True
+        with patch.object(type(main.tts_stage), "queue_depth", 3):
+            assert main.tts_backlogged() is True  # hysteresis
+        with patch.object(type(main.tts_stage), "queue_depth", 2):
+            assert main.tts_backlogged() is False
+
+
+def test_cached_audio_is_not_sent_twice():
+    """A caching client gets the hash instead of a clip it already holds."""
+    sockets = {"cache": FakeSocket(), "plain": FakeSocket()}
+    frames = {name: ws.frames for name, ws in sockets.items()}
+
+    cache = main.User(id="c", name="cache", language="en", websocket=sockets["cache"], audio_cache=True)
+    plain = main.User(id="p", name="plain", language="en", websocket=sockets["plain"])
+    message = {"type": "translated_audio_meta", "translatedText": "Hi"}
+
+    asyncio.run(main.send_to_listeners([cache, plain], message, b"tts"))
+    asyncio.run(main.send_to_listeners([cache, plain], message, b"tts"))
+
+    first, clip, second = frames["cache"]
+    assert clip == b"tts" and "cached" not in first
+    assert second["cached"] is True and second["audioHash"] == first["audioHash"]
+    assert frames["plain"][1] == b"tts" and frames["plain"][3] == b"tts"
+
+    # An evicted clip is sent again
+    asyncio.run(main.handle_control_message(None, cache, {"type": "audio_evicted", "hashes": [first["audioHash"]]}))
+    asyncio.run(main.send_to_listeners([cache], message, b"tts"))
+    assert frames["cache"][-1] == b"tts"
+
+
+def test_walkie_recording_from_streaming_user_takes_the_chunk_path():
+    """A headerless PCM16 recording announced with "recording" is translated once."""
+    from unittest.mock import AsyncMock
+
+    pcm = (np.sin(np.arange(32000) / 10) * 8000).astype("<i2").tobytes()
+    users = {"w1": {"name": "Walkie", "language": "en"}}
+    deliver = AsyncMock()
+    with patch.dict(main.users_db, users), \
+            patch.object(main, "VAD_ENABLED", False), \
+            patch.object(main, "SEGMENT_PIPELINING", False), \
+            patch.object(main, "load_audio", return_value=np.zeros(32000, dtype=np.float32)) as load, \
+            patch.object(main, "transcribe_chunk", AsyncMock(return_value={"text": "hello", "language": "en"})), \
+            patch.object(main, "deliver_translations", deliver):
+        with client.websocket_connect("/ws/walkie_room") as ws:
+            ws.send_json({"userId": "w1", "streaming": True, "audioFormat": "pcm16"})
+            while ws.receive_json()["type"] != "joined":
+                pass
+            stream = main.rooms["walkie_room"].users["w1"].stream
+            ws.send_json({"type": "recording"})
+            ws.send_bytes(pcm)
+            assert ws.receive_json()["type"] == "transcription"
+
+    stream.feed.assert_not_called()
+    load.assert_called_once_with(pcm, "pcm16")
+    deliver.assert_awaited_once()
+    assert deliver.await_args.args[2:4] == ("hello", "en")
+
+
+def test_shed_translations_leave_no_futures_behind():
+    """Translation legs are settled when delivery ends, even if a target was shed."""
+    async def submit(text, key):
+        if key == ("en", "es"):
+            raise main.StageOverloaded("translate")
+        return f"{text}>{key[1]}"
+
+    room = main.Room(id="r", name="r")
+    sender = main.User(id="s", name="S", language="ko", websocket=MagicMock())
+    room.users = {"s": sender}
+    for lang in ("es", "fr"):
+        room.users[lang] = main.User(id=lang, name=lang, language=lang, websocket=MagicMock(), delivery="text")
+
+    routes = {t: ["ko", "en", t] for t in ("es", "fr")}
+    with patch.object(main, "plan_routes", return_value=routes), \
+            patch.object(main.translate_batcher, "submit", side_effect=submit), \
+            patch.object(main, "send_to_listeners", new=MagicMock(side_effect=lambda *a, **k: asyncio.sleep(0))), \
+            patch.object(main, "fan_out_translations", wraps=main.fan_out_translations) as fan:
+        asyncio.run(main.deliver_translations(room, sender, "annyeong", "ko", 0.0))
+
+    spawned = fan.call_args.args[3]
+    assert spawned and all(f.done() for f in spawned)
+
+
+def test_room_history_keeps_passthrough_audio_within_budget():
+    room = main.Room(id="r", name="r")
+    second = np.zeros(16000, dtype=np.float32)  # 32 KB as int16
+    with patch.object(main, "ROOM_AUDIO_HISTORY_BYTES", 64000):
+        ids = [room.remember({"translatedText": str(i)}, second) for i in range(3)]
+
+    assert room.messages[ids[0]][1] is None  # oldest keeps its text only
+    assert room.messages[ids[2]][1].dtype == np.int16
+    assert room.audio_bytes == 64000
+
+
+def test_requested_chunk_sends_only_that_sentence():
+    listener = FakeSocket()
+    frames = listener.frames
+
+    room = main.Room(id="r", name="r")
+    user = main.User(id="l", name="L", language="es", websocket=listener)
+    message_id = room.remember({"translatedText": "Hola. Adios.", "toLanguage": "es"}, recipients=["l"])
+
+    with patch.object(main, "synthesize", side_effect=lambda text, lang, audio_format: text.encode()):
+        asyncio.run(main.send_requested_audio(room, user, message_id, 1))
+        asyncio.run(main.send_requested_audio(room, user, message_id, 2))
+
+    chunk, wav, missing = frames
+    assert chunk["type"] == "translated_audio_chunk" and chunk["seq"] == 1 and chunk["requested"]
+    assert wav == b"Adios."
+    assert missing == {"type": "audio_unavailable", "messageId": message_id, "seq": 2}
+
+
+def test_audio_requests_are_only_served_to_recipients_in_their_language():
+    """Other users (or a recipient who has since changed language) get nothing."""
+    room = main.Room(id="r", name="r")
+    message_id = room.remember({"translatedText": "Hola", "toLanguage": "es"}, recipients=["l"])
+    outsider = main.User(id="o", name="O", language="es", websocket=FakeSocket())
+    switched = main.User(id="l", name="L", language="fr", websocket=FakeSocket())
+
+    with patch.object(main, "synthesize", return_value=b"tts") as synth:
+        asyncio.run(main.send_requested_audio(room, outsider, message_id))
+        asyncio.run(main.send_requested_audio(room, switched, message_id))
+
+    assert outsider.websocket.frames == [] and switched.websocket.frames == []
+    synth.assert_not_called()
+
+def test_wav_recordings_are_resampled_one_at_a_time_from_fresh_state():
+    user = main.User(id="u", name="U", language="en", websocket=MagicMock())
+    user.resampler = MagicMock()
+    calls = []
+
+    def load(audio_bytes, audio_format, resampler):
+        calls.append((audio_bytes, user.decode_lock.locked(), resampler.reset.call_count))
+
+    with patch.object(main, "load_audio", side_effect=load):
+        main.decode_recording(user, b"RIFF1")
+        main.decode_recording(user, b"RIFF2")
+
+    assert calls == [(b"RIFF1", True, 1), (b"RIFF2", True, 2)]
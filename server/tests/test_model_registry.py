@@ -0,0 +1,95 @@
+import hashlib
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+
+from model_registry import AssetError, ModelRegistry
+
+
+def write_manifest(tmp_path, files):
+    manifest = {
+        "translations": [{"from": "en", "to": "es", "files": files}],
+        "voices": [],
+    }
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    return ModelRegistry(tmp_path)
+
+
+def test_fetch_verifies_local_checksums(tmp_path):
+    (tmp_path / "en_es.argosmodel").write_bytes(b"model")
+    good = hashlib.sha256(b"model").hexdigest()
+
+    registry = write_manifest(tmp_path, [{"file": "en_es.argosmodel", "sha256": good}])
+    entry = registry.translation_entry("en", "es")
+    assert registry.fetch(entry) == [tmp_path / "en_es.argosmodel"]
+    assert registry.manifest_pairs() == {("en", "es")}
+
+    registry = write_manifest(tmp_path, [{"file": "en_es.argosmodel", "sha256": "0" * 64}])
+    with pytest.raises(AssetError):
+        registry.fetch(registry.translation_entry("en", "es"))
+
+
+def test_installs_run_in_background_once_per_key(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    release = threading.Event()
+    calls = []
+
+    def install():
+        calls.append(1)
+        release.wait(5)
+
+    job = registry.schedule(("voice", "fr"), install)
+    # A second request while installing joins the same job
+    assert registry.schedule(("voice", "fr"), install) is job
+    assert not registry.is_ready(("voice", "fr"))
+
+    release.set()
+    job.result(timeout=5)
+    assert registry.is_ready(("voice", "fr"))
+    assert calls == [1]
+    assert registry.stats()["voice/fr"]["status"] == "ready"
+    registry.shutdown()
+
+
+def test_failed_install_is_reported(tmp_path):
+    registry = ModelRegistry(tmp_path)
+
+    def install():
+        raise AssetError("offline")
+
+    job = registry.schedule(("translate", "ko", "en"), install)
+    with pytest.raises(AssetError):
+        job.result(timeout=5)
+    assert registry.stats()["translate/ko/en"] == {"status": "failed", "error": "offline"}
+    registry.shutdown()
+
+
+def test_failed_install_is_retried_only_after_backoff(tmp_path):
+    registry = ModelRegistry(tmp_path, retry_backoff=0.2)
+    calls = []
+
+    def install():
+        calls.append(1)
+        raise AssetError("offline")
+
+    key = ("voice", "fr")
+    failed = registry.schedule(key, install)
+    with pytest.raises(AssetError):
+        failed.result(timeout=5)
+    # Within the backoff the failed job is returned, not re-run
+    assert registry.schedule(key, install) is failed
+    assert calls == [1]
+
+    time.sleep(0.25)
+    retry = registry.schedule(key, install)
+    assert retry is not failed
+    with pytest.raises(AssetError):
+        retry.result(timeout=5)
+    assert calls == [1, 1]
+    registry.shutdown()
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from phrase_log import PhraseLog, TRANSLATE, SPEAK
+
+
+def test_top_ranks_by_frequency_per_group(tmp_path):
+    log = PhraseLog(tmp_path / "phrases.json")
+    for _ in range(3):
+        log.record_translation("Thank you", "en", "es")
+    log.record_translation("Good morning", "en", "es")
+    log.record_translation("Hello", "en", "fr")
+    log.record_speech("Gracias", "es", "wav")
+
+    assert log.top(TRANSLATE, 1) == [
+        (TRANSLATE, "en", "es", "Thank you"),
+        (TRANSLATE, "en", "fr", "Hello"),
+    ]
+    assert log.top(SPEAK, 5) == [(SPEAK, "es", "wav", "Gracias")]
+
+
+def test_flush_round_trips_and_keeps_the_most_frequent(tmp_path):
+    path = tmp_path / "phrases.json"
+    log = PhraseLog(path, max_entries=2)
+    for i, count in enumerate((5, 1, 3)):
+        for _ in range(count):
+            log.record_translation(f"phrase {i}", "en", "es")
+    log.flush()
+
+    reloaded = PhraseLog(path, max_entries=2)
+    assert [key[3] for key in reloaded.top(TRANSLATE, 10)] == ["phrase 0", "phrase 2"]
+
+
+def test_long_texts_are_not_recorded(tmp_path):
+    log = PhraseLog(tmp_path / "phrases.json", max_chars=10)
+    log.record_speech("a" * 11, "en", "wav")
+    log.record_speech("", "en", "wav")
+    assert len(log) == 0
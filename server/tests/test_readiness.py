@@ -0,0 +1,45 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from readiness import ModelReadiness
+
+
+async def _ok():
+    return None
+
+
+async def _fail():
+    raise RuntimeError("no such voice")
+
+
+def test_ready_once_every_model_is_warm():
+    readiness = ModelReadiness()
+    readiness.register("stt:small")
+    readiness.register("tts:es")
+    assert not readiness.ready
+
+    asyncio.run(readiness.track("stt:small", _ok()))
+    assert not readiness.ready
+    assert readiness.stats()["stt:small"]["status"] == "ready"
+    assert readiness.stats()["tts:es"]["status"] == "pending"
+
+    asyncio.run(readiness.track("tts:es", _ok(), optional=True))
+    assert readiness.ready
+
+
+def test_failures_are_reported_and_block_only_required_models():
+    readiness = ModelReadiness()
+    readiness.register("stt:small")
+    readiness.register("tts:es")
+
+    asyncio.run(readiness.track("tts:es", _fail(), optional=True))
+    asyncio.run(readiness.track("stt:small", _ok()))
+    assert readiness.ready
+    assert readiness.stats()["tts:es"]["status"] == "failed"
+    assert "no such voice" in readiness.stats()["tts:es"]["error"]
+
+    asyncio.run(readiness.track("stt:small", _fail()))
+    assert not readiness.ready
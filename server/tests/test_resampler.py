@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import scipy.signal
+
+from resampler import StreamResampler, design_filter, resample
+
+
+def test_design_filter_is_cached():
+    assert design_filter(160, 441) is design_filter(160, 441)
+    assert not design_filter(160, 441).flags.writeable
+
+
+def test_one_shot_matches_resample_poly():
+    audio = np.random.randn(44100).astype(np.float32)
+    expected = scipy.signal.resample_poly(audio, 160, 441)
+    np.testing.assert_allclose(resample(audio, 44100, 16000), expected, atol=1e-5)
+
+
+def test_stream_matches_one_shot_across_chunk_boundaries():
+    for sample_rate in (44100, 48000):
+        audio = np.random.randn(sample_rate * 2).astype(np.float32)
+        expected = resample(audio, sample_rate, 16000)
+
+        stream = StreamResampler(16000)
+        chunks = np.array_split(audio, 7)
+        out = np.concatenate([stream.process(c, sample_rate) for c in chunks])
+
+        # Only the filter lookahead at the very end is still held back
+        assert len(expected) - len(out) < 20
+        np.testing.assert_allclose(out, expected[:len(out)], atol=1e-5)
+
+
+def test_stream_passthrough_and_reset():
+    stream = StreamResampler(16000)
+    audio = np.ones(1600, dtype=np.float32)
+    assert stream.process(audio, 16000) is audio
+
+    stream.process(np.random.randn(4410).astype(np.float32), 44100)
+    stream.reset()
+    assert stream.sample_rate is None
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from residency import ResidencyManager, disk_size
+
+
+def test_unloads_least_recently_used_idle_models_past_budget():
+    unloaded = []
+    manager = ResidencyManager(budget_bytes=100)
+    for name in ("a", "b", "c"):
+        manager.register(("voice", name), 40, lambda n=name: unloaded.append(n))
+    # "c" pushed the total to 120: "a" was used least recently
+    assert unloaded == ["a"]
+
+    manager.touch(("voice", "b"))
+    manager.register(("voice", "d"), 40, lambda: unloaded.append("d"))
+    assert unloaded == ["a", "c"]
+
+    stats = manager.stats()
+    assert stats["residentBytes"] == 80
+    assert set(stats["models"]) == {"voice/b", "voice/d"}
+    assert stats["evictions"] == 2
+
+
+def test_models_needed_by_active_rooms_are_kept():
+    unloaded = []
+    manager = ResidencyManager(budget_bytes=50)
+    manager.set_active({("translate", "en", "es")})
+    manager.register(("translate", "en", "es"), 40, lambda: unloaded.append("en-es"))
+    manager.register(("translate", "es", "en"), 40, lambda: unloaded.append("es-en"))
+
+    # Over budget, but the only idle model is the one just loaded
+    assert unloaded == []
+    assert manager.stats()["models"]["translate/en/es"]["active"] is True
+
+    # The room leaves: its model becomes the eviction candidate
+    manager.set_active({("translate", "es", "en")})
+    assert unloaded == ["en-es"]
+    assert manager.resident_bytes == 40
+
+
+def test_unlimited_budget_only_tracks():
+    manager = ResidencyManager()
+    for i in range(5):
+        manager.register(("voice", str(i)), 1 << 30, lambda: None)
+    assert manager.stats()["evictions"] == 0
+    assert manager.resident_bytes == 5 << 30
+
+
+def test_disk_size_of_files_and_directories(tmp_path):
+    (tmp_path / "model").mkdir()
+    (tmp_path / "model" / "model.bin").write_bytes(b"x" * 10)
+    (tmp_path / "model" / "vocab").write_bytes(b"x" * 5)
+    assert disk_size(tmp_path / "model") == 15
+    assert disk_size(tmp_path / "model" / "vocab") == 5
+    assert disk_size(tmp_path / "missing") == 0
@@ -0,0 +1,49 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test")
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: flight.do("voice", load), range(4)))
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.stats() == {"executed": 1, "shared": 3, "inFlight": 0}
+
+
+def test_followers_get_the_leaders_exception_and_key_is_released():
+    flight = SingleFlight("test")
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("download failed")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, "k", fail)
+        started.wait(1)
+        follower = pool.submit(flight.do, "k", fail)
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError, match="download failed"):
+                future.result()
+
+    # Nothing is remembered: the next call runs again
+    assert flight.do("k", lambda: 42) == 42
@@ -0,0 +1,73 @@
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from batching import MicroBatcher
+from stt_policy import TierPolicy
+
+
+def make_policy():
+    return TierPolicy(
+        ["tiny", "base", "small"],
+        slo=1.0,
+        workers=1,
+        initial_estimates={"tiny": 0.1, "base": 0.3, "small": 0.8},
+    )
+
+
+def test_idle_server_uses_most_accurate_tier():
+    policy = make_policy()
+    assert policy.choose(pending=0) == "small"
+
+
+def test_backlog_degrades_to_faster_tiers():
+    policy = make_policy()
+    assert policy.choose(pending=2) == "base"   # small: 2.4s, base: 0.9s
+    assert policy.choose(pending=5) == "tiny"   # base: 1.8s, tiny: 0.6s
+    # Nothing fits: fall back to the fastest tier rather than queue more work
+    assert policy.choose(pending=50) == "tiny"
+    assert policy.stats()["tiers"]["tiny"]["selected"] == 2
+
+
+def test_measured_timings_replace_estimates():
+    policy = make_policy()
+    # The small model turns out much slower than expected on this host
+    for _ in range(20):
+        policy.record("small", seconds=6.0, items=4)
+    assert policy.choose(pending=0) == "base"
+
+
+def test_partly_batched_backlog_counts_every_waiting_chunk():
+    release = threading.Event()
+
+    def batch_fn(key, items):
+        release.wait(5)
+        return list(items)
+
+    async def run():
+        # One decoder: the first batch of two runs, the next two wait for
+        # the executor and the fifth chunk waits for its batch to fill.
+        batcher = MicroBatcher(
+            "stt", batch_fn, max_batch=2, max_wait=10,
+            executor=ThreadPoolExecutor(max_workers=1),
+        )
+        tasks = [asyncio.create_task(batcher.submit(i)) for i in range(5)]
+        await asyncio.sleep(0.05)
+        backlog = batcher.backlog
+        release.set()
+        batcher._flush(None)
+        await asyncio.gather(*tasks)
+        return backlog, batcher.backlog
+
+    backlog, drained = asyncio.run(run())
+    assert (backlog, drained) == (5, 0)
+
+    policy = make_policy()
+    assert policy.choose(pending=backlog) == "tiny"   # base: 1.8s
+    # The same backlog spread over four worker processes still fits base
+    policy.set_workers(4)
+    assert policy.choose(pending=backlog) == "base"   # small: 1.2s, base: 0.45s
@@ -138,3 +138,107 @@ def test_transcribe_no_resampling_needed(mock_get_model):
     with patch("scipy.signal.resample_poly") as mock_resample:
         transcribe(wav_bytes)
         assert not mock_resample.called
+
+@patch("server.stt_service.transcribe_audio")
+def test_transcribe_batch_single_item_uses_full_path(mock_transcribe_audio):
+    mock_transcribe_audio.return_value = {"text": "hi", "language": "en", "confidence": 1.0}
+    audio = np.zeros(16000, dtype=np.float32)
+
+    results = server.stt_service.transcribe_batch([(audio, "en")])
+
+    assert results == [{"text": "hi", "language": "en", "confidence": 1.0}]
+    mock_transcribe_audio.assert_called_once_with(audio, "en", "small")
+
+@patch("server.stt_service._get_tokenizer")
+@patch("server.stt_service.get_model")
+def test_transcribe_batch_runs_one_generate_call(mock_get_model, mock_get_tokenizer):
+    model = MagicMock()
+    mock_get_model.return_value = model
+    model.feature_extractor.return_value = np.zeros((80, 400), dtype=np.float32)
+    model.feature_extractor.nb_max_frames = 3000
+    model.model.detect_language.return_value = [[("<|fr|>", 0.8)], [("<|de|>", 0.7)]]
+
+    tokenizer = MagicMock(sot_sequence=(1, 2, 3), no_timestamps=4, eot=100)
+    tokenizer.decode.side_effect = lambda tokens: f" text{len(tokens)}"
+    mock_get_tokenizer.return_value = tokenizer
+
+    out_a = MagicMock(no_speech_prob=0.1, sequences_ids=[[5, 6, 100]])
+    out_b = MagicMock(no_speech_prob=0.9, sequences_ids=[[5]])
+    model.model.generate.return_value = [out_a, out_b]
+
+    audio = np.zeros(16000, dtype=np.float32)
+    results = server.stt_service.transcribe_batch([(audio, "en"), (audio, None)])
+
+    features = model.encode.call_args[0][0]
+    assert features.shape == (2, 80, 3000)
+    model.model.generate.assert_called_once()
+    assert results[0] == {"text": "text2", "language": "en", "confidence": 1.0, "model": "small"}
+    # Second item: language detected, flagged as no speech
+    assert results[1] == {"text": "", "language": "de", "confidence": 0.7, "model": "small"}
+
+def test_load_audio_pcm16_fast_path():
+    samples = (np.random.randn(16000) * 3000).astype(np.int16)
+
+    with patch("server.stt_service.wav_bytes_to_float32") as mock_wav, \
+            patch("scipy.signal.resample_poly") as mock_resample:
+        audio = server.stt_service.load_audio(samples.tobytes(), "pcm16")
+
+    mock_wav.assert_not_called()
+    mock_resample.assert_not_called()
+    assert audio.dtype == np.float32
+    np.testing.assert_allclose(audio, samples / 32768.0, rtol=1e-6)
+
+def test_load_audio_pcm16_gates_silence_and_short_chunks():
+    silence = np.zeros(16000, dtype=np.int16).tobytes()
+    short = (np.random.randn(1600) * 3000).astype(np.int16).tobytes()
+
+    assert server.stt_service.load_audio(silence, "pcm16") is None
+    assert server.stt_service.load_audio(short, "pcm16") is None
+
+def test_pcm16_to_float32_rms():
+    samples = np.full(1000, 16384, dtype=np.int16)
+    audio, rms = server.stt_service.pcm16_to_float32(samples.tobytes())
+    assert len(audio) == 1000
+    assert abs(rms - 0.5) < 1e-6
+
+def test_load_audio_uses_speaker_resampler():
+    import io
+    import wave
+    from resampler import StreamResampler
+
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(48000)
+        wf.writeframes((np.random.randn(48000) * 3000).astype(np.int16).tobytes())
+
+    resampler = StreamResampler(16000)
+    with patch("scipy.signal.resample_poly") as mock_resample:
+        audio = server.stt_service.load_audio(buf.getvalue(), "wav", resampler)
+
+    mock_resample.assert_not_called()
+    assert resampler.sample_rate == 48000
+    assert abs(len(audio) - 16000) < 20
+
+@patch("server.stt_service.get_model")
+def test_transcribe_segments_yields_as_decoded(mock_get_model):
+    decoded = []
+
+    def segments():
+        for i, text in enumerate([" Hello there.", "  ", " How are you?"]):
+            decoded.append(i)
+            yield MagicMock(text=text, start=float(i), end=float(i + 1))
+
+    info = MagicMock(language="en", language_probability=0.9)
+    mock_get_model.return_value.transcribe.return_value = (segments(), info)
+
+    gen = server.stt_service.transcribe_segments(np.zeros(16000, dtype=np.float32), "en")
+    first = next(gen)
+    # Only the first segment has been decoded when it is handed out
+    assert decoded == [0]
+    assert first["text"] == "Hello there."
+    assert first["start"] == 0.0
+
+    rest = list(gen)
+    assert [s["text"] for s in rest] == ["How are you?"]
@@ -0,0 +1,101 @@
+import sys
+from unittest.mock import MagicMock, patch
+
+# Mock faster_whisper to avoid loading the model
+sys.modules["faster_whisper"] = MagicMock()
+
+# The API tests replace the flat service modules with mocks; we need the real ones.
+for module_name in ("stt_service", "streaming_stt"):
+    if isinstance(sys.modules.get(module_name), MagicMock):
+        del sys.modules[module_name]
+
+import numpy as np
+
+from server.streaming_stt import StreamingTranscriber
+
+
+def _pcm(seconds: float, amplitude: int) -> bytes:
+    n = int(seconds * 16000)
+    if amplitude == 0:
+        return np.zeros(n, dtype=np.int16).tobytes()
+    return (np.random.randn(n) * amplitude).astype(np.int16).tobytes()
+
+
+def _result(text):
+    return {"text": text, "language": "en", "confidence": 0.9}
+
+
+def test_silence_never_triggers_decode_and_buffer_stays_bounded():
+    stream = StreamingTranscriber("en", endpoint_silence=0.5)
+    for _ in range(50):
+        assert stream.feed(_pcm(0.1, 0)) is False
+    assert stream._buffered <= stream.endpoint_samples
+
+
+def test_partial_then_final_on_trailing_silence():
+    stream = StreamingTranscriber("en", partial_interval=0.5, endpoint_silence=0.5)
+
+    with patch("server.streaming_stt.transcribe_audio") as mock_transcribe:
+        mock_transcribe.side_effect = [
+            _result("hello there"),
+            _result("hello there my friend"),
+            _result("hello there my friend"),
+        ]
+
+        assert stream.feed(_pcm(0.6, 3000)) is True
+        msg = stream.decode()
+        assert msg["type"] == "partial_transcription"
+        assert msg["text"] == "hello there"
+        assert msg["stableText"] == ""
+
+        stream.feed(_pcm(0.6, 3000))
+        msg = stream.decode()
+        assert msg["type"] == "partial_transcription"
+        assert msg["stableText"] == "hello there"
+
+        assert stream.feed(_pcm(0.6, 0)) is True
+        msg = stream.decode()
+        assert msg["type"] == "final_transcription"
+        assert msg["text"] == "hello there my friend"
+
+    # Buffer is reset after finalizing
+    assert stream._buffered == 0
+    assert stream.decode_due is False
+
+
+def test_flush_finalizes_buffered_speech():
+    stream = StreamingTranscriber("en", partial_interval=5.0)
+
+    with patch("server.streaming_stt.transcribe_audio", return_value=_result("yes")):
+        assert stream.feed(_pcm(0.3, 3000)) is False
+        stream.request_flush()
+        assert stream.decode_due is True
+        msg = stream.decode()
+
+    assert msg["type"] == "final_transcription"
+    assert msg["text"] == "yes"
+    assert stream.decode_due is False
+
+
+def test_steady_noise_is_not_decoded_with_a_vad():
+    """Background noise above the fixed silence threshold is learned, not decoded."""
+    from vad import VoiceActivityGate
+
+    stream = StreamingTranscriber("en", endpoint_silence=0.5, vad=VoiceActivityGate())
+    with patch("server.streaming_stt.transcribe_audio") as mock_transcribe:
+        for _ in range(100):
+            # Well above SILENCE_RMS, but the same all the time
+            assert stream.feed(_pcm(0.1, 1500)) is False
+        assert stream.snapshot() is None
+    mock_transcribe.assert_not_called()
+    assert stream._buffered <= stream.endpoint_samples
+
+
+def test_speech_over_noise_is_heard_with_a_vad():
+    from vad import VoiceActivityGate
+
+    stream = StreamingTranscriber("en", partial_interval=0.5, endpoint_silence=0.5, vad=VoiceActivityGate())
+    for _ in range(10):
+        stream.feed(_pcm(0.1, 300))
+    due = [stream.feed(_pcm(0.1, 6000)) for _ in range(6)]
+    assert due[-1] is True
@@ -1,6 +1,3 @@
-import sys
-from unittest.mock import MagicMock
-sys.modules["numpy"] = MagicMock()
 import unittest
 from unittest.mock import MagicMock, patch
 import sys
@@ -26,6 +23,9 @@ class TestTranslateService(unittest.TestCase):
         # Reset internal state
         translate_service._installed_pairs = set()
         translate_service._initialized = False
+        translate_service._cache.clear()
+        translate_service._engines.clear()
+        translate_service._pivot_pairs = set()
 
     def test_translate_same_language(self):
         """Test translation when source and target languages are the same."""
@@ -110,6 +110,138 @@ class TestTranslateService(unittest.TestCase):
         # Direct -> catch -> pivot step 1 (success) -> pivot step 2 (fail) -> catch -> return text
         self.assertEqual(translate_service.argostranslate.translate.translate.call_count, 3)
 
+    @patch("server.translate_service._ensure_package_installed")
+    def test_translate_caches_per_sentence(self, mock_ensure_installed):
+        """Repeated sentences are served from the cache, even inside longer texts."""
+        translate_service.argostranslate.translate.translate.side_effect = (
+            lambda text, from_lang, to_lang: {
+                "Hello.": "Hola.", "How are you?": "¿Cómo estás?", "hello.": "hola.",
+            }[text]
+        )
+
+        before = translate_service.cache_stats()
+        self.assertEqual(translate_service.translate("Hello.", "en", "es"), "Hola.")
+        self.assertEqual(
+            translate_service.translate("Hello.  How are you?", "en", "es"),
+            "Hola. ¿Cómo estás?",
+        )
+
+        # "Hello." was served from the cache; only the new sentence was translated
+        self.assertEqual(translate_service.argostranslate.translate.translate.call_count, 2)
+        stats = translate_service.cache_stats()
+        self.assertEqual(stats["hits"] - before["hits"], 1)
+        self.assertEqual(stats["misses"] - before["misses"], 2)
+
+        # Case is part of the key: a differently cased sentence is translated on its own
+        self.assertEqual(translate_service.translate("hello.", "en", "es"), "hola.")
+        self.assertEqual(translate_service.argostranslate.translate.translate.call_count, 3)
+
+    @patch("server.translate_service._ensure_package_installed")
+    def test_translate_failures_are_not_cached(self, mock_ensure_installed):
+        translate_service.argostranslate.translate.translate.side_effect = Exception("boom")
+        self.assertEqual(translate_service.translate("Hello.", "en", "es"), "Hello.")
+
+        translate_service.argostranslate.translate.translate.side_effect = None
+        translate_service.argostranslate.translate.translate.return_value = "Hola."
+        self.assertEqual(translate_service.translate("Hello.", "en", "es"), "Hola.")
+
+    @patch("server.translate_service._ensure_package_installed")
+    def test_translate_batch_translates_shared_sentences_once(self, mock_ensure_installed):
+        translate_service.argostranslate.translate.translate.side_effect = (
+            lambda text, from_lang, to_lang: f"<{text}>"
+        )
+
+        results = translate_service.translate_batch(
+            ["Yes. Thank you.", "", "Yes.", "Thank you. Bye."], "en", "es"
+        )
+
+        self.assertEqual(results, ["<Yes.> <Thank you.>", "", "<Yes.>", "<Thank you.> <Bye.>"])
+        # Three distinct sentences across four texts
+        self.assertEqual(translate_service.argostranslate.translate.translate.call_count, 3)
+        mock_ensure_installed.assert_called_once_with("en", "es")
+
+    @patch("server.translate_service._ensure_package_installed")
+    @patch("server.translate_service.ctranslate2")
+    def test_engine_translates_batch_with_cached_handle(self, mock_ct2, mock_ensure_installed):
+        package = MagicMock(from_code="en", to_code="es", target_prefix="")
+        package.tokenizer.encode.side_effect = lambda text: text.split()
+        package.tokenizer.decode.side_effect = lambda tokens: " ".join(tokens)
+        translate_service.argostranslate.package.get_installed_packages.return_value = [package]
+        translator = mock_ct2.Translator.return_value
+        translator.translate_batch.side_effect = lambda batch, **kwargs: [
+            MagicMock(hypotheses=[[t.upper() for t in tokens]]) for tokens in batch
+        ]
+
+        try:
+            first = translate_service.translate_batch(["Good morning.", "See you."], "en", "es")
+            second = translate_service.translate("Thanks.", "en", "es")
+        finally:
+            translate_service.argostranslate.package.get_installed_packages.return_value = MagicMock()
+
+        self.assertEqual(first, ["GOOD MORNING.", "SEE YOU."])
+        self.assertEqual(second, "THANKS.")
+        # One translator for the pair, one batched call per translate_batch
+        mock_ct2.Translator.assert_called_once()
+        self.assertEqual(mock_ct2.Translator.call_args.kwargs["compute_type"], "int8")
+        self.assertEqual(translator.translate_batch.call_count, 2)
+        translate_service.argostranslate.translate.translate.assert_not_called()
+
+    def test_engine_evicted_mid_lookup_is_reloaded(self):
+        """A pair dropped by the residency manager mid-lookup loads again instead of raising."""
+        class Evicting(dict):
+            def __contains__(self, key):
+                return True  # Looked resident a moment ago
+
+        with patch("server.translate_service._engines", Evicting()), \
+                patch("server.translate_service._load_engine", return_value="engine") as load:
+            engine = translate_service._get_engine("en", "es")
+
+        self.assertEqual(engine, "engine")
+        load.assert_called_once_with("en", "es")
+
+    def test_plan_routes_pivots_only_without_direct_package(self):
+        translate_service._installed_pairs = {("fr", "en"), ("fr", "es"), ("fr", "ko")}
+        translate_service._pivot_pairs = {("fr", "ko")}
+
+        routes = translate_service.plan_routes("fr", ["en", "es", "ko", "fr"])
+
+        self.assertEqual(routes, {
+            "en": ["fr", "en"],
+            "es": ["fr", "es"],
+            "ko": ["fr", "en", "ko"],
+        })
+
+    def test_registry_never_installs_on_request_path(self):
+        """With a registry, missing pairs pass text through and install in the background."""
+        registry = MagicMock()
+        registry.is_ready.return_value = False
+        translate_service.set_registry(registry)
+        try:
+            with patch("server.translate_service._ensure_package_installed") as mock_ensure:
+                result = translate_service.translate("Hello.", "en", "de")
+        finally:
+            translate_service._registry = None
+
+        self.assertEqual(result, "Hello.")
+        self.assertIsInstance(result, translate_service.Untranslated)
+        mock_ensure.assert_not_called()
+        translate_service.argostranslate.translate.translate.assert_not_called()
+        scheduled = [c.args[0] for c in registry.schedule.call_args_list]
+        self.assertEqual(scheduled, ["translate-scan", ("translate", "en", "de")])
+
+    def test_install_job_fails_when_no_package_exists(self):
+        """A pair with no package fails its registry job instead of reporting ready."""
+        registry = MagicMock()
+        registry.translation_entry.return_value = None
+        translate_service._registry = registry
+        try:
+            with patch("server.translate_service._ensure_package_installed"):
+                with self.assertRaises(LookupError):
+                    translate_service._install_pair("en", "xx")
+        finally:
+            translate_service._registry = None
+        registry.mark_ready.assert_not_called()
+
     def test_get_supported_languages(self):
         """Test that get_supported_languages returns a copy of SUPPORTED_LANGUAGES."""
         supported_langs = translate_service.get_supported_languages()
@@ -0,0 +1,70 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tts_cache import SpeechCache
+
+
+def test_key_depends_on_voice_text_and_speed():
+    key = SpeechCache.key("en_US-lessac-medium", "Hello.", 1.0)
+    assert key == SpeechCache.key("en_US-lessac-medium", "Hello.", 1.0)
+    assert key != SpeechCache.key("en_US-amy-medium", "Hello.", 1.0)
+    assert key != SpeechCache.key("en_US-lessac-medium", "Hello!", 1.0)
+    assert key != SpeechCache.key("en_US-lessac-medium", "Hello.", 1.5)
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    key = SpeechCache.key("voice", "Hello.", 1.0)
+    SpeechCache(1024, tmp_path, 1024).put(key, b"RIFFwav")
+
+    restarted = SpeechCache(1024, tmp_path, 1024)
+    assert restarted.disk_bytes == 7
+    assert restarted.get(key) == b"RIFFwav"
+    assert restarted.get(key) == b"RIFFwav"  # now served from memory
+
+    stats = restarted.stats()
+    assert stats["disk"]["hits"] == 1
+    assert stats["memory"]["hits"] == 1
+    assert stats["hitRate"] == 1.0
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = SpeechCache(0, tmp_path, 10)
+    cache.put("aa01", b"xxxx")
+    cache.put("bb02", b"xxxx")
+    os.utime(cache._path("aa01"), (1, 1))
+    os.utime(cache._path("bb02"), (2, 2))
+    assert cache.get("aa01") == b"xxxx"  # a read makes it the most recent
+
+    cache.put("cc03", b"xxxx")
+
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") == b"xxxx"
+    assert cache.disk_bytes == 8
+    assert cache.stats()["disk"]["evictions"] == 1
+
+
+def test_memory_only_without_a_directory():
+    cache = SpeechCache(1024)
+    cache.put("k", b"wav")
+    assert cache.get("k") == b"wav"
+    cache.clear()
+    assert cache.get("k") is None
+    assert cache.stats()["disk"]["enabled"] is False
+
+
+def test_disk_eviction_trims_to_low_water_mark(tmp_path):
+    cache = SpeechCache(0, tmp_path, 100)
+    for i in range(10):
+        cache.put(f"{i:02d}aa", b"x" * 10)
+    scans = []
+    files = cache._files
+    cache._files = lambda: scans.append(1) or files()
+
+    cache.put("10aa", b"x" * 10)  # over budget: trimmed to 90%
+    assert len(scans) == 1 and cache.disk_bytes == 90
+
+    cache.put("11aa", b"x" * 10)  # back at the budget, not over it
+    assert len(scans) == 1 and cache.disk_bytes == 100
@@ -150,3 +150,47 @@ class TestTTSService(unittest.TestCase):
         self.assertEqual(quality, "medium")
         self.assertTrue(str(onnx_path).endswith(f"{model_name}.onnx"))
         self.assertTrue(str(json_path).endswith(f"{model_name}.onnx.json"))
+
+    @patch("server.tts_service.synthesize")
+    def test_synthesize_stream_yields_one_chunk_per_sentence(self, mock_synthesize):
+        """Streaming synthesis hands back each sentence's audio in order."""
+        mock_synthesize.side_effect = lambda text, lang, speed, audio_format: f"wav:{text}".encode()
+
+        chunks = list(tts_service.synthesize_stream("Hello there. How are you? Fine.", "en"))
+
+        self.assertEqual(chunks, [
+            ("Hello there.", b"wav:Hello there."),
+            ("How are you?", b"wav:How are you?"),
+            ("Fine.", b"wav:Fine."),
+        ])
+
+    @patch("server.tts_service.encode_audio")
+    def test_encoded_formats_reuse_the_native_clip(self, mock_encode):
+        """Each format is encoded from one synthesis and cached on its own."""
+        mock_voice = MagicMock()
+        mock_voice.config.sample_rate = 22050
+        tts_service._synthesizers[str(tts_service._get_voice_path("en")[0])] = mock_voice
+        mock_encode.side_effect = lambda wav, fmt: f"{fmt}:".encode() + wav
+
+        native = tts_service.synthesize("Hello", "en")
+        ulaw = tts_service.synthesize("Hello", "en", audio_format="ulaw8k")
+        self.assertEqual(tts_service.synthesize("Hello", "en", audio_format="ulaw8k"), ulaw)
+
+        self.assertEqual(ulaw, b"ulaw8k:" + native)
+        mock_voice.synthesize.assert_called_once()
+        mock_encode.assert_called_once()
+
+    def test_worker_pool_backend_routes_by_voice(self):
+        """With a pool set, clips come from the worker holding the voice and are cached here."""
+        pool = MagicMock()
+        pool.run.return_value = b"RIFFremote"
+        tts_service.set_backend(pool)
+        try:
+            self.assertEqual(tts_service.synthesize("Hola", "es"), b"RIFFremote")
+            self.assertEqual(tts_service.synthesize("Hola", "es"), b"RIFFremote")
+        finally:
+            tts_service.set_backend(None)
+
+        pool.run.assert_called_once_with(
+            None, "Hola", "es", 1.0, "wav", None, affinity=tts_service.VOICE_MODELS["es"]
+        )
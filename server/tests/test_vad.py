@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from vad import VoiceActivityGate
+
+
+def _tone(seconds, amplitude):
+    t = np.arange(int(seconds * 16000)) / 16000
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _noise(seconds, amplitude):
+    return (np.random.randn(int(seconds * 16000)) * amplitude).astype(np.float32)
+
+
+def test_silence_is_dropped():
+    gate = VoiceActivityGate()
+    assert gate.process(np.zeros(16000, dtype=np.float32)) is None
+
+
+def test_speech_is_trimmed_to_padded_region():
+    gate = VoiceActivityGate(pad_ms=100)
+    audio = np.concatenate([_noise(1.0, 0.0005), _tone(0.5, 0.3), _noise(1.0, 0.0005)])
+
+    trimmed = gate.process(audio)
+
+    assert trimmed is not None
+    # 0.5 s of speech plus ~0.1 s padding either side
+    assert 0.6 * 16000 <= len(trimmed) <= 0.75 * 16000
+
+
+def test_noise_floor_adapts_to_steady_background():
+    gate = VoiceActivityGate()
+    fan = 0.02  # loud enough to pass a fixed RMS threshold
+
+    # The floor learns the fan after a few chunks...
+    for _ in range(10):
+        gate.process(_noise(1.0, fan))
+    assert gate.process(_noise(1.0, fan)) is None
+
+    # ...while speech over the fan still gets through
+    speech = _noise(1.0, fan) + np.concatenate([np.zeros(4000), _tone(0.5, 0.3), np.zeros(4000)]).astype(np.float32)
+    assert gate.process(speech) is not None
+
+
+def test_short_clicks_are_dropped():
+    gate = VoiceActivityGate(min_speech_ms=200)
+    audio = np.zeros(16000, dtype=np.float32)
+    audio[8000:8000 + 480] = 0.5  # a 30 ms keyboard click
+    assert gate.process(audio) is None
@@ -0,0 +1,138 @@
+import os
+import time
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+import worker_pool
+from worker_pool import AudioWorkerPool, WorkerCrashed
+
+
+def summarize(items, scale):
+    """Handler run inside the workers."""
+    return [(float(audio.sum()) * scale, len(audio), tag, os.getpid()) for audio, tag in items]
+
+
+def crash(items):
+    os._exit(1)
+
+
+HANDLER = f"{__name__}:summarize"
+
+
+def test_batches_round_trip_through_shared_memory():
+    pool = AudioWorkerPool("test", workers=2, handler=HANDLER)
+    try:
+        a = np.ones(1600, dtype=np.float32)
+        b = np.full(800, 0.5, dtype=np.float32)
+        results = pool.run([(a, "a"), (b, "b")], 2.0)
+
+        assert [r[:3] for r in results] == [(3200.0, 1600, "a"), (800.0, 800, "b")]
+        assert results[0][3] != os.getpid()
+    finally:
+        pool.shutdown()
+
+
+def test_dispatches_to_least_loaded_worker():
+    pool = AudioWorkerPool("test", workers=2, handler=HANDLER)
+    try:
+        audio = np.zeros(160, dtype=np.float32)
+        futures = [pool.submit([(audio, i)], 1.0) for i in range(2)]
+        pids = {f.result(timeout=30)[0][3] for f in futures}
+        # Two jobs in flight at once land on different workers
+        assert len(pids) == 2
+    finally:
+        pool.shutdown()
+
+
+def test_crashed_worker_fails_its_jobs_and_is_replaced():
+    pool = AudioWorkerPool("test", workers=1, handler=f"{__name__}:crash")
+    try:
+        future = pool.submit([(np.zeros(10, dtype=np.float32), None)])
+        with pytest.raises(WorkerCrashed):
+            future.result(timeout=30)
+        assert pool.stats()["workers"][0]["outstanding"] == 0
+    finally:
+        pool.shutdown()
+
+
+def whoami(delay):
+    """No-audio handler: report the worker's pid after a pause."""
+    time.sleep(delay)
+    return os.getpid()
+
+
+def test_affinity_keeps_a_key_on_one_worker():
+    pool = AudioWorkerPool("test", workers=2, handler=f"{__name__}:whoami")
+    try:
+        en = {pool.run(None, 0.0, affinity="en") for _ in range(3)}
+        fr = pool.run(None, 0.0, affinity="fr")
+        assert len(en) == 1
+        # A new key goes to the worker that holds no other key
+        assert fr not in en
+    finally:
+        pool.shutdown()
+
+
+def test_pool_grows_when_a_key_is_in_heavy_demand():
+    pool = AudioWorkerPool(
+        "test", workers=1, handler=f"{__name__}:whoami", max_workers=2, spread_depth=1
+    )
+    try:
+        futures = [pool.submit(None, 0.5, affinity="en") for _ in range(2)]
+        assert len({f.result(timeout=30) for f in futures}) == 2
+        assert len(pool.stats()["workers"]) == 2
+    finally:
+        pool.shutdown()
+
+
+def test_dead_worker_is_found_under_steady_traffic():
+    pool = AudioWorkerPool("test", workers=2, handler=f"{__name__}:whoami")
+    try:
+        doomed = pool.submit(None, 60.0)
+        pool._workers[0]["process"].kill()
+        deadline = time.monotonic() + 10
+        while not doomed.done() and time.monotonic() < deadline:
+            pool.run(None, 0.0)  # Keeps the result queue busy
+        with pytest.raises(WorkerCrashed):
+            doomed.result(timeout=0)
+        # New jobs never land on the dead process
+        assert all(w["process"].is_alive() for w in pool._workers)
+    finally:
+        pool.shutdown()
+
+
+def test_run_gives_up_after_job_timeout():
+    pool = AudioWorkerPool("test", workers=1, handler=f"{__name__}:whoami", job_timeout=0.2)
+    try:
+        stuck = pool._workers[0]["process"]
+        with pytest.raises(WorkerCrashed):
+            pool.run(None, 5.0)
+        # The job is released and its stuck worker replaced
+        assert pool._jobs == {}
+        assert not stuck.is_alive()
+        pool.job_timeout = 30
+        assert pool.run(None, 0.0) != stuck.pid
+    finally:
+        pool.shutdown(timeout=0.5)
+
+
+def test_crash_looping_worker_is_given_up_on(monkeypatch, caplog):
+    monkeypatch.setattr(worker_pool, "MAX_WORKER_RESTARTS", 2)
+    monkeypatch.setattr(worker_pool, "RESTART_BACKOFF", 0.1)
+    pool = AudioWorkerPool("test", workers=1, handler=f"{__name__}:crash")
+    try:
+        for _ in range(3):
+            with pytest.raises(WorkerCrashed):
+                pool.run([(np.zeros(10, dtype=np.float32), None)])
+            time.sleep(0.3)  # Past the backoff, so the next job gets a worker
+        with pytest.raises(WorkerCrashed, match="No test workers running"):
+            pool.run([(np.zeros(10, dtype=np.float32), None)])
+        assert pool.stats()["workers"][0]["running"] is False
+        assert sum("not restarting it again" in r.message for r in caplog.records) == 1
+    finally:
+        pool.shutdown(timeout=0.5)
@@ -0,0 +1,40 @@
+"""
+Text helpers shared by the translation and speech stages.
+"""
+
+import re
+import unicodedata
+
+# Split after sentence-final punctuation followed by whitespace, or directly
+# after full-width CJK punctuation (which is not followed by a space).
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?…])\s+|(?<=[。！？])")
+_WHITESPACE = re.compile(r"\s+")
+
+# Languages written without spaces between sentences
+_NO_SPACE_LANGUAGES = {"zh", "ja"}
+
+
+class Untranslated(str):
+    """
+    Text handed back in its original language because the translation
+    wasn't available yet (its language pair is still installing). It must
+    not be spoken with the target language's voice.
+    """
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences, keeping each sentence's punctuation."""
+    return [s.strip() for s in _SENTENCE_BREAK.split(text.strip()) if s.strip()]
+
+
+def join_sentences(sentences: list[str], lang: str) -> str:
+    """Inverse of ``split_sentences`` for text in ``lang``."""
+    return ("" if lang in _NO_SPACE_LANGUAGES else " ").join(sentences)
+
+
+def normalize(text: str) -> str:
+    """
+    Canonical form for cache keys: NFC with collapsed whitespace. Case is
+    kept, since it can change the translation ("Tell US", proper nouns).
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
@@ -4,15 +4,38 @@ Translates text between supported language pairs offline using CTranslate2.
 """
 
 import logging
-import argostranslate.package
-import argostranslate.translate
+import functools
+from concurrent.futures import Future
+
+from cache import ByteLRUCache
+from lazy_import import LazyModule
+from singleflight import SingleFlight
+from residency import disk_size
+from text_utils import split_sentences, join_sentences, normalize, Untranslated
 
 logger = logging.getLogger("voxbridge.translate")
 
+# Imported on first use, not at server start-up
+argostranslate = LazyModule("argostranslate", ("package", "translate"))
+ctranslate2 = LazyModule("ctranslate2")
+
 # Track which packages we've already installed
 _installed_pairs: set[tuple[str, str]] = set()
 _initialized = False
 
+# Pairs without a direct package, translated through PIVOT_LANGUAGE
+PIVOT_LANGUAGE = "en"
+_pivot_pairs: set[tuple[str, str]] = set()
+
+
+def _cache_entry_size(key: tuple[str, str, str], value: str) -> int:
+    # UTF-8 payload of both sides plus rough per-entry overhead
+    return len(key[2].encode()) + len(value.encode()) + 200
+
+
+# Sentence-level translation cache: (from, to, normalized sentence) -> text
+_cache = ByteLRUCache(8 * 1024 * 1024, ttl=24 * 3600, sizeof=_cache_entry_size)
+
 # Supported languages with their full names and Argos codes
 SUPPORTED_LANGUAGES = {
     "en": "English",
@@ -38,13 +61,26 @@ def _ensure_initialized():
         logger.info("Argos Translate index updated.")
 
 
+# Concurrent installs/loads of the same pair, and identical concurrent
+# translate() calls, run once and share the result
+_loads = SingleFlight("translate-load")
+_inflight = SingleFlight("translate")
+
+
 def _ensure_package_installed(from_lang: str, to_lang: str):
     """Download and install the translation package for a language pair if needed."""
     pair = (from_lang, to_lang)
     if pair in _installed_pairs:
         return
+    _loads.do(("install", *pair), _install_package, from_lang, to_lang)
+
 
-    _ensure_initialized()
+def _install_package(from_lang: str, to_lang: str):
+    pair = (from_lang, to_lang)
+    if pair in _installed_pairs:
+        return
+
+    _loads.do("index", _ensure_initialized)
 
     # Check if already installed
     installed = argostranslate.translate.get_installed_languages()
@@ -67,6 +103,11 @@ def _ensure_package_installed(from_lang: str, to_lang: str):
         None
     )
 
+    if pkg is None and "en" in pair:
+        # Nothing to pivot through; leave the pair uninstalled
+        logger.error(f"No translation package available for {from_lang}->{to_lang}.")
+        return
+
     if pkg is None:
         # Try via English as a pivot language
         logger.warning(
@@ -78,6 +119,7 @@ def _ensure_package_installed(from_lang: str, to_lang: str):
         if to_lang != "en":
             _ensure_package_installed("en", to_lang)
         _installed_pairs.add(pair)
+        _pivot_pairs.add(pair)
         return
 
     logger.info(f"Downloading translation package {from_lang}->{to_lang}...")
@@ -87,12 +129,250 @@ def _ensure_package_installed(from_lang: str, to_lang: str):
     logger.info(f"Translation package {from_lang}->{to_lang} installed.")
 
 
+# ---------------------------------------------------------------------------
+# Model registry
+# ---------------------------------------------------------------------------
+# With a registry set, request paths never install anything: missing pairs
+# are queued on the registry's background installer and translated once
+# ready. Without one (scripts, tests) packages are installed inline.
+_registry = None
+
+# Precomputed route per pair ("direct" or "pivot"), from the installed
+# packages and the manifest
+_routes: dict[tuple[str, str], str] = {}
+
+
+def set_registry(registry) -> None:
+    """Resolve packages through a ModelRegistry and build the routing table."""
+    global _registry
+    _registry = registry
+    if registry is not None:
+        registry.schedule("translate-scan", _scan_installed)
+
+
+def _scan_installed():
+    """Installer job: mark installed packages ready and build the routing table."""
+    installed = {
+        (p.from_code, p.to_code) for p in argostranslate.package.get_installed_packages()
+    }
+    _installed_pairs.update(installed)
+    for pair in installed:
+        _registry.mark_ready(("translate", *pair))
+
+    direct = installed | _registry.manifest_pairs()
+    routes = {}
+    for a in SUPPORTED_LANGUAGES:
+        for b in SUPPORTED_LANGUAGES:
+            if a == b:
+                continue
+            if (a, b) in direct:
+                routes[(a, b)] = "direct"
+            elif (a, PIVOT_LANGUAGE) in direct and (PIVOT_LANGUAGE, b) in direct:
+                routes[(a, b)] = "pivot"
+    _routes.update(routes)
+    logger.info(
+        f"Translation routes: {sum(r == 'direct' for r in routes.values())} direct, "
+        f"{sum(r == 'pivot' for r in routes.values())} via {PIVOT_LANGUAGE}."
+    )
+
+
+def _route(from_lang: str, to_lang: str) -> str:
+    pair = (from_lang, to_lang)
+    if PIVOT_LANGUAGE in pair:
+        return "direct"
+    return _routes.get(pair) or ("pivot" if pair in _pivot_pairs else "direct")
+
+
+def _legs(from_lang: str, to_lang: str) -> list[tuple[str, str]]:
+    if _route(from_lang, to_lang) == "pivot":
+        return [(from_lang, PIVOT_LANGUAGE), (PIVOT_LANGUAGE, to_lang)]
+    return [(from_lang, to_lang)]
+
+
+def _install_pair(from_lang: str, to_lang: str):
+    """Installer job: install a pair from the local store, else the Argos index."""
+    pair = (from_lang, to_lang)
+    entry = _registry.translation_entry(from_lang, to_lang)
+    if entry is not None and pair not in _installed_pairs:
+        (path,) = _registry.fetch(entry)
+        argostranslate.package.install_from_path(str(path))
+        _installed_pairs.add(pair)
+        logger.info(f"Translation package {from_lang}->{to_lang} installed from {path.name}.")
+    else:
+        _ensure_package_installed(from_lang, to_lang)
+        if pair not in _installed_pairs:
+            # Fail the registry job rather than report the pair ready
+            raise LookupError(f"No translation package available for {from_lang}->{to_lang}")
+        if pair in _pivot_pairs:
+            _routes[pair] = "pivot"
+
+    # Installing may have pulled in pivot legs too
+    for installed in list(_installed_pairs):
+        _registry.mark_ready(("translate", *installed))
+    _engines.pop(pair, None)
+
+
+def prepare_pair(from_lang: str, to_lang: str) -> list[Future]:
+    """
+    Queue background installs for any missing legs of a pair.
+
+    Returns their futures; an empty list means the pair is ready. Never
+    blocks. Without a registry the pair is installed inline instead.
+    """
+    if _registry is None:
+        _ensure_package_installed(from_lang, to_lang)
+        return []
+
+    jobs = []
+    for leg in _legs(from_lang, to_lang):
+        key = ("translate", *leg)
+        if _registry.is_ready(key):
+            continue
+        if leg in _installed_pairs:
+            _registry.mark_ready(key)
+            continue
+        jobs.append(_registry.schedule(key, functools.partial(_install_pair, *leg)))
+    return jobs
+
+
+# ---------------------------------------------------------------------------
+# CTranslate2 engine
+# ---------------------------------------------------------------------------
+# Argos's translate() resolves installed languages and builds translation
+# objects on every call. For pairs with an installed package we keep the
+# package's tokenizer and a CTranslate2 translator per pair instead, with
+# explicit decode and threading settings.
+ENGINE_ENABLED = True
+BEAM_SIZE = 2
+COMPUTE_TYPE = "int8"
+INTRA_THREADS = 2
+MAX_DECODING_LENGTH = 256
+
+_engines: dict[tuple[str, str], "TranslationEngine | None"] = {}
+
+# Optional ResidencyManager: loaded translators count against its memory
+# budget and idle ones are dropped from _engines under pressure.
+_residency = None
+
+
+def set_residency(manager) -> None:
+    """Account loaded translators to a ResidencyManager (None to keep them all)."""
+    global _residency
+    _residency = manager
+
+
+def residency_keys(from_lang: str, to_lang: str) -> list[tuple[str, str, str]]:
+    """Keys of the translators a pair uses (both legs when it pivots)."""
+    return [("translate", *leg) for leg in _legs(from_lang, to_lang)]
+
+
+class TranslationEngine:
+    """Tokenizer plus CTranslate2 translator for one installed Argos package."""
+
+    def __init__(self, package):
+        self.pair = (package.from_code, package.to_code)
+        self.tokenizer = package.tokenizer
+        self.target_prefix = getattr(package, "target_prefix", "") or ""
+        self.translator = ctranslate2.Translator(
+            str(package.package_path / "model"),
+            device="cpu",
+            compute_type=COMPUTE_TYPE,
+            inter_threads=1,
+            intra_threads=INTRA_THREADS,
+        )
+
+    def translate(self, sentences: list[str]) -> list[str]:
+        """Translate sentences in one batch."""
+        tokens = [self.tokenizer.encode(s) for s in sentences]
+        prefix = [[self.target_prefix]] * len(tokens) if self.target_prefix else None
+        results = self.translator.translate_batch(
+            tokens,
+            beam_size=BEAM_SIZE,
+            max_decoding_length=MAX_DECODING_LENGTH,
+            replace_unknowns=True,
+            target_prefix=prefix,
+        )
+        out = []
+        for result in results:
+            text = self.tokenizer.decode(result.hypotheses[0])
+            if self.target_prefix and text.startswith(self.target_prefix):
+                text = text[len(self.target_prefix):]
+            out.append(text.strip())
+        return out
+
+
+def configure_engine(
+    enabled: bool = True,
+    beam_size: int = BEAM_SIZE,
+    compute_type: str = COMPUTE_TYPE,
+    intra_threads: int = INTRA_THREADS,
+):
+    """Set engine options; translators already loaded are rebuilt on next use."""
+    global ENGINE_ENABLED, BEAM_SIZE, COMPUTE_TYPE, INTRA_THREADS
+    ENGINE_ENABLED = enabled
+    BEAM_SIZE = beam_size
+    COMPUTE_TYPE = compute_type
+    INTRA_THREADS = intra_threads
+    _engines.clear()
+
+
+def _get_engine(from_lang: str, to_lang: str) -> TranslationEngine | None:
+    """The pair's engine, loaded once; None if the pair has no direct package."""
+    if not ENGINE_ENABLED:
+        return None
+    pair = (from_lang, to_lang)
+    # A single lookup: the residency manager may evict the pair between a
+    # membership test and a read
+    try:
+        engine = _engines[pair]
+    except KeyError:
+        # One load per pair; different pairs load in parallel
+        return _loads.do(("engine", *pair), _load_engine, from_lang, to_lang)
+    if _residency is not None:
+        _residency.touch(("translate", *pair))
+    return engine
+
+
+def _load_engine(from_lang: str, to_lang: str) -> TranslationEngine | None:
+    pair = (from_lang, to_lang)
+    try:
+        return _engines[pair]
+    except KeyError:
+        pass
+
+    engine = None
+    package = next(
+        (p for p in argostranslate.package.get_installed_packages()
+         if p.from_code == from_lang and p.to_code == to_lang),
+        None,
+    )
+    if package is not None:
+        try:
+            engine = TranslationEngine(package)
+            logger.info(
+                f"CTranslate2 engine for {from_lang}->{to_lang} loaded "
+                f"(beam {BEAM_SIZE}, {COMPUTE_TYPE}, {INTRA_THREADS} threads)."
+            )
+        except Exception as e:
+            logger.error(f"Could not load engine for {from_lang}->{to_lang}: {e}")
+    _engines[pair] = engine
+    if engine is not None and _residency is not None:
+        _residency.register(
+            ("translate", *pair),
+            disk_size(package.package_path / "model"),
+            lambda: _engines.pop(pair, None),
+        )
+    return engine
+
+
 def translate(text: str, from_lang: str, to_lang: str) -> str:
     """
     Translate text from one language to another.
 
     Uses direct translation if available, otherwise falls back to
-    pivot translation through English.
+    pivot translation through English. Text is translated sentence by
+    sentence through the translation cache, so repeated phrases and
+    repeated sentences inside longer texts skip CTranslate2.
 
     Args:
         text: The text to translate
@@ -108,8 +388,80 @@ def translate(text: str, from_lang: str, to_lang: str) -> str:
     if from_lang == to_lang:
         return text
 
-    _ensure_package_installed(from_lang, to_lang)
+    return _inflight.do(
+        (from_lang, to_lang, text), lambda: translate_batch([text], from_lang, to_lang)[0]
+    )
+
+
+def translate_batch(texts: list[str], from_lang: str, to_lang: str) -> list[str]:
+    """
+    Translate several texts for one language pair in a single call.
+
+    Sentences are looked up in the cache first; the remaining ones are
+    de-duplicated across all texts and translated together, then each
+    text is reassembled from its sentences. Sentences that fail to
+    translate are kept in the original language. While the pair is still
+    installing every text comes back unchanged, as ``Untranslated``.
+    """
+    if from_lang == to_lang:
+        return list(texts)
+
+    split = [split_sentences(text) if text else [] for text in texts]
+    if not any(split):
+        return ["" for _ in texts]
+
+    if prepare_pair(from_lang, to_lang):
+        logger.warning(f"Translation {from_lang}->{to_lang} is still installing; passing text through.")
+        return [Untranslated(text) for text in texts]
+
+    # Resolve each distinct sentence once: cache first, then one batch
+    translated: dict[str, str] = {}
+    missing: dict[str, str] = {}  # normalized -> first original spelling
+    for sentences in split:
+        for sentence in sentences:
+            key = normalize(sentence)
+            if key in translated or key in missing:
+                continue
+            cached = _cache.get((from_lang, to_lang, key))
+            if cached is not None:
+                translated[key] = cached
+            else:
+                missing[key] = sentence
+
+    if missing:
+        results = _translate_sentences(list(missing.values()), from_lang, to_lang)
+        for (key, sentence), result in zip(missing.items(), results):
+            if result is None:
+                translated[key] = sentence  # Keep the original as last resort
+            else:
+                _cache.put((from_lang, to_lang, key), result)
+                translated[key] = result
+
+    return [
+        join_sentences([translated[normalize(s)] for s in sentences], to_lang)
+        for sentences in split
+    ]
+
 
+def _translate_sentences(sentences: list[str], from_lang: str, to_lang: str) -> list[str | None]:
+    """
+    Translate a batch of sentences; None marks a sentence that failed.
+
+    Pairs with an installed package go through their CTranslate2 engine in
+    one ``translate_batch`` call. Anything else (pivot-only pairs, engine
+    errors) falls back to Argos one sentence at a time.
+    """
+    engine = _get_engine(from_lang, to_lang)
+    if engine is not None:
+        try:
+            return engine.translate(sentences)
+        except Exception as e:
+            logger.error(f"CTranslate2 engine failed ({from_lang}->{to_lang}): {e}")
+    return [_translate_uncached(sentence, from_lang, to_lang) for sentence in sentences]
+
+
+def _translate_uncached(text: str, from_lang: str, to_lang: str) -> str | None:
+    """Run Argos on one sentence; None if direct and pivot both fail."""
     try:
         translated = argostranslate.translate.translate(text, from_lang, to_lang)
         logger.debug(f"Translated [{from_lang}->{to_lang}]")
@@ -124,7 +476,51 @@ def translate(text: str, from_lang: str, to_lang: str) -> str:
                 return result
             except Exception as e2:
                 logger.error(f"Pivot translation also failed: {e2}")
-        return text  # Return original text as last resort
+        return None
+
+
+def configure_cache(max_bytes: int, ttl: float | None):
+    """Resize the translation cache (drops its current contents)."""
+    global _cache
+    _cache = ByteLRUCache(max_bytes, ttl, sizeof=_cache_entry_size)
+
+
+def cache_stats() -> dict:
+    return _cache.stats()
+
+
+def plan_routes(from_lang: str, targets: list[str]) -> dict[str, list[str]]:
+    """
+    Work out the language path for translating into each target.
+
+    Returns ``{target: [from_lang, ..., target]}``: a direct hop where a
+    package exists, otherwise two hops through PIVOT_LANGUAGE. Callers that
+    translate one text into several targets can run each shared prefix
+    (usually from_lang -> en) once and fan out from its result.
+    """
+    routes = {}
+    for to_lang in targets:
+        if to_lang == from_lang or to_lang in routes:
+            continue
+        if _registry is None:
+            _ensure_package_installed(from_lang, to_lang)
+        if _route(from_lang, to_lang) == "pivot":
+            routes[to_lang] = [from_lang, PIVOT_LANGUAGE, to_lang]
+        else:
+            routes[to_lang] = [from_lang, to_lang]
+    return routes
+
+
+def warm_up(from_lang: str, to_lang: str) -> None:
+    """
+    Run one throwaway translation so the pair's CTranslate2 model is loaded
+    before the first real request. With a registry the pair must already be
+    installed (see ``prepare_pair``). Raises on failure.
+    """
+    if prepare_pair(from_lang, to_lang):
+        raise RuntimeError(f"Translation {from_lang}->{to_lang} is not installed yet")
+    if _translate_sentences(["Hello."], from_lang, to_lang)[0] is None:
+        raise RuntimeError(f"Translation {from_lang}->{to_lang} is not working")
 
 
 def get_supported_languages() -> dict[str, str]:
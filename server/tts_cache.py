@@ -0,0 +1,175 @@
+"""
+Two-tier cache for synthesized speech.
+A byte-bounded in-memory LRU in front of an optional content-addressed
+directory of WAV files. The disk tier survives restarts and can be shared
+by several server processes (writes are atomic renames), so a new or
+scaled-out worker starts with a warm cache.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+from cache import ByteLRUCache
+
+logger = logging.getLogger("voxbridge.tts.cache")
+
+# Once over budget the disk tier is trimmed to this share of it, so the
+# directory isn't rescanned on every new clip
+DISK_LOW_WATER = 0.9
+
+
+class SpeechCache:
+    """
+    WAV cache keyed by content: ``key(voice, text, speed, audio_format)``
+    hashes the voice model, text, speed and output format into a hex digest.
+
+    Lookups check memory first, then ``disk_dir``; disk hits are read in
+    full and promoted into memory. The disk tier is evicted least
+    recently used first (reads refresh a file's mtime) once it grows past
+    ``disk_max_bytes``, down to ``DISK_LOW_WATER`` of it. Without
+    ``disk_dir`` only the memory tier is used.
+    """
+
+    def __init__(self, memory_bytes: int, disk_dir: Path | None = None, disk_max_bytes: int = 0):
+        self.memory = ByteLRUCache(memory_bytes)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+
+        self._lock = threading.Lock()
+        self.disk_bytes = 0
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_evictions = 0
+        self._evicting = False
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            files = self._files()
+            self.disk_bytes = sum(size for _, size, _ in files)
+            logger.info(f"TTS disk cache {self.disk_dir}: {len(files)} clips, {self.disk_bytes} bytes.")
+
+    @staticmethod
+    def key(voice: str, text: str, speed: float, audio_format: str = "wav") -> str:
+        return hashlib.sha256(json.dumps([voice, text, speed, audio_format]).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.wav"
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached WAV, or None on a miss in both tiers."""
+        wav = self.memory.get(key)
+        if wav is not None or self.disk_dir is None:
+            return wav
+
+        path = self._path(key)
+        try:
+            wav = path.read_bytes()
+        except FileNotFoundError:
+            wav = b""
+        if not wav:
+            # Missing, or empty (a writer that never finished)
+            with self._lock:
+                self.disk_misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # Evicted since; the bytes we read are still good
+
+        with self._lock:
+            self.disk_hits += 1
+        self.memory.put(key, wav)
+        return wav
+
+    def put(self, key: str, wav: bytes):
+        self.memory.put(key, wav)
+        if self.disk_dir is None or len(wav) > self.disk_max_bytes:
+            return
+
+        path = self._path(key)
+        if path.exists():
+            return
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(wav)
+            tmp.replace(path)
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            logger.warning(f"Could not write TTS cache entry: {e}")
+            return
+
+        with self._lock:
+            self.disk_bytes += len(wav)
+            over = self.disk_bytes > self.disk_max_bytes and not self._evicting
+            if over:
+                self._evicting = True
+        if over:
+            self._evict()
+
+    def _files(self) -> list[tuple[float, int, Path]]:
+        files = []
+        for path in self.disk_dir.glob("*/*.wav"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another process
+            files.append((st.st_mtime, st.st_size, path))
+        return files
+
+    def _evict(self):
+        """Drop least recently used clips until the disk tier is at its low-water mark."""
+        with self._lock:
+            counted = self.disk_bytes
+        try:
+            # Other processes share the directory, so re-measure rather
+            # than trust our running total. The scan runs unlocked so disk
+            # reads aren't held up behind it.
+            files = sorted(self._files())
+            total = sum(size for _, size, _ in files)
+            target = int(self.disk_max_bytes * DISK_LOW_WATER)
+            evicted = 0
+            for _, size, path in files:
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted += 1
+            with self._lock:
+                # Keep clips written by this process during the scan
+                self.disk_bytes += total - counted
+                self.disk_evictions += evicted
+        finally:
+            with self._lock:
+                self._evicting = False
+
+    def clear(self):
+        """Empty both tiers."""
+        self.memory.clear()
+        if self.disk_dir is not None:
+            with self._lock:
+                for _, _, path in self._files():
+                    path.unlink(missing_ok=True)
+                self.disk_bytes = 0
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        with self._lock:
+            hits = memory["hits"] + self.disk_hits
+            lookups = memory["hits"] + memory["misses"]
+            return {
+                "memory": memory,
+                "disk": {
+                    "enabled": self.disk_dir is not None,
+                    "bytes": self.disk_bytes,
+                    "maxBytes": self.disk_max_bytes,
+                    "hits": self.disk_hits,
+                    "misses": self.disk_misses,
+                    "evictions": self.disk_evictions,
+                },
+                "hitRate": round(hits / lookups, 3) if lookups else 0.0,
+            }
@@ -9,7 +9,13 @@ import logging
 import subprocess
 import functools
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+from singleflight import SingleFlight
+from tts_cache import SpeechCache
+from audio_codec import encode as encode_audio, DEFAULT_FORMAT
+from residency import disk_size
+from text_utils import split_sentences
 
 logger = logging.getLogger("voxbridge.tts")
 
@@ -37,6 +43,33 @@ PIPER_DOWNLOAD_BASE = "https://huggingface.co/rhasspy/piper-voices/resolve/v1.0.
 # Cache for loaded voice synthesizers
 _synthesizers: dict[str, object] = {}
 
+# Synthesized clips, keyed by (voice model, text, speed, format).
+# Memory-only until configure_cache() adds the persistent disk tier.
+_cache = SpeechCache(32 * 1024 * 1024)
+
+# Concurrent downloads/loads of one voice, and identical concurrent
+# synthesis requests, run once and share the result
+_loads = SingleFlight("voice-load")
+_inflight = SingleFlight("tts")
+
+# With a model registry set, voices are installed by its background
+# installer and synthesis never waits on a download.
+_registry = None
+_voice_files: dict[str, tuple[Path, Path]] = {}  # lang -> (onnx, json)
+
+
+# Optional ResidencyManager: loaded voices count against its memory budget
+# and idle ones are dropped from _synthesizers under pressure.
+_residency = None
+
+# Optional AudioWorkerPool: synthesis runs in worker processes, each voice
+# on the workers that already have it loaded (see set_backend).
+_backend = None
+
+
+class VoiceNotReady(Exception):
+    """Raised when a voice is still being installed in the background."""
+
 
 def _get_voice_path(lang: str) -> tuple[Optional[Path], Optional[Path]]:
     """Get paths to .onnx and .onnx.json for a language's voice model."""
@@ -101,7 +134,7 @@ def _download_voice(lang: str) -> tuple[Path, Path]:
     return onnx_path, json_path
 
 
-def synthesize(text: str, lang: str, speed: float = 1.0) -> bytes:
+def synthesize(text: str, lang: str, speed: float = 1.0, audio_format: str = DEFAULT_FORMAT) -> bytes:
     """
     Synthesize speech from text using Piper TTS.
 
@@ -109,6 +142,7 @@ def synthesize(text: str, lang: str, speed: float = 1.0) -> bytes:
         text: The text to convert to speech
         lang: Target language code (e.g., 'en', 'es')
         speed: Speech speed multiplier (1.0 = normal)
+        audio_format: Output format from audio_codec.OUTPUT_FORMATS
 
     Returns:
         WAV audio bytes
@@ -117,36 +151,175 @@ def synthesize(text: str, lang: str, speed: float = 1.0) -> bytes:
         return _generate_silence(0.5)
 
     try:
-        return _inner_synthesize(text, lang, speed)
+        # Identical requests in flight share one synthesis; the speech
+        # cache covers repeats after it finishes
+        return _inflight.do(
+            (text, lang, speed, audio_format), _inner_synthesize, text, lang, speed, audio_format
+        )
     except Exception as e:
         logger.error(f"TTS synthesis failed: {e}")
         return _generate_silence(0.5)
 
 
-@functools.lru_cache(maxsize=128)
-def _inner_synthesize(text: str, lang: str, speed: float) -> bytes:
-    """Cached internal synthesis function."""
+def synthesize_stream(
+    text: str, lang: str, speed: float = 1.0, audio_format: str = DEFAULT_FORMAT
+) -> Iterator[tuple[str, bytes]]:
+    """
+    Synthesize text one sentence at a time.
+
+    Yields ``(sentence, wav_bytes)`` as each sentence is ready, so callers
+    can start playback after the first one. Each chunk is a complete WAV
+    file and goes through the same cache as ``synthesize``.
+    """
+    for sentence in split_sentences(text):
+        yield sentence, synthesize(sentence, lang, speed, audio_format)
+
+
+def set_backend(pool) -> None:
+    """Synthesize in a worker pool (None to synthesize in-process)."""
+    global _backend
+    _backend = pool
+
+
+def set_residency(manager) -> None:
+    """Account loaded voices to a ResidencyManager (None to keep them all)."""
+    global _residency
+    _residency = manager
+
+
+def residency_key(lang: str) -> tuple[str, str]:
+    """Key of the voice speaking ``lang`` in the ResidencyManager."""
+    return ("voice", _voice_name(lang))
+
+
+def init_worker(cache_bytes: int, voice_budget_bytes: int = 0) -> None:
+    """
+    Worker-process initializer: a private, memory-only clip cache and, with
+    a budget, LRU unloading of the voices this worker has loaded.
+    """
+    configure_cache(cache_bytes)
+    if voice_budget_bytes:
+        from residency import ResidencyManager
+        set_residency(ResidencyManager(voice_budget_bytes))
+
+
+def worker_synthesize(text: str, lang: str, speed: float, audio_format: str, voice_files=None) -> bytes:
+    """
+    Pool handler: synthesize in a worker process. ``voice_files`` is the
+    parent's resolved (onnx, json) pair when it installs voices through a
+    registry. Raises on failure, unlike ``synthesize``.
+    """
+    if voice_files is not None:
+        _voice_files[lang] = voice_files
+    return _inner_synthesize(text, lang, speed, audio_format)
+
+
+def _synthesize_remote(text: str, lang: str, speed: float, audio_format: str) -> bytes:
+    """Run a synthesis on the pool worker that has the voice loaded."""
+    voice_files = None
+    if _registry is not None:
+        if prepare_voice(lang) is not None:
+            raise VoiceNotReady(f"Voice for '{lang}' is still installing")
+        voice_files = _voice_files[lang]
+    return _backend.run(
+        None, text, lang, speed, audio_format, voice_files, affinity=_voice_name(lang)
+    )
+
+
+def set_registry(registry) -> None:
+    """Resolve voices through a ModelRegistry instead of downloading inline."""
+    global _registry
+    _registry = registry
+
+
+def _install_voice(lang: str):
+    """Installer job: fetch a voice from the local store/manifest, else upstream."""
+    entry = _registry.voice_entry(lang)
+    if entry is None:
+        _voice_files[lang] = _download_voice(lang)
+        return
+    paths = _registry.fetch(entry)
+    onnx_path = next(p for p in paths if p.suffix == ".onnx")
+    json_path = next(p for p in paths if p.name.endswith(".onnx.json"))
+    _voice_files[lang] = (onnx_path, json_path)
+
+
+def prepare_voice(lang: str):
+    """
+    Queue a background install of a language's voice if it isn't ready.
+
+    Returns the install future, or None when the voice is ready (or no
+    registry is set). Never blocks.
+    """
+    if _registry is None:
+        return None
+    key = ("voice", lang)
+    if _registry.is_ready(key):
+        return None
+    if _registry.voice_entry(lang) is None:
+        # Voices already on disk need no checksum pass
+        onnx_path, json_path = _get_voice_path(lang)[:2]
+        if onnx_path.exists() and json_path.exists():
+            _voice_files[lang] = (onnx_path, json_path)
+            _registry.mark_ready(key)
+            return None
+    return _registry.schedule(key, functools.partial(_install_voice, lang))
+
+
+def _get_voice(lang: str):
+    """
+    Return the loaded Piper voice for a language. Without a registry the
+    voice is downloaded inline if needed; with one, VoiceNotReady is raised
+    while it installs in the background.
+    """
+    if _registry is not None:
+        if prepare_voice(lang) is not None:
+            raise VoiceNotReady(f"Voice for '{lang}' is still installing")
+        return _load_voice(*_voice_files[lang])
+    if lang in _voice_files:
+        # Resolved by the parent process (see worker_synthesize)
+        return _load_voice(*_voice_files[lang])
+
     # Optimization: Check in-memory cache first to avoid file I/O and logging
     onnx_path_candidate = _get_voice_path(lang)[0]
     cache_key = str(onnx_path_candidate)
 
-    from piper import PiperVoice
+    if cache_key in _synthesizers:
+        return _synthesizers[cache_key]
+
+    # Not in memory, ensure it is downloaded/present
+    # If download fails, we let the exception propagate so it's not cached
+    onnx_path, json_path = _loads.do(("download", lang), _download_voice, lang)
+    return _load_voice(onnx_path, json_path)
+
 
+def _load_voice(onnx_path: Path, json_path: Path):
+    """Load a voice once, however many threads ask for it at the same time."""
+    cache_key = str(onnx_path)
     if cache_key in _synthesizers:
-        voice = _synthesizers[cache_key]
-    else:
-        # Not in memory, ensure it is downloaded/present
-        # If download fails, we let the exception propagate so it's not cached
-        onnx_path, json_path = _download_voice(lang)
-
-        # Load and cache
-        cache_key = str(onnx_path)
+        if _residency is not None:
+            _residency.touch(("voice", onnx_path.stem))
+        return _synthesizers[cache_key]
+
+    def load():
+        from piper import PiperVoice
+
         if cache_key not in _synthesizers:
             logger.info(f"Loading Piper voice: {onnx_path.name}")
-            _synthesizers[cache_key] = PiperVoice.load(str(onnx_path), str(json_path))
+            voice = _synthesizers[cache_key] = PiperVoice.load(str(onnx_path), str(json_path))
+            if _residency is not None:
+                _residency.register(
+                    ("voice", onnx_path.stem),
+                    disk_size(onnx_path),
+                    lambda: _synthesizers.pop(cache_key, None),
+                )
+            return voice
+        return _synthesizers[cache_key]
 
-        voice = _synthesizers[cache_key]
+    return _loads.do(("load", cache_key), load)
 
+
+def _synthesize_wav(voice, text: str, speed: float) -> bytes:
     # Synthesize to WAV in memory
     wav_buffer = io.BytesIO()
     with wave.open(wav_buffer, "wb") as wav_file:
@@ -154,12 +327,65 @@ def _inner_synthesize(text: str, lang: str, speed: float) -> bytes:
         wav_file.setsampwidth(2)
         wav_file.setframerate(voice.config.sample_rate)
         voice.synthesize(text, wav_file, length_scale=1.0 / speed)
+    return wav_buffer.getvalue()
+
+
+def _voice_name(lang: str) -> str:
+    """Model name of the voice that speaks ``lang``, for cache keys."""
+    if lang in _voice_files:
+        return _voice_files[lang][0].stem
+    return _get_voice_path(lang)[2]
 
-    wav_bytes = wav_buffer.getvalue()
-    logger.debug(f"Synthesized {len(wav_bytes)} bytes for lang={lang}")
+
+def _inner_synthesize(text: str, lang: str, speed: float, audio_format: str = DEFAULT_FORMAT) -> bytes:
+    """Cached internal synthesis function."""
+    key = SpeechCache.key(_voice_name(lang), text, speed, audio_format)
+    wav_bytes = _cache.get(key)
+    if wav_bytes is None:
+        if _backend is not None:
+            wav_bytes = _synthesize_remote(text, lang, speed, audio_format)
+        elif audio_format == DEFAULT_FORMAT:
+            wav_bytes = _synthesize_wav(_get_voice(lang), text, speed)
+            logger.debug(f"Synthesized {len(wav_bytes)} bytes for lang={lang}")
+        else:
+            # Every format is encoded from the one cached native clip
+            native = _inflight.do(
+                (text, lang, speed, DEFAULT_FORMAT), _inner_synthesize, text, lang, speed
+            )
+            wav_bytes = encode_audio(native, audio_format)
+        _cache.put(key, wav_bytes)
     return wav_bytes
 
 
+# Reset hook, as on an lru_cache-wrapped function
+_inner_synthesize.cache_clear = lambda: _cache.clear()
+
+
+def configure_cache(memory_bytes: int, disk_dir: Optional[Path] = None, disk_max_bytes: int = 0):
+    """
+    Size the speech cache. With ``disk_dir`` clips are also stored there,
+    content-addressed, and survive restarts. Drops the memory tier.
+    """
+    global _cache
+    _cache = SpeechCache(memory_bytes, disk_dir, disk_max_bytes)
+
+
+def cache_stats() -> dict:
+    return _cache.stats()
+
+
+def warm_up(lang: str) -> None:
+    """
+    Load a language's voice and synthesize one throwaway phrase so the
+    ONNX session is initialized before the first real request. Raises on
+    failure. With a worker pool, the voice is warmed on one worker.
+    """
+    if _backend is not None:
+        _synthesize_remote("Hello.", lang, 1.0, DEFAULT_FORMAT)
+        return
+    _synthesize_wav(_get_voice(lang), "Hello.", 1.0)
+
+
 def _generate_silence(duration_seconds: float, sample_rate: int = 22050) -> bytes:
     """Generate silent WAV audio of the specified duration."""
     import numpy as np
@@ -0,0 +1,100 @@
+"""
+Lightweight voice-activity gate.
+Runs on decoded 16 kHz audio before it reaches the STT executor: frame
+energies are computed in one vectorized pass and compared against a
+per-speaker adaptive noise floor. Chunks without enough speech are dropped
+and the rest are trimmed to the speech region. Streaming sessions ask the
+same gate which of their small frames are speech.
+"""
+
+import logging
+from collections import deque
+import numpy as np
+
+logger = logging.getLogger("voxbridge.vad")
+
+# Running totals across all speakers, reported by /api/metrics
+totals = {"chunks": 0, "dropped": 0, "trimmedSeconds": 0.0}
+
+
+class VoiceActivityGate:
+    """
+    Energy-based VAD with an adaptive noise floor, one instance per speaker.
+
+    A frame counts as speech when its energy is ``threshold_db`` above the
+    speaker's noise floor (and above an absolute minimum). The floor follows
+    the quietest frames of each chunk, dropping quickly and rising slowly,
+    so steady background noise (fans, hum) is learned and ignored while
+    pauses in speech keep it from creeping up.
+
+    Streamed audio arrives in frames too short to learn from on their own,
+    so ``stream_speech`` judges them against the quietest tenth of the last
+    ``window_ms`` of the stream instead, and reports no speech until half
+    a second has been heard.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 20,
+        threshold_db: float = 9.0,
+        min_speech_ms: int = 200,
+        pad_ms: int = 200,
+        min_speech_rms: float = 0.005,
+        initial_floor_rms: float = 0.001,
+        window_ms: int = 2000,
+    ):
+        self.sample_rate = sample_rate
+        self.frame = sample_rate * frame_ms // 1000
+        self.ratio = 10 ** (threshold_db / 10)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.pad = sample_rate * pad_ms // 1000
+        self.min_speech_energy = min_speech_rms ** 2
+        self.noise_floor = initial_floor_rms ** 2  # mean-square energy
+        self._recent: deque[float] = deque(maxlen=max(1, window_ms // frame_ms))
+
+    def _update_floor(self, quiet: float):
+        rate = 0.5 if quiet < self.noise_floor else 0.05
+        self.noise_floor += rate * (quiet - self.noise_floor)
+
+    def _energies(self, audio: np.ndarray) -> np.ndarray:
+        """Mean-square energy of each whole frame."""
+        n_frames = len(audio) // self.frame
+        frames = audio[:n_frames * self.frame].reshape(n_frames, self.frame)
+        return np.einsum("ij,ij->i", frames, frames) / self.frame
+
+    def stream_speech(self, audio: np.ndarray) -> int:
+        """Number of speech frames in the next piece of a stream."""
+        energy = self._energies(audio)
+        if len(energy) == 0:
+            return 0
+        self._recent.extend(energy.tolist())
+        if len(self._recent) < self._recent.maxlen // 4:
+            return 0  # Still learning the background
+
+        quiet = float(np.percentile(self._recent, 10))
+        threshold = max(quiet * self.ratio, self.min_speech_energy)
+        return int(np.count_nonzero(energy > threshold))
+
+    def process(self, audio: np.ndarray) -> np.ndarray | None:
+        """Return the speech region of a chunk, or None if it has no speech."""
+        totals["chunks"] += 1
+        energy = self._energies(audio)
+        if len(energy) == 0:
+            totals["dropped"] += 1
+            return None
+
+        threshold = max(self.noise_floor * self.ratio, self.min_speech_energy)
+        speech = np.flatnonzero(energy > threshold)
+
+        # Learn the background from the quietest tenth of the chunk
+        self._update_floor(float(np.percentile(energy, 10)))
+
+        if len(speech) < self.min_speech_frames:
+            totals["dropped"] += 1
+            return None
+
+        start = max(0, speech[0] * self.frame - self.pad)
+        end = min(len(audio), (speech[-1] + 1) * self.frame + self.pad)
+        totals["trimmedSeconds"] += (len(audio) - (end - start)) / self.sample_rate
+        return audio[start:end]
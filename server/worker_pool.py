@@ -0,0 +1,350 @@
+"""
+Multi-process worker pool for audio inference.
+Each worker is a separate process with its own copy of the model, so
+inference isn't limited to one interpreter. Audio is handed over through
+shared memory instead of being pickled, and each job goes to the worker
+with the fewest jobs outstanding, or, for jobs with an affinity key (such
+as a voice), to a worker that has already served that key.
+"""
+
+import time
+import queue
+import logging
+import importlib
+import threading
+import itertools
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+import numpy as np
+
+logger = logging.getLogger("voxbridge.worker_pool")
+
+# Seconds between liveness checks of the worker processes
+HEALTH_CHECK_INTERVAL = 0.5
+
+# A worker that dies is restarted at once the first time; if it keeps dying
+# before answering a job, each restart waits twice as long as the last (up
+# to RESTART_BACKOFF_MAX seconds), and after MAX_WORKER_RESTARTS in a row
+# the slot is left empty.
+RESTART_BACKOFF = 1.0
+RESTART_BACKOFF_MAX = 30.0
+MAX_WORKER_RESTARTS = 5
+
+
+class WorkerCrashed(Exception):
+    """Raised for jobs that were running on a worker process that died."""
+
+
+def _resolve(path: str):
+    """Import a ``module:function`` reference."""
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _worker_main(index, tasks, results, handler, initializer, init_args):
+    """Worker process loop: attach each job's audio, run the handler, reply."""
+    if initializer:
+        _resolve(initializer)(*init_args)
+    fn = _resolve(handler)
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        task_id, shm_name, layout, args = task
+
+        if shm_name is None:
+            try:
+                reply = (task_id, True, fn(*args))
+            except Exception as e:
+                reply = (task_id, False, f"{type(e).__name__}: {e}")
+            results.put(reply)
+            continue
+
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            total = sum(n for _, n, _ in layout)
+            samples = np.ndarray((total,), dtype=np.float32, buffer=shm.buf)
+            items = [(samples[off:off + n], extra) for off, n, extra in layout]
+            try:
+                reply = (task_id, True, fn(items, *args))
+            except Exception as e:
+                reply = (task_id, False, f"{type(e).__name__}: {e}")
+            del items, samples
+        finally:
+            shm.close()
+        results.put(reply)
+
+
+class AudioWorkerPool:
+    """
+    Pool of worker processes running ``handler`` on batches of audio.
+
+    ``handler`` and ``initializer`` are ``module:function`` references
+    resolved inside each worker, so they must be importable there. The
+    initializer runs once per worker (e.g. to load models); the handler is
+    called as ``handler(items, *args)`` where ``items`` is a list of
+    ``(float32 audio, extra)`` pairs, and must return something picklable.
+    Jobs submitted with ``items=None`` carry no audio and call
+    ``handler(*args)``.
+
+    Jobs with an ``affinity`` key prefer workers that have run that key
+    before (and so have its model loaded). Once those all have
+    ``spread_depth`` jobs outstanding the job goes to the least-loaded
+    worker instead, and if every worker is that busy the pool grows, up to
+    ``max_workers``.
+
+    ``submit`` returns a concurrent Future; ``run`` blocks for the result
+    (at most ``job_timeout`` seconds), so it can be called from an executor
+    thread in place of a local call; a job that times out takes its worker
+    down with it. Workers that die are replaced (with backoff, see
+    MAX_WORKER_RESTARTS) and their jobs fail with WorkerCrashed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        handler: str,
+        initializer: str | None = None,
+        init_args: tuple = (),
+        max_workers: int | None = None,
+        spread_depth: int = 2,
+        job_timeout: float | None = 120.0,
+    ):
+        self.name = name
+        self.handler = handler
+        self.initializer = initializer
+        self.init_args = init_args
+        self.max_workers = max(workers, max_workers or workers, 1)
+        self.spread_depth = spread_depth
+        self.job_timeout = job_timeout
+
+        self._ctx = mp.get_context("spawn")
+        self._results = self._ctx.Queue()
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._jobs: dict[int, tuple[Future, int, shared_memory.SharedMemory]] = {}
+        self._closed = False
+
+        self._workers = [self._spawn(i) for i in range(max(1, workers))]
+        self._reader = threading.Thread(
+            target=self._read_results, name=f"pool-{name}-results", daemon=True
+        )
+        self._reader.start()
+
+    def _spawn(self, index: int, restarts: int = 0) -> dict:
+        tasks = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(index, tasks, self._results, self.handler, self.initializer, self.init_args),
+            name=f"{self.name}-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        logger.info(f"Started {self.name} worker {index} (pid {process.pid})")
+        return {
+            "process": process, "tasks": tasks, "outstanding": set(), "completed": 0,
+            "affinity": set(), "restarts": restarts, "down": False, "retry_at": 0.0,
+        }
+
+    def _pick(self, affinity) -> int:
+        """Index of the worker for the next job. Caller holds the lock."""
+        def load(i):
+            return len(self._workers[i]["outstanding"])
+
+        everyone = [i for i, w in enumerate(self._workers) if not w["down"]]
+        if not everyone:
+            raise WorkerCrashed(f"No {self.name} workers running")
+        if affinity is None:
+            return min(everyone, key=load)
+
+        holders = [i for i in everyone if affinity in self._workers[i]["affinity"]]
+        if holders and load(best := min(holders, key=load)) < self.spread_depth:
+            return best
+        if len(self._workers) < self.max_workers and all(load(i) >= self.spread_depth for i in everyone):
+            # In heavy demand and every worker is busy: add one
+            self._workers.append(self._spawn(len(self._workers)))
+            return len(self._workers) - 1
+        # Least loaded, preferring workers that already have the key, then
+        # those holding the fewest other keys
+        return min(everyone, key=lambda i: (load(i), i not in holders, len(self._workers[i]["affinity"])))
+
+    def submit(self, items: list[tuple[np.ndarray, object]] | None, *args, affinity=None) -> Future:
+        """Send a batch of ``(audio, extra)`` items (or None) to a worker."""
+        return self._submit(items, args, affinity)[1]
+
+    def _submit(self, items, args, affinity) -> tuple[int, Future]:
+        shm, layout = None, None
+        if items is not None:
+            arrays = [np.ascontiguousarray(audio, dtype=np.float32) for audio, _ in items]
+            total = sum(len(a) for a in arrays)
+
+            shm = shared_memory.SharedMemory(create=True, size=max(1, total * 4))
+            samples = np.ndarray((total,), dtype=np.float32, buffer=shm.buf)
+            layout, offset = [], 0
+            for audio, (_, extra) in zip(arrays, items):
+                samples[offset:offset + len(audio)] = audio
+                layout.append((offset, len(audio), extra))
+                offset += len(audio)
+            del samples
+
+        future: Future = Future()
+        with self._lock:
+            # Never hand a job to a worker that has already died
+            failed = self._reap_dead_workers()
+            try:
+                if self._closed:
+                    raise RuntimeError(f"Worker pool '{self.name}' is shut down")
+                index = self._pick(affinity)
+            except Exception:
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+                self._fail_crashed(failed)
+                raise
+            task_id = next(self._ids)
+            worker = self._workers[index]
+            worker["outstanding"].add(task_id)
+            if affinity is not None:
+                worker["affinity"].add(affinity)
+            self._jobs[task_id] = (future, index, shm)
+            worker["tasks"].put((task_id, shm.name if shm is not None else None, layout, args))
+        self._fail_crashed(failed)
+        return task_id, future
+
+    def run(self, items: list[tuple[np.ndarray, object]] | None, *args, affinity=None):
+        """Blocking ``submit``; raises WorkerCrashed after ``job_timeout``."""
+        task_id, future = self._submit(items, args, affinity)
+        try:
+            return future.result(timeout=self.job_timeout)
+        except FutureTimeout:
+            pass
+
+        # Release the job's shared memory, and stop the worker: it is stuck
+        # (or far behind), and the reaper will start a fresh one
+        with self._lock:
+            job = self._jobs.get(task_id)
+            process = self._workers[job[1]]["process"] if job is not None else None
+            self._finish(task_id)
+        if process is not None:
+            logger.error(f"{self.name} job timed out; stopping worker (pid {process.pid})")
+            process.terminate()
+            process.join(HEALTH_CHECK_INTERVAL)
+            self._replace_dead_workers()
+        raise WorkerCrashed(f"{self.name} job timed out after {self.job_timeout}s")
+
+    def _finish(self, task_id: int) -> Future | None:
+        job = self._jobs.pop(task_id, None)
+        if job is None:
+            return None
+        future, index, shm = job
+        worker = self._workers[index]
+        worker["outstanding"].discard(task_id)
+        worker["completed"] += 1
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+        return future
+
+    def _read_results(self):
+        next_check = time.monotonic() + HEALTH_CHECK_INTERVAL
+        while True:
+            # Checked on a timer, not only when idle: under steady traffic
+            # from other workers the queue is never empty.
+            if time.monotonic() >= next_check:
+                if self._closed:
+                    return
+                self._replace_dead_workers()
+                next_check = time.monotonic() + HEALTH_CHECK_INTERVAL
+            try:
+                task_id, ok, payload = self._results.get(timeout=HEALTH_CHECK_INTERVAL)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                return
+
+            with self._lock:
+                job = self._jobs.get(task_id)
+                if job is not None:
+                    # It answered, so it is not crash-looping
+                    self._workers[job[1]]["restarts"] = 0
+                future = self._finish(task_id)
+            if future is None:
+                continue
+            if ok:
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(payload))
+
+    def _reap_dead_workers(self) -> list[Future]:
+        """Restart dead workers; returns their jobs' futures. Caller holds the lock."""
+        failed = []
+        if self._closed:
+            return failed
+        now = time.monotonic()
+        for index, worker in enumerate(self._workers):
+            restarts = worker["restarts"]
+            if not worker["down"]:
+                if worker["process"].is_alive():
+                    continue
+                failed.extend(self._finish(t) for t in list(worker["outstanding"]))
+                worker["down"] = True
+                code = worker["process"].exitcode
+                if restarts >= MAX_WORKER_RESTARTS:
+                    logger.error(
+                        f"{self.name} worker {index} exited (code {code}) after "
+                        f"{restarts} restarts in a row; not restarting it again"
+                    )
+                    continue
+                delay = min(RESTART_BACKOFF * 2 ** (restarts - 1), RESTART_BACKOFF_MAX) if restarts else 0.0
+                worker["retry_at"] = now + delay
+                logger.error(f"{self.name} worker {index} exited (code {code}); restarting in {delay:.1f}s")
+            if restarts < MAX_WORKER_RESTARTS and now >= worker["retry_at"]:
+                self._workers[index] = self._spawn(index, restarts + 1)
+        return failed
+
+    def _fail_crashed(self, failed: list[Future]):
+        for future in failed:
+            if future is not None:
+                future.set_exception(WorkerCrashed(f"{self.name} worker died"))
+
+    def _replace_dead_workers(self):
+        with self._lock:
+            failed = self._reap_dead_workers()
+        self._fail_crashed(failed)
+
+    def stats(self) -> dict:
+        """Per-worker load for /api/metrics."""
+        with self._lock:
+            return {
+                "workers": [
+                    {
+                        "pid": w["process"].pid,
+                        "outstanding": len(w["outstanding"]),
+                        "completed": w["completed"],
+                        "affinity": sorted(map(str, w["affinity"])),
+                        "restarts": w["restarts"],
+                        "running": not w["down"],
+                    }
+                    for w in self._workers
+                ],
+            }
+
+    def shutdown(self, timeout: float = 5.0):
+        """Stop the workers, failing any jobs still outstanding."""
+        with self._lock:
+            self._closed = True
+            for worker in self._workers:
+                worker["tasks"].put(None)
+        for worker in self._workers:
+            worker["process"].join(timeout)
+            if worker["process"].is_alive():
+                worker["process"].terminate()
+
+        with self._lock:
+            pending = [self._finish(t) for t in list(self._jobs)]
+        for future in pending:
+            if future is not None:
+                future.set_exception(WorkerCrashed(f"{self.name} pool shut down"))
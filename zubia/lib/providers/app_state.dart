@@ -16,6 +16,9 @@ class FeedEntry {
   final String? fromLanguage;
   final String? toLanguage;
   final String? systemText;
+  final String? messageId;
+  final bool textOnly; // delivered without audio; playable on request
+  final bool pending; // translation not available yet; text is the original
   final DateTime timestamp;
 
   FeedEntry({
@@ -26,6 +29,9 @@ class FeedEntry {
     this.fromLanguage,
     this.toLanguage,
     this.systemText,
+    this.messageId,
+    this.textOnly = false,
+    this.pending = false,
   }) : timestamp = DateTime.now();
 }
 
@@ -160,6 +166,7 @@ class AppState extends ChangeNotifier {
   bool isRecording = false;
   String mode = 'realtime'; // realtime or walkie
   double volume = 1.0;
+  String partialText = ''; // live caption while someone is speaking
   List<FeedEntry> feed = [];
   List<SavedPhrase> savedPhrases = [];
   List<TranslationHistory> history = [];
@@ -432,7 +439,7 @@ class AppState extends ChangeNotifier {
     connectionStatus = 'connecting';
     notifyListeners();
 
-    ws.connect(tid, userId!);
+    ws.connect(tid, userId!, streaming: true, audioFormat: 'pcm16');
 
     _wsSub?.cancel();
     _wsSub = ws.messages.listen(_handleMessage);
@@ -446,6 +453,7 @@ class AppState extends ChangeNotifier {
     otherUserName = null;
     users = [];
     feed = [];
+    partialText = '';
     connectionStatus = 'disconnected';
     notifyListeners();
   }
@@ -463,8 +471,8 @@ class AppState extends ChangeNotifier {
   // ── Recording ────────────────────────────────────────
 
   Future<void> startRealtimeRecording() async {
-    final ok = await recorder.startRealtime((wavBytes) async {
-      ws.sendAudio(wavBytes);
+    final ok = await recorder.startStreaming((pcmFrame) {
+      ws.sendAudio(pcmFrame);
     });
     if (ok) {
       isRecording = true;
@@ -489,7 +497,7 @@ class AppState extends ChangeNotifier {
     notifyListeners();
 
     if (bytes != null && bytes.isNotEmpty) {
-      ws.sendAudio(bytes);
+      ws.sendRecording(bytes);
     }
 
     Future.delayed(const Duration(seconds: 3), () {
@@ -501,12 +509,25 @@ class AppState extends ChangeNotifier {
   }
 
   Future<void> stopRecording() async {
+    final wasStreaming = isRecording && mode == 'realtime';
     await recorder.stop();
+    if (wasStreaming) {
+      // Let the server finalize the utterance that was in progress
+      ws.sendControl({'type': 'end_stream'});
+    }
     isRecording = false;
     connectionStatus = ws.isConnected ? 'connected' : 'disconnected';
     notifyListeners();
   }
 
+  /// Fetch the speech for a text-only feed entry (text-only delivery, or
+  /// text-first while the server's TTS is backlogged).
+  void requestAudio(FeedEntry entry) {
+    if (entry.messageId != null) {
+      ws.requestAudio(entry.messageId!);
+    }
+  }
+
   // ── Message Handling ─────────────────────────────────
 
   void _handleMessage(ServerMessage msg) {
@@ -553,7 +574,28 @@ class AppState extends ChangeNotifier {
         );
         break;
 
+      case 'partial_transcription':
+        partialText = msg.data['text'] as String? ?? '';
+        break;
+
+      case 'final_transcription':
+        partialText = '';
+        if (msg.data['userId'] == userId) {
+          feed.add(
+            FeedEntry(
+              type: 'transcription',
+              fromUser: userName,
+              originalText: msg.data['text'] as String?,
+              fromLanguage: msg.data['language'] as String?,
+            ),
+          );
+        }
+        break;
+
       case 'translated_audio_meta':
+      case 'translated_text':
+        // Audio fetched later for a message already in the feed
+        if (msg.data['requested'] == true) break;
         feed.add(
           FeedEntry(
             type: 'translation',
@@ -562,10 +604,14 @@ class AppState extends ChangeNotifier {
             translatedText: msg.data['translatedText'] as String?,
             fromLanguage: msg.data['fromLanguage'] as String?,
             toLanguage: msg.data['toLanguage'] as String?,
+            messageId: msg.data['messageId'] as String?,
+            textOnly: msg.type == 'translated_text',
+            pending: msg.data['pending'] == true,
           ),
         );
         // Add to persistent history (fire and forget)
-        if (msg.data['originalText'] != null &&
+        if (msg.data['pending'] != true &&
+            msg.data['originalText'] != null &&
             msg.data['translatedText'] != null) {
           addToHistory(
             originalText: msg.data['originalText'] as String,
@@ -109,6 +109,26 @@ class _ChatScreenState extends State<ChatScreen> {
                   ),
                 ),
 
+                // ── Live Caption ──
+                if (state.partialText.isNotEmpty)
+                  Padding(
+                    padding: const EdgeInsets.symmetric(
+                      horizontal: 24,
+                      vertical: 4,
+                    ),
+                    child: Text(
+                      state.partialText,
+                      maxLines: 2,
+                      overflow: TextOverflow.ellipsis,
+                      textAlign: TextAlign.center,
+                      style: const TextStyle(
+                        color: ZubiaColors.textMuted,
+                        fontSize: 13,
+                        fontStyle: FontStyle.italic,
+                      ),
+                    ),
+                  ),
+
                 // ── Controls ──
                 _ControlsBar(state: state),
               ],
@@ -128,12 +148,18 @@ class _FeedItem extends StatelessWidget {
   const _FeedItem({required this.entry, required this.state});
 
   bool get _canSave {
-    return (entry.originalText?.trim().isNotEmpty ?? false) &&
+    return !entry.pending &&
+        (entry.originalText?.trim().isNotEmpty ?? false) &&
         (entry.translatedText?.trim().isNotEmpty ?? false) &&
         (entry.fromLanguage?.trim().isNotEmpty ?? false) &&
         (entry.toLanguage?.trim().isNotEmpty ?? false);
   }
 
+  /// Text-only messages from others can have their speech fetched, once
+  /// they are translated.
+  bool _canPlay(bool isMe) =>
+      !isMe && entry.textOnly && !entry.pending && entry.messageId != null;
+
   Future<void> _toggleSave(BuildContext context) async {
     if (!_canSave) return;
 
@@ -282,7 +308,15 @@ class _FeedItem extends StatelessWidget {
                     ),
                     const SizedBox(height: 4),
                   ],
-                  if (entry.translatedText != null && !isMe)
+                  if (entry.pending && !isMe)
+                    Text(
+                      'Translation pending',
+                      style: TextStyle(
+                        color: ZubiaColors.textSecondary,
+                        fontSize: 13,
+                      ),
+                    )
+                  else if (entry.translatedText != null && !isMe)
                     Text(
                       entry.translatedText!,
                       style: const TextStyle(fontSize: 15),
@@ -297,23 +331,49 @@ class _FeedItem extends StatelessWidget {
                       entry.translatedText!,
                       style: const TextStyle(fontSize: 15),
                     ),
-                  if (_canSave) ...[
+                  if (_canSave || _canPlay(isMe)) ...[
                     const SizedBox(height: 6),
                     Align(
                       alignment: Alignment.centerRight,
-                      child: IconButton(
-                        onPressed: () => _toggleSave(context),
-                        padding: EdgeInsets.zero,
-                        constraints: const BoxConstraints(
-                          minWidth: 24,
-                          minHeight: 24,
-                        ),
-                        icon: Icon(
-                          isSaved ? Icons.bookmark : Icons.bookmark_border,
-                          size: 18,
-                          color: ZubiaColors.magenta,
-                        ),
-                        tooltip: isSaved ? 'Remove saved' : 'Save phrase',
+                      child: Row(
+                        mainAxisSize: MainAxisSize.min,
+                        children: [
+                          if (_canPlay(isMe))
+                            IconButton(
+                              onPressed: () {
+                                HapticFeedback.selectionClick();
+                                state.requestAudio(entry);
+                              },
+                              padding: EdgeInsets.zero,
+                              constraints: const BoxConstraints(
+                                minWidth: 24,
+                                minHeight: 24,
+                              ),
+                              icon: const Icon(
+                                Icons.play_arrow_rounded,
+                                size: 20,
+                                color: ZubiaColors.magenta,
+                              ),
+                              tooltip: 'Play audio',
+                            ),
+                          if (_canSave)
+                            IconButton(
+                              onPressed: () => _toggleSave(context),
+                              padding: EdgeInsets.zero,
+                              constraints: const BoxConstraints(
+                                minWidth: 24,
+                                minHeight: 24,
+                              ),
+                              icon: Icon(
+                                isSaved
+                                    ? Icons.bookmark
+                                    : Icons.bookmark_border,
+                                size: 18,
+                                color: ZubiaColors.magenta,
+                              ),
+                              tooltip: isSaved ? 'Remove saved' : 'Save phrase',
+                            ),
+                        ],
                       ),
                     ),
                   ],
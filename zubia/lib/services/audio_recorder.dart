@@ -8,15 +8,16 @@ import 'package:path_provider/path_provider.dart';
 class AudioRecorderService {
   final AudioRecorder _recorder = AudioRecorder();
   Timer? _chunkTimer;
+  StreamSubscription<Uint8List>? _streamSub;
   bool _isRecording = false;
   String? _currentPath;
 
   bool get isRecording => _isRecording;
 
   /// Start recording in real-time mode (4-second chunks).
-  /// Calls [onChunk] with WAV bytes every 4 seconds.
+  /// Calls [onChunk] with raw 16 kHz mono PCM16 bytes every 4 seconds.
   Future<bool> startRealtime(
-    Future<void> Function(Uint8List wavBytes) onChunk,
+    Future<void> Function(Uint8List pcmBytes) onChunk,
   ) async {
     if (!await _recorder.hasPermission()) return false;
 
@@ -37,6 +38,23 @@ class AudioRecorderService {
     return true;
   }
 
+  /// Start recording in streaming mode.
+  /// Calls [onFrame] with raw 16 kHz mono PCM16 frames as they are captured.
+  Future<bool> startStreaming(void Function(Uint8List pcmFrame) onFrame) async {
+    if (!await _recorder.hasPermission()) return false;
+
+    _isRecording = true;
+    final stream = await _recorder.startStream(
+      const RecordConfig(
+        encoder: AudioEncoder.pcm16bits,
+        sampleRate: 16000,
+        numChannels: 1,
+      ),
+    );
+    _streamSub = stream.listen(onFrame);
+    return true;
+  }
+
   /// Start recording in walkie-talkie mode (single continuous recording).
   Future<bool> startWalkie() async {
     if (!await _recorder.hasPermission()) return false;
@@ -45,7 +63,7 @@ class AudioRecorderService {
     return true;
   }
 
-  /// Stop walkie-talkie recording and return the WAV bytes.
+  /// Stop walkie-talkie recording and return the raw PCM16 bytes.
   Future<Uint8List?> stopWalkie() async {
     _isRecording = false;
     return await _stopAndGetBytes();
@@ -56,6 +74,8 @@ class AudioRecorderService {
     _isRecording = false;
     _chunkTimer?.cancel();
     _chunkTimer = null;
+    await _streamSub?.cancel();
+    _streamSub = null;
     try {
       if (await _recorder.isRecording()) {
         await _recorder.stop();
@@ -67,14 +87,15 @@ class AudioRecorderService {
   Future<void> _startRecording() async {
     final dir = await getTemporaryDirectory();
     _currentPath =
-        '${dir.path}/zubia_rec_${DateTime.now().millisecondsSinceEpoch}.wav';
+        '${dir.path}/zubia_rec_${DateTime.now().millisecondsSinceEpoch}.pcm';
 
+    // Raw PCM16 at Whisper's native rate: the server converts it without
+    // parsing a header or resampling.
     await _recorder.start(
       const RecordConfig(
-        encoder: AudioEncoder.wav,
+        encoder: AudioEncoder.pcm16bits,
         sampleRate: 16000,
         numChannels: 1,
-        bitRate: 256000,
       ),
       path: _currentPath!,
     );
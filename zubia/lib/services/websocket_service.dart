@@ -1,4 +1,5 @@
 import 'dart:async';
+import 'dart:collection';
 import 'dart:convert';
 import 'dart:typed_data';
 import 'package:web_socket_channel/web_socket_channel.dart';
@@ -23,18 +24,54 @@ class WebSocketService {
   Map<String, dynamic>? _pendingAudioMeta;
   bool _connected = false;
 
+  /// Received speech by the server's audioHash, least recently used first.
+  /// The server skips the binary frame for clips we hold and sends the
+  /// message with `cached: true` instead.
+  static const int audioCacheEntries = 64;
+  final _audioCache = LinkedHashMap<String, Uint8List>();
+
+  /// Streamed messages with sentences re-requested after a cache miss:
+  /// how many are still missing, and the later sentences held back so
+  /// playback stays in order.
+  final _missingChunks = <String, int>{};
+  final _heldChunks = <String, List<ServerMessage>>{};
+
   WebSocketService({required this.baseUrl, WebSocketConnect? connect})
     : _connect = connect ?? ((uri) => WebSocketChannel.connect(uri));
 
   Stream<ServerMessage> get messages => _messageController.stream;
   bool get isConnected => _connected;
 
-  void connect(String threadId, String userId) {
+  /// Connect to a thread. With [streaming], binary audio is sent as small
+  /// raw PCM16 frames and the server pushes partial transcriptions.
+  /// [audioFormat] declares the format of complete chunks ('wav' or 'pcm16').
+  /// [outputFormats] lists the speech formats we can play, most preferred
+  /// first; the server picks one and reports it in the 'joined' message.
+  /// [delivery] is 'audio', or 'text' / 'on_demand' to receive translated
+  /// text only and fetch audio with [requestAudio].
+  void connect(
+    String threadId,
+    String userId, {
+    bool streaming = false,
+    String audioFormat = 'wav',
+    List<String> outputFormats = const ['ulaw16k', 'wav16k', 'wav'],
+    String delivery = 'audio',
+  }) {
     final wsUrl = baseUrl.replaceFirst('http', 'ws');
     _channel = _connect(Uri.parse('$wsUrl/ws/$threadId'));
 
     // Send join message
-    _channel!.sink.add(jsonEncode({'userId': userId}));
+    _channel!.sink.add(
+      jsonEncode({
+        'userId': userId,
+        if (streaming) 'streaming': true,
+        'audioFormat': audioFormat,
+        'outputFormats': outputFormats,
+        if (delivery != 'audio') 'delivery': delivery,
+        'audioCache': true,
+        if (_audioCache.isNotEmpty) 'cachedAudio': _audioCache.keys.toList(),
+      }),
+    );
 
     _channel!.stream.listen(
       (data) {
@@ -42,21 +79,28 @@ class WebSocketService {
           final msg = jsonDecode(data) as Map<String, dynamic>;
           final type = msg['type'] as String? ?? '';
 
-          if (type == 'translated_audio_meta') {
+          // Streamed speech sends one chunk header per sentence, each
+          // followed by its own WAV frame.
+          if (type == 'translated_audio_meta' ||
+              type == 'translated_audio_chunk') {
+            if (msg['cached'] == true) {
+              _messageController.add(ServerMessage(type: type, data: msg));
+              _playCached(msg);
+              return;
+            }
             _pendingAudioMeta = msg;
           }
 
           _messageController.add(ServerMessage(type: type, data: msg));
+          if (type == 'audio_unavailable' && msg['seq'] != null) {
+            _chunkArrived(msg['messageId'] as String?);
+          }
         } else if (data is List<int>) {
           // Binary audio data
           final bytes = Uint8List.fromList(data);
-          _messageController.add(
-            ServerMessage(
-              type: 'audio_data',
-              data: _pendingAudioMeta ?? {},
-              audioBytes: bytes,
-            ),
-          );
+          final hash = _pendingAudioMeta?['audioHash'];
+          if (hash is String) _cacheAudio(hash, bytes);
+          _emitAudio(_pendingAudioMeta ?? {}, bytes);
           _pendingAudioMeta = null;
         }
       },
@@ -75,18 +119,99 @@ class WebSocketService {
     _connected = true;
   }
 
+  /// Emit a clip the server skipped because we hold it, or fetch it again
+  /// if it is no longer cached: the whole message, or for streamed speech
+  /// just that sentence.
+  void _playCached(Map<String, dynamic> meta) {
+    final hash = meta['audioHash'] as String?;
+    final bytes = hash == null ? null : _audioCache.remove(hash);
+    final messageId = meta['messageId'] as String?;
+    if (bytes != null) {
+      _audioCache[hash!] = bytes;
+      _emitAudio(meta, bytes);
+    } else if (messageId != null) {
+      final seq = meta['seq'] as int?;
+      if (seq != null) {
+        _missingChunks[messageId] = (_missingChunks[messageId] ?? 0) + 1;
+        _heldChunks.putIfAbsent(messageId, () => []);
+      }
+      requestAudio(messageId, seq: seq);
+    }
+  }
+
+  void _emitAudio(Map<String, dynamic> meta, Uint8List bytes) {
+    final message = ServerMessage(
+      type: 'audio_data',
+      data: meta,
+      audioBytes: bytes,
+    );
+    final messageId = meta['messageId'];
+    final held = _heldChunks[messageId];
+    if (held == null) {
+      _messageController.add(message);
+    } else if (meta['requested'] == true) {
+      _messageController.add(message);
+      _chunkArrived(messageId as String);
+    } else {
+      held.add(message); // After a sentence we are still waiting for
+    }
+  }
+
+  /// A re-requested sentence arrived (or is unavailable): once none are
+  /// missing, play the sentences held back behind it.
+  void _chunkArrived(String? messageId) {
+    final missing = (_missingChunks[messageId] ?? 1) - 1;
+    if (missing > 0) {
+      _missingChunks[messageId!] = missing;
+      return;
+    }
+    _missingChunks.remove(messageId);
+    _heldChunks.remove(messageId)?.forEach(_messageController.add);
+  }
+
+  void _cacheAudio(String hash, Uint8List bytes) {
+    _audioCache.remove(hash);
+    _audioCache[hash] = bytes;
+    if (_audioCache.length > audioCacheEntries) {
+      final evicted = _audioCache.keys.first;
+      _audioCache.remove(evicted);
+      sendControl({
+        'type': 'audio_evicted',
+        'hashes': [evicted],
+      });
+    }
+  }
+
   void sendAudio(Uint8List wavBytes) {
     if (_channel != null && _connected) {
       _channel!.sink.add(wavBytes);
     }
   }
 
+  /// Send a complete recording (walkie-talkie). It is announced first so a
+  /// streaming connection translates it as one chunk instead of feeding it
+  /// to the rolling stream buffer.
+  void sendRecording(Uint8List bytes) {
+    sendControl({'type': 'recording'});
+    sendAudio(bytes);
+  }
+
   void sendControl(Map<String, dynamic> message) {
     if (_channel != null && _connected) {
       _channel!.sink.add(jsonEncode(message));
     }
   }
 
+  /// Ask for the audio of a text-first message, or with [seq] for one
+  /// sentence of streamed speech.
+  void requestAudio(String messageId, {int? seq}) {
+    sendControl({
+      'type': 'request_audio',
+      'messageId': messageId,
+      if (seq != null) 'seq': seq,
+    });
+  }
+
   void disconnect() {
     _connected = false;
     _channel?.sink.close();
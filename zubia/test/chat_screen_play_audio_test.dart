@@ -0,0 +1,117 @@
+import 'package:flutter/material.dart';
+import 'package:flutter/services.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:provider/provider.dart';
+import 'package:zubia/providers/app_state.dart';
+import 'package:zubia/screens/chat_screen.dart';
+
+class MockAppState extends AppState {
+  MockAppState() : super(serverUrl: 'http://mock.local');
+
+  final List<String?> requested = [];
+
+  @override
+  // ignore: overridden_fields
+  List<FeedEntry> feed = [];
+
+  @override
+  void requestAudio(FeedEntry entry) {
+    requested.add(entry.messageId);
+  }
+}
+
+void main() {
+  TestWidgetsFlutterBinding.ensureInitialized();
+
+  // Mock permission handler channel
+  const MethodChannel channel = MethodChannel(
+    'flutter.baseflow.com/permissions/methods',
+  );
+
+  setUp(() {
+    TestDefaultBinaryMessengerBinding.instance.defaultBinaryMessenger
+        .setMockMethodCallHandler(channel, (MethodCall methodCall) async {
+          if (methodCall.method == 'checkPermissionStatus') {
+            return 1; // Granted
+          } else if (methodCall.method == 'requestPermissions') {
+            return {1: 1}; // Microphone: Granted
+          }
+          return null;
+        });
+  });
+
+  tearDown(() {
+    TestDefaultBinaryMessengerBinding.instance.defaultBinaryMessenger
+        .setMockMethodCallHandler(channel, null);
+  });
+
+  testWidgets('text-only messages can have their audio requested', (
+    WidgetTester tester,
+  ) async {
+    final state = MockAppState();
+    state.feed.addAll([
+      FeedEntry(
+        type: 'translation',
+        fromUser: 'Other',
+        translatedText: 'Hola',
+        messageId: 'm1',
+        textOnly: true,
+      ),
+      FeedEntry(
+        type: 'translation',
+        fromUser: 'Other',
+        translatedText: 'Adiós',
+        messageId: 'm2',
+      ),
+    ]);
+
+    await tester.pumpWidget(
+      MaterialApp(
+        home: ChangeNotifierProvider<AppState>.value(
+          value: state,
+          child: const ChatScreen(),
+        ),
+      ),
+    );
+    await tester.pumpAndSettle();
+
+    // Only the message delivered without audio offers playback
+    final play = find.byTooltip('Play audio');
+    expect(play, findsOneWidget);
+
+    await tester.tap(play);
+    await tester.pump();
+
+    expect(state.requested, equals(['m1']));
+  });
+
+  testWidgets('untranslated messages show as pending without playback', (
+    WidgetTester tester,
+  ) async {
+    final state = MockAppState();
+    state.feed.add(
+      FeedEntry(
+        type: 'translation',
+        fromUser: 'Other',
+        originalText: 'Hello',
+        translatedText: 'Hello',
+        messageId: 'm1',
+        textOnly: true,
+        pending: true,
+      ),
+    );
+
+    await tester.pumpWidget(
+      MaterialApp(
+        home: ChangeNotifierProvider<AppState>.value(
+          value: state,
+          child: const ChatScreen(),
+        ),
+      ),
+    );
+    await tester.pumpAndSettle();
+
+    expect(find.text('Translation pending'), findsOneWidget);
+    expect(find.byTooltip('Play audio'), findsNothing);
+  });
+}
@@ -107,6 +107,32 @@ void main() {
     expect(decoded['userId'], equals(userId));
   });
 
+  test('connect with streaming adds streaming flag to join message', () async {
+    final futureMsg = fakeChannel.outgoingStream.first;
+    service.connect('thread-1', 'user-1', streaming: true);
+
+    final decoded = jsonDecode(await futureMsg as String);
+    expect(decoded['userId'], equals('user-1'));
+    expect(decoded['streaming'], isTrue);
+  });
+
+  test('connect declares the binary audio format', () async {
+    final futureMsg = fakeChannel.outgoingStream.first;
+    service.connect('thread-1', 'user-1', audioFormat: 'pcm16');
+
+    final decoded = jsonDecode(await futureMsg as String);
+    expect(decoded['audioFormat'], equals('pcm16'));
+    expect(decoded.containsKey('streaming'), isFalse);
+  });
+
+  test('connect declares the speech formats it can play', () async {
+    final futureMsg = fakeChannel.outgoingStream.first;
+    service.connect('thread-1', 'user-1', outputFormats: ['ulaw8k', 'wav']);
+
+    final decoded = jsonDecode(await futureMsg as String);
+    expect(decoded['outputFormats'], equals(['ulaw8k', 'wav']));
+  });
+
   test('handles incoming text message', () async {
     service.connect('thread-1', 'user-1');
 
@@ -147,6 +173,68 @@ void main() {
     expect(audioMessage.audioBytes, equals(Uint8List.fromList(audioBytes)));
   });
 
+  test('replays cached audio when the server skips the clip', () async {
+    service.connect('thread-1', 'user-1');
+    final received = <ServerMessage>[];
+    final sub = service.messages.listen(received.add);
+
+    final meta = {
+      'type': 'translated_audio_meta',
+      'messageId': 'm1',
+      'audioHash': 'abc',
+    };
+    fakeChannel.incomingSink.add(jsonEncode(meta));
+    fakeChannel.incomingSink.add([1, 2, 3]);
+    fakeChannel.incomingSink.add(
+      jsonEncode({...meta, 'messageId': 'm2', 'cached': true}),
+    );
+    await Future.delayed(Duration.zero);
+    await sub.cancel();
+
+    expect(received.map((m) => m.type), [
+      'translated_audio_meta',
+      'audio_data',
+      'translated_audio_meta',
+      'audio_data',
+    ]);
+    expect(received.last.data['messageId'], equals('m2'));
+    expect(received.last.audioBytes, equals(Uint8List.fromList([1, 2, 3])));
+  });
+
+  test('a missing cached sentence is re-requested alone and played in order', () async {
+    final sent = <dynamic>[];
+    fakeChannel.outgoingStream.listen(sent.add);
+    service.connect('thread-1', 'user-1');
+    final audio = <ServerMessage>[];
+    final sub = service.messages
+        .where((m) => m.type == 'audio_data')
+        .listen(audio.add);
+
+    final chunk = {'type': 'translated_audio_chunk', 'messageId': 'm1'};
+    fakeChannel.incomingSink.add(
+      jsonEncode({...chunk, 'seq': 0, 'audioHash': 'gone', 'cached': true}),
+    );
+    fakeChannel.incomingSink.add(
+      jsonEncode({...chunk, 'seq': 1, 'audioHash': 'h1'}),
+    );
+    fakeChannel.incomingSink.add([1]);
+    await Future.delayed(Duration.zero);
+
+    // Sentence 1 waits for sentence 0
+    expect(audio, isEmpty);
+    final request = jsonDecode(sent.last as String);
+    expect(request, {'type': 'request_audio', 'messageId': 'm1', 'seq': 0});
+
+    fakeChannel.incomingSink.add(
+      jsonEncode({...chunk, 'seq': 0, 'requested': true}),
+    );
+    fakeChannel.incomingSink.add([0]);
+    await Future.delayed(Duration.zero);
+    await sub.cancel();
+
+    expect(audio.map((m) => m.data['seq']), [0, 1]);
+  });
+
   test('sendAudio sends bytes to sink', () async {
     final bytes = Uint8List.fromList([10, 20, 30]);
 
@@ -184,6 +272,24 @@ void main() {
     await expectation;
   });
 
+  test('sendRecording announces the recording before its bytes', () async {
+    final bytes = Uint8List.fromList([1, 2, 3, 4]);
+
+    final expectation = expectLater(
+      fakeChannel.outgoingStream,
+      emitsInOrder([
+        anything, // Join message
+        predicate((msg) => jsonDecode(msg as String)['type'] == 'recording'),
+        equals(bytes),
+      ]),
+    );
+
+    service.connect('thread-1', 'user-1', streaming: true);
+    service.sendRecording(bytes);
+
+    await expectation;
+  });
+
   test('disconnect closes channel and updates state', () async {
     service.connect('thread-1', 'user-1');
     expect(service.isConnected, isTrue);